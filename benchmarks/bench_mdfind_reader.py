@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# Copyright 2025 Apple Dragon
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compare line-mode and null-delimited block-mode reading of mdfind output.
+
+Runs benchmarks/fake_mdfind.py as the mdfind stand-in and drains its output
+with the same readers SearchWorker uses. The "pipe" rows include the time the
+stand-in needs to generate paths; the "memory" rows read captured output from
+memory and show the cost of the readers alone.
+
+    python benchmarks/bench_mdfind_reader.py [--count 1000000] [--repeat 3]
+"""
+
+import argparse
+import io
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from search_engine import iter_null_delimited, iter_output_lines  # noqa: E402
+
+FAKE_MDFIND = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_mdfind.py")
+
+
+def run_line_mode(env):
+    process = subprocess.Popen([sys.executable, FAKE_MDFIND, "query"], stdout=subprocess.PIPE, text=True, env=env)
+    count = sum(1 for _ in iter_output_lines(process.stdout))
+    process.wait()
+    return count
+
+
+def run_block_mode(env):
+    process = subprocess.Popen([sys.executable, FAKE_MDFIND, "-0", "query"], stdout=subprocess.PIPE, env=env)
+    count = sum(1 for _ in iter_null_delimited(process.stdout))
+    process.wait()
+    return count
+
+
+def capture(args, env):
+    return subprocess.run([sys.executable, FAKE_MDFIND] + args, stdout=subprocess.PIPE, env=env, check=True).stdout
+
+
+def measure(reader, env, repeat):
+    timings = []
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = reader(env)
+        timings.append(time.perf_counter() - start)
+    return count, statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1000000, help="paths emitted by the fake mdfind")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per mode, the median is reported")
+    args = parser.parse_args()
+
+    env = dict(os.environ, FAKE_MDFIND_COUNT=str(args.count))
+    line_output = capture(["query"], env)
+    block_output = capture(["-0", "query"], env)
+    readers = (
+        ("line", "pipe", run_line_mode),
+        ("block", "pipe", run_block_mode),
+        ("line", "memory", lambda _env: sum(1 for _ in iter_output_lines(io.TextIOWrapper(io.BytesIO(line_output))))),
+        ("block", "memory", lambda _env: sum(1 for _ in iter_null_delimited(io.BufferedReader(io.BytesIO(block_output)))))
+    )
+
+    print(f"{'mode':<8} {'source':<8} {'paths':>10} {'seconds':>9} {'paths/s':>12}")
+    for name, source, reader in readers:
+        count, elapsed = measure(reader, env, args.repeat)
+        print(f"{name:<8} {source:<8} {count:>10,} {elapsed:>9.3f} {count / elapsed:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
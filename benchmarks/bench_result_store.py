@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# Copyright 2025 Apple Dragon
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compare memory and filter/sort time of a ResultStore with a list of row tuples.
+
+Rows are synthetic (word-based names in nested folders, as in
+bench_trigram_index.py) or, with --root, the files under a real directory.
+Memory is what tracemalloc sees allocated while each layout is built. The path
+table of the store (each directory once, plus a directory id per row) is also
+compared with keeping every full path as a string.
+
+    python benchmarks/bench_result_store.py [--count 1000000] [--root ~]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from result_store import ResultStore  # noqa: E402
+from search_engine import filter_by_size_and_extension, row_sort_key, stat_row  # noqa: E402
+
+WORDS = (
+    "report invoice photo holiday budget draft final notes project backup archive music track "
+    "video clip screen shot resume letter scan receipt module test config readme index main app "
+    "data export import summary meeting design sketch logo icon theme chapter lesson recipe"
+).split()
+EXTENSIONS = ["txt", "pdf", "jpg", "png", "mp3", "mov", "py", "md", "docx", "xlsx", "zip", "json"]
+
+
+def synthetic_rows(count, seed=1):
+    """Rows like stat_row() gives: the name is a fresh string cut from the path"""
+    rng = random.Random(seed)
+    for i in range(count):
+        folder = "/".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4)))
+        name = "_".join(rng.sample(WORDS, rng.randint(1, 2))) + f".{rng.choice(EXTENSIONS)}"
+        path = f"/Users/bench/{folder}/{i % 500}/{name}"
+        yield (os.path.basename(path), rng.randint(0, 1 << 30), 1.7e9 - rng.random() * 1e8, path)
+
+
+def tree_rows(root, count):
+    produced = 0
+    for directory, _dirnames, filenames in os.walk(os.path.expanduser(root)):
+        for name in filenames:
+            row = stat_row(os.path.join(directory, name))
+            if row is not None:
+                yield row
+                produced += 1
+                if produced >= count:
+                    return
+
+
+def measure(build):
+    """Result of build() and the bytes it left allocated"""
+    tracemalloc.start()
+    result = build()
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, allocated
+
+
+def time_ms(func):
+    started = time.perf_counter()
+    result = func()
+    return (time.perf_counter() - started) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1000000)
+    parser.add_argument("--root", help="read up to --count files under this directory instead of synthetic rows")
+    args = parser.parse_args()
+
+    def source():
+        return tree_rows(args.root, args.count) if args.root else synthetic_rows(args.count)
+
+    rows, tuple_bytes = measure(lambda: list(source()))
+    store, store_bytes = measure(lambda: ResultStore(source()))
+    print(f"{len(rows):,} rows")
+    print(f"{'layout':<14}{'MiB':>10}{'bytes/row':>12}")
+    print(f"{'tuples':<14}{tuple_bytes / 1048576:>10.1f}{tuple_bytes / len(rows):>12.0f}")
+    print(f"{'ResultStore':<14}{store_bytes / 1048576:>10.1f}{store_bytes / len(rows):>12.0f}")
+    print(f"Saved {(tuple_bytes - store_bytes) / 1048576:.1f} MiB ({1 - store_bytes / tuple_bytes:.0%})")
+
+    _paths, path_bytes = measure(lambda: [row[3] for row in source()])
+    del _paths
+    table_bytes = (sum(sys.getsizeof(directory) for directory in store._dirs) + sys.getsizeof(store._dirs)
+                   + sys.getsizeof(store._dir_ids) + sys.getsizeof(store.dir_ids) + sys.getsizeof(store._odd_paths))
+    print(f"\nFull path strings: {path_bytes / 1048576:.1f} MiB; path table: {table_bytes / 1048576:.1f} MiB "
+          f"for {len(store._dirs):,} directories (saved {(path_bytes - table_bytes) / 1048576:.1f} MiB)")
+
+    view = store.view()
+    print(f"\n{'operation':<22}{'tuples ms':>12}{'store ms':>12}")
+    build_ms, _ = time_ms(lambda: ResultStore(rows))
+    print(f"{'build from rows':<22}{'-':>12}{build_ms:>12.1f}")
+    filters = [("min size 1 MiB", (1 << 20, None, [])), ("ext .pdf;.jpg", (None, None, [".pdf", ".jpg"])),
+               ("no filter", (None, None, []))]
+    for label, (min_size, max_size, extensions) in filters:
+        list_ms, expected = time_ms(lambda: filter_by_size_and_extension(rows, min_size, max_size, extensions))
+        view_ms, filtered = time_ms(lambda: view.filter(min_size, max_size, extensions))
+        assert len(filtered) == len(expected), label
+        print(f"{'filter ' + label:<22}{list_ms:>12.1f}{view_ms:>12.1f}")
+    for column, label in ((1, "size"), (2, "date"), (0, "name")):
+        copy = rows[:]
+        list_ms, _ = time_ms(lambda: copy.sort(key=row_sort_key(column), reverse=True))
+        sorted_view = view.copy()
+        view_ms, _ = time_ms(lambda: sorted_view.sort(column, descending=True))
+        assert sorted_view[0][column] == copy[0][column], label
+        print(f"{'sort by ' + label:<22}{list_ms:>12.1f}{view_ms:>12.1f}")
+    list_ms, _ = time_ms(lambda: sum(1 for _row in rows))
+    view_ms, _ = time_ms(lambda: sum(1 for _row in view))
+    print(f"{'read every row':<22}{list_ms:>12.1f}{view_ms:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# Copyright 2025 Apple Dragon
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measure TrigramIndex build time, lookup latency and memory on a synthetic corpus.
+
+Paths are generated from a fixed seed with word-based names, so posting lists
+look more like a real home folder than the uniform names of fake_mdfind.py.
+Each query is also answered by a linear scan over the names as a baseline.
+
+    python benchmarks/bench_trigram_index.py [--count 2000000] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from search_engine import fold_name  # noqa: E402
+from trigram_index import TrigramIndex  # noqa: E402
+
+WORDS = (
+    "report invoice photo holiday budget draft final notes project backup archive music track "
+    "video clip screen shot resume letter scan receipt module test config readme index main app "
+    "data export import summary meeting design sketch logo icon theme chapter lesson recipe"
+).split()
+EXTENSIONS = ["txt", "pdf", "jpg", "png", "mp3", "mov", "py", "md", "docx", "xlsx", "zip", "json"]
+QUERIES = ["invoice", "holiday_photo", "readme", "budget_2019", "xyz", "résumé", "final_draft", "zzzz"]
+
+
+def generate_corpus(count, seed=1):
+    rng = random.Random(seed)
+    for i in range(count):
+        folder = "/".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4)))
+        words = rng.sample(WORDS, rng.randint(1, 3))
+        name = "_".join(words) + (f"_{rng.randint(1990, 2030)}" if rng.random() < 0.5 else "")
+        yield f"/Users/bench/{folder}/{name}_{i}.{rng.choice(EXTENSIONS)}"
+
+
+def time_ms(func, repeat):
+    samples = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    index = TrigramIndex()
+    started = time.perf_counter()
+    index.add_paths(generate_corpus(args.count))
+    build_seconds = time.perf_counter() - started
+    print(f"Indexed {len(index):,} paths in {build_seconds:.1f} s")
+
+    names = index._names
+    print(f"{'query':<16}{'matches':>10}{'trigram ms':>12}{'scan ms':>10}")
+    for query in QUERIES:
+        trigram_ms, matches = time_ms(lambda: index.search_ids(query), args.repeat)
+        needle = fold_name(query, False)
+        scan_ms, scanned = time_ms(
+            lambda: [i for i, name in enumerate(names) if needle in fold_name(name, False)], 1)
+        assert matches == scanned, query
+        print(f"{query:<16}{len(matches):>10,}{trigram_ms:>12.2f}{scan_ms:>10.1f}")
+
+    report = index.memory_report()
+    print("\nMemory report")
+    for key, value in report.items():
+        label = key.replace("_", " ")
+        if key.endswith("bytes"):
+            print(f"  {label:<20}{value / (1024 * 1024):>10.1f} MiB")
+        else:
+            print(f"  {label:<20}{value:>10,}")
+
+
+if __name__ == "__main__":
+    main()
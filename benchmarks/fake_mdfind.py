@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# Copyright 2025 Apple Dragon
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Stand-in for mdfind that prints synthetic paths.
+
+Point the app at it with EVERYTHING_MDFIND=benchmarks/fake_mdfind.py.
+The query and -onlyin arguments are accepted and ignored.
+
+Environment:
+    FAKE_MDFIND_COUNT       number of paths to print (default 1000000)
+    FAKE_MDFIND_ROOT        prefix of the generated paths (default /Users/bench)
+    FAKE_MDFIND_PATHS_FILE  print the paths listed in this file (one per line) instead
+    FAKE_MDFIND_LIVE_POLL   with -live, seconds between checks of the paths file (default 0.2)
+
+With -live the stand-in behaves like mdfind -live: it prints the initial result
+set and a notice line, then reports each change of FAKE_MDFIND_PATHS_FILE until
+it is terminated. Paths added to the file are printed as they are; when paths
+were removed, "Query update: N matches" is printed. Editing that file scripts
+the file-system activity seen by the live search.
+"""
+
+import os
+import sys
+import time
+
+
+def generate_paths(count, root):
+    for i in range(count):
+        yield f"{root}/Projects/project_{i % 512}/src/module_{i % 37}/file_{i}.txt"
+
+
+def read_paths_file(paths_file):
+    try:
+        with open(paths_file, "r", encoding="utf-8") as f:
+            return [line.rstrip("\n") for line in f if line.strip()]
+    except OSError:
+        return []
+
+
+def file_signature(paths_file):
+    try:
+        stat_result = os.stat(paths_file)
+        return (stat_result.st_mtime_ns, stat_result.st_size)
+    except OSError:
+        return None
+
+
+def run_live(paths_file, out):
+    paths = read_paths_file(paths_file)
+    out.write("".join(f"{path}\n" for path in paths).encode())
+    out.write(b"[Type ctrl-C to exit]\n")
+    out.flush()
+    poll = float(os.environ.get("FAKE_MDFIND_LIVE_POLL", "0.2"))
+    signature = file_signature(paths_file)
+    while True:
+        time.sleep(poll)
+        current = file_signature(paths_file)
+        if current == signature:
+            continue
+        signature = current
+        new_paths = read_paths_file(paths_file)
+        known = set(paths)
+        out.write("".join(f"{path}\n" for path in new_paths if path not in known).encode())
+        if known - set(new_paths):
+            out.write(f"Query update: {len(new_paths)} matches\n".encode())
+        out.flush()
+        paths = new_paths
+
+
+def main(argv):
+    separator = b"\0" if "-0" in argv else b"\n"
+    count = int(os.environ.get("FAKE_MDFIND_COUNT", "1000000"))
+    root = os.environ.get("FAKE_MDFIND_ROOT", "/Users/bench")
+    paths_file = os.environ.get("FAKE_MDFIND_PATHS_FILE")
+    out = sys.stdout.buffer
+    if "-live" in argv and paths_file:
+        run_live(paths_file, out)
+        return 0
+    paths = read_paths_file(paths_file) if paths_file else generate_paths(count, root)
+    chunk = []
+    for path in paths:
+        chunk.append(os.fsencode(path))
+        if len(chunk) >= 4096:
+            out.write(separator.join(chunk) + separator)
+            chunk = []
+    if chunk:
+        out.write(separator.join(chunk) + separator)
+    out.flush()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,285 @@
+# Copyright 2025 Apple Dragon
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Content search without Spotlight: scan candidate files for a string.
+
+Files are memory-mapped and searched as bytes in a process pool, so the search
+is not limited by the GIL. Binaries (a NUL byte in the first block) and files over
+a size cap are skipped. Hits are reported as they are found, with the offset and
+number of the first line that matches.
+
+This module only uses the standard library so pool processes start quickly. One
+pool is started on first use and shared by all searches. Its processes are spawned
+with content_worker as their main module: a spawned process re-runs the main module
+as __mp_main__, which for the app would import Qt.
+"""
+
+import importlib.util
+import mmap
+import multiprocessing
+import os
+import queue
+import re
+import signal
+import sys
+import threading
+import types
+import unicodedata
+from functools import lru_cache
+
+MAX_CONTENT_BYTES = 32 * 1024 * 1024  # Larger files are skipped
+CONTENT_SNIFF_BYTES = 8192  # A NUL byte in this prefix marks a file as binary
+SCAN_CHUNK_SIZE = 32  # Files per pool task, to amortize inter-process overhead
+POOL_START_METHOD = "spawn"  # fork is unsafe in a process running Qt and other threads
+
+
+class ContentHit:
+    """First match of a query in a file"""
+
+    __slots__ = ("path", "line_offset", "line_number")
+
+    def __init__(self, path, line_offset, line_number):
+        self.path = path
+        self.line_offset = line_offset  # Byte offset of the start of the matching line
+        self.line_number = line_number  # 1-based
+
+    def __reduce__(self):
+        return (ContentHit, (self.path, self.line_offset, self.line_number))
+
+
+class ScanStats:
+    def __init__(self):
+        self.scanned = 0
+        self.bytes_scanned = 0
+        self.skipped_binary = 0
+        self.skipped_large = 0
+        self.unreadable = 0
+
+    def merge(self, counts):
+        scanned, bytes_scanned, skipped_binary, skipped_large, unreadable = counts
+        self.scanned += scanned
+        self.bytes_scanned += bytes_scanned
+        self.skipped_binary += skipped_binary
+        self.skipped_large += skipped_large
+        self.unreadable += unreadable
+
+
+def _fold(text, match_case):
+    # Same folding as search_engine.fold_name; duplicated to keep pool imports light
+    if match_case:
+        return unicodedata.normalize("NFC", text)
+    decomposed = unicodedata.normalize("NFD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+@lru_cache(maxsize=8)
+def _matcher(query, match_case, full_match):
+    """Return find(buffer) -> (position, line_number or None) of the first match, or None.
+
+    Case-sensitive queries are searched as raw bytes (NFC and NFD encodings, since
+    macOS file names and text may use either). Case-insensitive ASCII queries use a
+    bytes regex with IGNORECASE; like Spotlight's "c" modifier, not its "d": diacritics
+    in the file still have to match. Other case-insensitive queries and full matches
+    decode the text and compare it folded, like kMDItemTextContent with "cd".
+    """
+    if not full_match and match_case:
+        needles = {unicodedata.normalize(form, query).encode("utf-8") for form in ("NFC", "NFD")}
+
+        def find(buffer):
+            positions = [p for p in (buffer.find(needle) for needle in needles) if p >= 0]
+            return (min(positions), None) if positions else None
+        return find
+
+    if not full_match and query.isascii():
+        pattern = re.compile(re.escape(query.encode("ascii")), re.IGNORECASE)
+
+        def find(buffer):
+            match = pattern.search(buffer)
+            return (match.start(), None) if match else None
+        return find
+
+    needle = _fold(query, match_case)
+
+    def find(buffer):
+        text = _fold(bytes(buffer).decode("utf-8", "replace"), match_case)
+        if full_match:
+            return (0, 1) if text.strip() == needle else None
+        position = text.find(needle)
+        if position < 0:
+            return None
+        # Positions in the folded text do not map back to bytes, but its line breaks do
+        return (None, text.count("\n", 0, position) + 1)
+
+    return find
+
+
+def _line_start(buffer, line_number):
+    offset = 0
+    for _ in range(line_number - 1):
+        offset = buffer.find(b"\n", offset) + 1
+        if offset == 0:
+            break
+    return offset
+
+
+def scan_file(path, find, max_bytes=MAX_CONTENT_BYTES):
+    """Scan one file. Returns a ContentHit, or "binary", "large", "unreadable" or None."""
+    try:
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size > max_bytes:
+                return "large"
+            if size == 0:
+                return None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                if buffer.find(b"\0", 0, CONTENT_SNIFF_BYTES) >= 0:
+                    return "binary"
+                found = find(buffer)
+                if found is None:
+                    return None
+                position, line_number = found
+                if position is None:
+                    return ContentHit(path, _line_start(buffer, line_number), line_number)
+                line_offset = buffer.rfind(b"\n", 0, position) + 1
+                return ContentHit(path, line_offset, buffer[:line_offset].count(b"\n") + 1)
+    except (OSError, ValueError):
+        return "unreadable"
+
+
+def scan_chunk(paths, query, match_case, full_match, max_bytes=MAX_CONTENT_BYTES):
+    """Pool task: scan a chunk of files. Returns (hits, counts) with counts for ScanStats.merge."""
+    find = _matcher(query, match_case, full_match)
+    hits = []
+    scanned = bytes_scanned = skipped_binary = skipped_large = unreadable = 0
+    for path in paths:
+        result = scan_file(path, find, max_bytes)
+        if result == "large":
+            skipped_large += 1
+        elif result == "binary":
+            skipped_binary += 1
+        elif result == "unreadable":
+            unreadable += 1
+        else:
+            scanned += 1
+            try:
+                bytes_scanned += os.path.getsize(path)
+            except OSError:
+                pass
+            if result is not None:
+                hits.append(result)
+    return hits, (scanned, bytes_scanned, skipped_binary, skipped_large, unreadable)
+
+
+def _init_pool_process():
+    # Ctrl-C is handled by the parent; the pool is terminated when it exits
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _start_pool(workers):
+    context = multiprocessing.get_context(POOL_START_METHOD)
+    spec = importlib.util.find_spec("content_worker")
+    if spec is None:
+        return context.Pool(workers, initializer=_init_pool_process)
+    # Processes read the main module when they start, which all of them do in Pool().
+    # The swap happens once, under _pool_lock, not around every search.
+    main = sys.modules["__main__"]
+    stand_in = types.ModuleType("__main__")
+    stand_in.__spec__ = spec
+    sys.modules["__main__"] = stand_in
+    try:
+        return context.Pool(workers, initializer=_init_pool_process)
+    finally:
+        sys.modules["__main__"] = main
+
+
+def shared_pool(workers):
+    """Process pool for scan_chunk tasks, started by the first search with its number
+    of workers and reused by every later one"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = _start_pool(workers)
+        return _pool
+
+
+def shutdown_pool():
+    """Terminate the shared pool; the next search starts a new one"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.terminate()
+        pool.join()
+
+
+class ContentScanner:
+    """Scans a stream of candidate files in a process pool and yields hits as they come in"""
+
+    def __init__(self, workers=None, max_bytes=MAX_CONTENT_BYTES, chunk_size=SCAN_CHUNK_SIZE):
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+        self.stats = ScanStats()
+
+    def scan(self, paths, query, match_case=False, full_match=False, stop_event=None):
+        """Yield ContentHit objects for the files in paths that contain query.
+        Hits arrive in completion order, not in the order of paths."""
+        max_in_flight = self.workers * 2
+        results = queue.Queue()
+        in_flight = 0
+
+        def submit(chunk):
+            pool.apply_async(scan_chunk, (chunk, query, match_case, full_match, self.max_bytes),
+                             callback=results.put, error_callback=results.put)
+
+        def collect(block):
+            nonlocal in_flight
+            while in_flight:
+                try:
+                    result = results.get(block=block)
+                except queue.Empty:
+                    return
+                in_flight -= 1
+                if isinstance(result, BaseException):
+                    raise result
+                hits, counts = result
+                self.stats.merge(counts)
+                yield from hits
+                block = False
+
+        # A stopped search leaves its in-flight chunks to finish in the shared pool;
+        # their results go to this search's queue and are dropped with it.
+        pool = shared_pool(self.workers)
+        chunk = []
+        for path in paths:
+            if stop_event is not None and stop_event.is_set():
+                return
+            chunk.append(path)
+            if len(chunk) < self.chunk_size:
+                continue
+            submit(chunk)
+            in_flight += 1
+            chunk = []
+            yield from collect(block=in_flight >= max_in_flight)
+        if chunk:
+            submit(chunk)
+            in_flight += 1
+        while in_flight:
+            if stop_event is not None and stop_event.is_set():
+                return
+            yield from collect(block=True)
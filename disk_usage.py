@@ -0,0 +1,77 @@
+# Copyright 2025 Apple Dragon
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Directory sizes, measured with du on one file system without following symlinks."""
+
+import subprocess
+from pathlib import Path
+
+SUBDIR_SCAN_TIMEOUT = 60  # Seconds before a subdirectory scan gives up
+
+
+def directory_size(path):
+    """Total size of a directory tree in bytes; 0 if it cannot be measured"""
+    try:
+        completed = subprocess.run(
+            ["du", "-skxP", str(path)],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=False
+        )
+        stdout = completed.stdout.decode(errors="ignore").strip()
+        if stdout:
+            last_line = stdout.splitlines()[-1]
+            first_token = last_line.split()[0]
+            return int(first_token) * 1024
+    except (ValueError, IndexError, FileNotFoundError, PermissionError):
+        return 0
+    except Exception:
+        return 0
+    return 0
+
+
+def subdirectory_sizes(parent_dir, timeout=SUBDIR_SCAN_TIMEOUT):
+    """(name, size in bytes, Path) of the immediate subdirectories of a directory, from one du run.
+    Raises subprocess.TimeoutExpired when du takes longer than timeout."""
+    completed = subprocess.run(
+        ["du", "-d", "1", "-kxP", str(parent_dir)],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        check=False,
+        timeout=timeout
+    )
+    stdout = completed.stdout.decode(errors="ignore").strip()
+    if not stdout:
+        return []
+
+    results = []
+    parent_path = Path(parent_dir).resolve()
+    for line in stdout.splitlines():
+        parts = line.split(maxsplit=1)
+        if len(parts) < 2:
+            continue
+        try:
+            size_kb = int(parts[0])
+            entry_path = Path(parts[1]).resolve()
+
+            # Skip the parent directory itself
+            if entry_path == parent_path:
+                continue
+
+            # Only include immediate children
+            if entry_path.parent == parent_path and entry_path.is_dir():
+                results.append((entry_path.name, size_kb * 1024, entry_path))
+        except (ValueError, OSError):
+            continue
+    return results
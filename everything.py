@@ -14,24 +14,41 @@
 
 import sys
 import os
-import stat
+import signal
 import json
 import subprocess
 import time
 import csv
 import shutil
+import sqlite3
 import zipfile
 import traceback
+import threading
+import multiprocessing
 from pathlib import Path
 
+if __name__ == "__main__":
+    # In a frozen app, pool processes start as this executable and must stop here
+    multiprocessing.freeze_support()
+if __name__ == "__main__" and sys.argv[1:2] == ["--cli"]:
+    # Headless search: leave before anything imports Qt
+    from search_cli import main as cli_main
+    sys.exit(cli_main(sys.argv[2:]))
+if __name__ == "__main__" and sys.argv[1:2] == ["--serve"]:
+    from search_service import main as serve_main
+    sys.exit(serve_main(sys.argv[2:]))
+if __name__ == "__main__" and sys.argv[1:2] == ["--batch"]:
+    from search_batch import main as batch_main
+    sys.exit(batch_main(sys.argv[2:]))
+
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
     QCheckBox, QPushButton, QTreeWidget, QTreeWidgetItem, QProgressBar, QMenu,
     QFileDialog, QMessageBox, QGroupBox, QInputDialog, QPlainTextEdit, QSplitter, QStackedWidget, QCompleter,
     QSlider, QToolButton, QStyle, QGraphicsDropShadowEffect, QTabWidget, QDialog, QRadioButton, QButtonGroup,
-    QProgressDialog
+    QProgressDialog, QListWidget
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer, QUrl, QMimeData, QPropertyAnimation, QEasingCurve, QMargins
+from PyQt6.QtCore import Qt, QObject, QThread, pyqtSignal, QTimer, QUrl, QMimeData, QPropertyAnimation, QEasingCurve, QMargins
 from PyQt6.QtGui import QActionGroup, QBrush
 from PyQt6.QtMultimedia import QMediaPlayer, QAudioOutput
 from PyQt6.QtMultimediaWidgets import QVideoWidget
@@ -46,24 +63,37 @@ from PyQt6.QtCharts import (
     QValueAxis,
 )
 
-CONFIG_PATH = os.path.expanduser("~/.everythingByMdfind.json")
-DEBOUNCE_DELAY = 800
-
-def read_config():
-    if not os.path.isfile(CONFIG_PATH):
-        return {}
-    try:
-        with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except:
-        return {}
+from search_engine import (
+    BOOKMARK_QUERIES, DEFAULT_CACHE_BYTES, DEFAULT_CACHE_TTL, DEFAULT_STAT_WORKERS, MAX_STAT_WORKERS, LiveSearch,
+    ResultCache, SEARCH_PHASES, SearchProgress, StatPipeline, StatThroughput,
+    filter_by_size_and_extension, has_metadata, is_query_refinement, normalize_directory, parse_extensions, refine_rows,
+    row_sort_key, run_mdls, split_roots, stat_row, stat_rows
+)
+from search_backends import BACKEND_AUTO, BACKENDS, SearchOptions, plan_backends
+from query_language import QuerySyntaxError, parse_query
+from name_patterns import PatternStats
+from ranking import FrecencyStore, IncrementalRanking, Ranker
+from file_index import FileIndex, IndexUpdater
+from trigram_index import TrigramIndex
+from app_config import read_config, write_config
+from disk_usage import directory_size, subdirectory_sizes
+from result_store import ResultStore, ResultView
+from saved_searches import (
+    DEFAULT_REFRESH_INTERVAL, RefreshSchedule, SnapshotStore, diff_results, machine_busy, new_saved_id
+)
 
-def write_config(data):
-    try:
-        with open(CONFIG_PATH, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
-    except:
-        pass
+DEBOUNCE_DELAY = 800
+STREAM_BATCH_INTERVAL = 0.05  # Seconds between streamed result batches
+STREAM_BATCH_SIZE = 2000  # Maximum rows per streamed result batch
+STAT_RATE_INTERVAL = 0.25  # Seconds between stat throughput updates
+METADATA_CHUNK_SIZE = 500  # Rows per metadata update in deferred metadata mode
+LIVE_COALESCE_INTERVAL = 1.0  # Seconds of file-system activity merged into one live update
+INDEX_POLL_INTERVAL = 60  # Seconds between directory mtime polls of the file index
+INDEX_INOTIFY_INTERVAL = 2  # Seconds between inotify event checks
+DEFAULT_MAX_CONCURRENT_SEARCHES = 2  # mdfind + stat pipelines running at the same time
+MAX_FOLDERS_TO_OPEN = 10  # More folders than this are opened only after asking
+SAVED_SEARCH_CHECK_INTERVAL = 30  # Seconds between checks for saved searches due for a refresh
+OPEN_HISTORY_SAVE_DELAY = 30  # Seconds after a file is opened before the open history is written
 
 
 def get_dialog_stylesheet(dark_mode=False, include_radio=False, button_padding="10px 16px"):
@@ -557,7 +587,8 @@ class SearchTab:
         self.extra_clause = extra_clause
         self.is_bookmark = is_bookmark
 
-        # Search results data
+        # Search results data: ResultViews of one ResultStore for search tabs (while relevance
+        # ranked, file_data is a view of the ranked row indexes), lists for usage scan tabs
         self.all_file_data = []
         self.file_data = []
         self.current_loaded = 0
@@ -583,18 +614,71 @@ class SearchTab:
         
         # Search worker thread
         self.search_worker = None
+        self.search_generation = 0  # Generation of the worker whose results this tab accepts
+        self.pending_reset = False  # Clear old results when the first streamed batch arrives
+        self.search_complete = False
+        self.stat_summary = ""  # Stat throughput of the last search
+
+        # Deferred metadata mode: stat results of rows that were shown, path -> row (None if missing)
+        self.metadata = {}
+        self.metadata_workers = []
+        self.full_metadata_worker = None  # Running full stat pass, if any
+
+        # Backend that produced the current results (see search_backends)
+        self.backend_name = ""
+        self.content_hits = {}  # Content search: path -> (line offset, line number) of the first match
+        self.root_progress = []  # Multi-root search: RootProgress.snapshot() per root
+        self.pattern_counts = None  # re:/glob: search: (candidates fetched, candidates that matched)
+
+        self.search_progress = None  # SearchProgress of the tab's latest search
+
+        # Relevance order (no sort column): file_data is the ranking's best rows, then the
+        # rest unsorted (rank_partial) until the user scrolls past the first screen or the search completes
+        self.ranking = None
+        self.rank_partial = False
+
+        # Live updates via mdfind -live
+        self.is_live = False
+        self.live_worker = None
+
+        # Saved search (pinned tab): results kept on disk and refreshed on a schedule
+        self.saved_id = None
+        self.refresh_schedule = None  # RefreshSchedule
+        self.needs_initial_search = False  # No snapshot yet: search once shown or when the refresh is due
+        self.snapshot_pending = False  # Save the results of the running search as the new snapshot
+        self.awaiting_revalidation = False  # Cached rows are shown; the fresh ones are the ones to save
+        self.last_delta = None  # ResultDelta of the latest refresh
+        self.delta_marks = {}  # path -> "added" or "changed" in the latest refresh
+
+    def has_deferred_rows(self):
+        """Whether some results still lack size and mtime"""
+        if isinstance(self.all_file_data, ResultView):
+            return self.all_file_data.has_deferred_rows()
+        return any(not has_metadata(item) for item in self.all_file_data)
 
 
 # Thread class to run mdfind in the background.
 # Reads results line by line based on search parameters and sends them to the main thread.
 class SearchWorker(QThread):
     """Thread class to run mdfind in the background.
-    Reads results line by line based on search parameters and sends them to the main thread."""
-    progress_signal = pyqtSignal(int)
-    result_signal = pyqtSignal(list)
+    Reads results line by line based on search parameters and sends them to the main thread.
+    In streaming mode results are sent in batches while mdfind is still running.
+    The paths come from a search backend (see search_backends); in auto mode a directory
+    walk takes over when Spotlight finds nothing in the search directory."""
+    progress_signal = pyqtSignal(int)  # Percent done when known (multi-root searches), -1 while busy
+    progress_event_signal = pyqtSignal(dict)  # SearchProgress.snapshot()
+    result_signal = pyqtSignal(object)  # ResultView of every result
+    batch_signal = pyqtSignal(list)  # Streaming mode: a chunk of new results
+    done_signal = pyqtSignal(int)  # Streaming mode: total number of results sent
+    stat_rate_signal = pyqtSignal(int, float)  # stat calls so far, stat calls per second
+    cache_signal = pyqtSignal(bool)  # Results came from the cache; True if a fresh search follows
+    backend_signal = pyqtSignal(str)  # Name of the backend that is searching now
+    content_hits_signal = pyqtSignal(dict)  # Content search: path -> (line offset, line number) of the first match
+    roots_signal = pyqtSignal(list)  # Multi-root search: RootProgress.snapshot() per root
+    pattern_signal = pyqtSignal(int, int)  # re:/glob: search: candidates fetched, candidates that matched
     error_signal = pyqtSignal(str)
     
-    def __init__(self, query, directory, search_by_file_name, match_case, full_match, extra_clause=None, is_bookmark=False):
+    def __init__(self, query, directory, search_by_file_name, match_case, full_match, extra_clause=None, is_bookmark=False, stream=False):
         super().__init__()
         self.query = query
         self.directory = directory
@@ -603,84 +687,482 @@ class SearchWorker(QThread):
         self.full_match = full_match
         self.extra_clause = extra_clause
         self.is_bookmark = is_bookmark
+        self.stream = stream
+        self.stat_workers = DEFAULT_STAT_WORKERS
+        self.stat_ordered = True  # Keep mdfind output order; False emits rows as their stat completes
+        self.deferred_metadata = False  # Emit rows without size/mtime; the UI stats them on demand
+        self.null_delimited = True  # Run mdfind -0 and read NUL-separated paths in binary blocks
+        self.result_cache = None  # Shared ResultCache, if caching is enabled
+        self.generation = 0  # Set by the app; results are dropped once a newer search replaces this one
+        self.revalidate = False  # Run mdfind even when a fresh cached result exists
+        self.backend_mode = BACKEND_AUTO  # Backend name, or auto: Spotlight with a directory walk fallback
+        self.backend_name = ""  # Backend that produced the results
+        self.file_index = None  # FileIndex answering file name searches inside its roots, if enabled
+        self.trigram_index = None  # TrigramIndex loaded from the file index, if enabled
+        self.pattern_stats = None  # PatternStats of a search with re: or glob: filters
+        self.stat_counter = StatThroughput()
+        self.search_progress = SearchProgress()  # Shared with the tab, which adds its render time
         self._is_running = True
-        self.process = None
+        self.backend_run = None
+        self.pipeline = None
 
     def run(self):
-        files_info = []
-        idx = 0
-        cmd = ["mdfind"]
+        try:
+            options = SearchOptions.from_text(
+                self.query, self.directory, self.search_by_file_name, self.match_case, self.full_match,
+                self.extra_clause, self.is_bookmark
+            )
+        except QuerySyntaxError as e:
+            self.error_signal.emit(str(e))
+            return
+        if options.spotlight_query() is None:
+            return
+        backends = plan_backends(self.backend_mode, options, self.file_index, self.trigram_index)
+        if not backends:
+            self.error_signal.emit(f"Unknown search backend: {self.backend_mode}")
+            return
 
-        # If it's a bookmark search, use only the extra clause
-        if self.is_bookmark and self.extra_clause is not None:
-            query_str = self.extra_clause
-        else:
-            # Normal search behavior as before
-            full_match_str = "" if self.full_match else "*"
-            case_modifier = "" if self.match_case else "cd"
-            if self.search_by_file_name:
-                query_str = f'kMDItemFSName == "{full_match_str}{self.query}{full_match_str}"{case_modifier}'
-                if self.extra_clause is not None:
-                    query_str += f" && {self.extra_clause}"
+        # Serve repeated queries from the result cache. Stale entries, and explicit
+        # refreshes, are shown right away and then reconciled with a fresh search.
+        stream = self.stream
+        cache_key = (self.backend_mode,) + backends[0].cache_key(options, self.deferred_metadata)
+        if self.result_cache is not None:
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                rows, stale, _hits = cached
+                revalidate = stale or self.revalidate
+                self.cache_signal.emit(revalidate)
+                self._emit_rows(self.result_signal, ResultStore(rows).view())
+                if not revalidate:
+                    self._finish_progress()
+                    return
+                # Deliver the refreshed results in one piece so the cached rows are replaced at once
+                stream = False
+
+        self.stat_counter = StatThroughput()
+        self.pattern_stats = PatternStats() if options.filters is not None and options.filters.has_patterns() else None
+        files_info = []
+        total = 0
+        try:
+            # Try the planned backends in order until one finds something
+            for backend in backends:
+                if not backend.supports(options):
+                    continue
+                self.backend_name = self.search_progress.backend = backend.name
+                self.backend_signal.emit(backend.name)
+                spawn_started = time.monotonic()
+                try:
+                    self.backend_run = backend.start(options, self.null_delimited)
+                except Exception as e:
+                    self.error_signal.emit(str(e))
+                    return
+                self.search_progress.spawned(time.monotonic() - spawn_started)
+                row_filter = options.row_filter(backend.filters_in_query, self.pattern_stats)
+                rows, total = self._collect(self.backend_run, stream, row_filter)
+                files_info.extend(rows)
+                # Candidates that all failed the pattern still mean the backend could search here
+                fetched = self.pattern_stats is not None and self.pattern_stats.fetched > 0
+                if files_info or fetched or not self._is_running:
+                    break
+            self.stat_rate_signal.emit(self.stat_counter.count, self.stat_counter.rate())
+            if self._is_running and self.result_cache is not None:
+                self.result_cache.put(cache_key, files_info)
+            if stream:
+                self.done_signal.emit(total)
             else:
-                if self.query != "":
-                    query_str = f'kMDItemTextContent == "{full_match_str}{self.query}{full_match_str}"{case_modifier}'
-                    if self.extra_clause is not None:
-                        query_str += f" && {self.extra_clause}"
+                self._emit_rows(self.result_signal, ResultStore(files_info).view())
+        except Exception as e:
+            self.error_signal.emit(str(e))
+            self.stop()
+        finally:
+            self._finish_progress()
+
+    def _collect(self, backend_run, stream, row_filter=None):
+        """Stat the paths of a backend run, streaming batches if requested.
+        row_filter filters each batch by the inline filters the backend could not evaluate itself.
+        Returns (rows, number of rows emitted as batches)."""
+        if backend_run.rows is not None:
+            # Complete rows (file index): nothing to stat
+            rows = list(backend_run.rows) if row_filter is None else row_filter(list(backend_run.rows))
+            self.search_progress.paths_read += len(rows)
+            self.search_progress.rows_found += len(rows)
+            self._emit_pattern_stats()
+            if stream and rows:
+                for start in range(0, len(rows), STREAM_BATCH_SIZE):
+                    self._emit_rows(self.batch_signal, rows[start:start + STREAM_BATCH_SIZE])
+            return rows, len(rows) if stream else 0
+        hits = backend_run.hits
+        roots = backend_run.progress
+
+        files_info = []
+        batch = []
+        total = 0
+        last_emit = last_rate = time.monotonic()
+
+        # Paths are read from the backend on a separate thread and stat-ed by a thread pool
+        self.pipeline = StatPipeline(
+            backend_run.paths,
+            workers=self.stat_workers,
+            ordered=self.stat_ordered,
+            counter=self.stat_counter,
+            deferred=self.deferred_metadata,
+            # Deferred rows are never stat-ed: a multi-root search only drops repeated paths
+            stat=stat_row if self.deferred_metadata else backend_run.stat_with(stat_row)
+        ).start()
+
+        finished = False
+        while self._is_running and not finished:
+            rows, finished = self.pipeline.poll(STREAM_BATCH_INTERVAL, max_rows=STREAM_BATCH_SIZE)
+            if row_filter is not None:
+                rows = row_filter(rows)
+            now = time.monotonic()
+            files_info.extend(rows)
+            self.search_progress.rows_found += len(rows)
+            if stream:
+                batch.extend(rows)
+                if batch and (finished or len(batch) >= STREAM_BATCH_SIZE or now - last_emit >= STREAM_BATCH_INTERVAL):
+                    total += len(batch)
+                    if hits is not None:
+                        self.content_hits_signal.emit({row[3]: hits[row[3]] for row in batch if row[3] in hits})
+                    self._emit_rows(self.batch_signal, batch)
+                    batch = []
+                    last_emit = now
+            if now - last_rate >= STAT_RATE_INTERVAL:
+                if roots is not None:
+                    self.roots_signal.emit([root.snapshot() for root in roots])
+                    done = sum(1 for root in roots if root.finished is not None)
+                    self.progress_signal.emit(done * 100 // len(roots))
                 else:
-                    if self.extra_clause is not None:
-                        query_str = self.extra_clause
-                    else:
-                        return
-                    
-        cmd.append(query_str)
+                    self.progress_signal.emit(-1)
+                self._emit_pattern_stats()
+                self.stat_rate_signal.emit(self.stat_counter.count, self.stat_counter.rate())
+                self.search_progress.track_pipeline(self.pipeline, self.stat_counter)
+                self.progress_event_signal.emit(self.search_progress.snapshot())
+                last_rate = now
+        backend_run.wait()
+        self.search_progress.track_pipeline(self.pipeline, self.stat_counter)
+        if roots is not None:
+            self.roots_signal.emit([root.snapshot() for root in roots])
+        self._emit_pattern_stats()
+        if hits is not None and not stream:
+            self.content_hits_signal.emit(dict(hits))
+        if stream and batch:
+            total += len(batch)
+            if hits is not None:
+                self.content_hits_signal.emit({row[3]: hits[row[3]] for row in batch if row[3] in hits})
+            self._emit_rows(self.batch_signal, batch)
+        return files_info, total
+
+    def _emit_rows(self, signal, rows):
+        """Send rows to the UI, timing the emit phase"""
+        started = time.monotonic()
+        signal.emit(rows)
+        self.search_progress.add_time("emit", time.monotonic() - started)
+
+    def _finish_progress(self):
+        self.search_progress.finish()
+        self.progress_event_signal.emit(self.search_progress.snapshot())
+        self.progress_signal.emit(0)
+
+    def _emit_pattern_stats(self):
+        if self.pattern_stats is not None:
+            self.pattern_signal.emit(self.pattern_stats.fetched, self.pattern_stats.survived)
+
+    def pause(self):
+        """Suspend the mdfind process; the read loop simply waits for more output"""
+        self._send_process_signal(getattr(signal, "SIGSTOP", None))
+
+    def resume(self):
+        self._send_process_signal(getattr(signal, "SIGCONT", None))
+
+    def _send_process_signal(self, sig):
+        if sig is not None and self.backend_run is not None:
+            self.backend_run.send_signal(sig)
+
+    def is_running(self):
+        """False once stop() has been called"""
+        return self._is_running
+
+    def stop(self):
+        self._is_running = False
+        # A suspended process only acts on SIGTERM once it is continued
+        self.resume()
+        if self.backend_run is not None:
+            self.backend_run.stop()
+        if self.pipeline is not None:
+            self.pipeline.stop()
+
+
+class SearchJob:
+    """A SearchWorker known to the SearchScheduler"""
+
+    def __init__(self, worker, owner, label, seq):
+        self.worker = worker
+        self.owner = owner
+        self.label = label
+        self.seq = seq
+        self.state = "queued"  # queued, running or paused
+        self.queued_at = time.monotonic()
+        self.started_at = None
+
+
+class SearchScheduler(QObject):
+    """Runs SearchWorkers under a global concurrency cap.
+
+    Jobs of the visible tab (the foreground owner) run first; other jobs wait in the
+    queue. If a foreground job finds every slot taken by background jobs, one of them
+    is paused (its mdfind process is suspended) and resumed once a slot frees up.
+    """
+
+    jobs_changed = pyqtSignal()
+
+    def __init__(self, max_concurrent=DEFAULT_MAX_CONCURRENT_SEARCHES, parent=None):
+        super().__init__(parent)
+        self.max_concurrent = max(1, max_concurrent)
+        self.foreground_owner = None
+        self._jobs = []
+        self._seq = 0
+
+    def priority(self, job):
+        return 0 if job.owner is self.foreground_owner else 1
+
+    def submit(self, worker, owner=None, label=""):
+        self._seq += 1
+        job = SearchJob(worker, owner, label, self._seq)
+        self._jobs.append(job)
+        worker.finished.connect(lambda j=job: self._on_finished(j))
+        self._pump()
+
+    def cancel(self, worker):
+        """Forget a worker that has not started yet. Returns True if it was queued."""
+        for job in self._jobs:
+            if job.worker is worker and job.state == "queued":
+                self._jobs.remove(job)
+                self._pump()
+                return True
+        return False
+
+    def is_queued(self, worker):
+        return any(job.worker is worker and job.state == "queued" for job in self._jobs)
+
+    def set_foreground_owner(self, owner):
+        if owner is not self.foreground_owner:
+            self.foreground_owner = owner
+            self._pump()
+
+    def set_max_concurrent(self, max_concurrent):
+        self.max_concurrent = max(1, max_concurrent)
+        self._pump()
+
+    def jobs(self):
+        """Snapshot of queued, running and paused jobs for the inspector"""
+        return sorted(self._jobs, key=lambda job: (job.state == "queued", self.priority(job), job.seq))
+
+    def _on_finished(self, job):
+        if job in self._jobs:
+            self._jobs.remove(job)
+        self._pump()
+
+    def _pump(self):
+        active = [job for job in self._jobs if job.state == "running"]
+        paused = sorted((job for job in self._jobs if job.state == "paused"), key=lambda job: (self.priority(job), job.seq))
+        queued = sorted((job for job in self._jobs if job.state == "queued"), key=lambda job: (self.priority(job), job.seq))
+
+        # Paused jobs already hold resources, so they continue before queued background jobs start
+        for job in paused:
+            if len(active) >= self.max_concurrent:
+                break
+            job.worker.resume()
+            job.state = "running"
+            active.append(job)
+
+        for job in queued:
+            if len(active) < self.max_concurrent:
+                self._start(job)
+                active.append(job)
+                continue
+            if self.priority(job) != 0:
+                break
+            # Foreground job over the cap: make room by pausing a background job
+            victims = [running for running in active if self.priority(running) != 0]
+            if not victims:
+                break
+            victim = max(victims, key=lambda running: running.seq)
+            victim.worker.pause()
+            victim.state = "paused"
+            active.remove(victim)
+            self._start(job)
+            active.append(job)
+        self.jobs_changed.emit()
+
+    def _start(self, job):
+        job.state = "running"
+        job.started_at = time.monotonic()
+        job.worker.start()
 
-        if self.directory:
-            dir_expanded = os.path.expanduser(self.directory)
-            cmd.extend(["-onlyin", dir_expanded])
 
-        # print(f"Running mdfind with query: {cmd}")
+class LiveSearchWorker(QThread):
+    """Keep mdfind -live running for a tab and report changes to its results as diffs.
+    Changes within the coalescing window are merged into a single update."""
+
+    changes_signal = pyqtSignal(list, list)  # added rows, removed paths
+    error_signal = pyqtSignal(str)
+
+    def __init__(self, query_str, directory, known_paths, coalesce_interval=LIVE_COALESCE_INTERVAL):
+        super().__init__()
+        self.live = LiveSearch(query_str, directory, known_paths, coalesce_interval)
+        self.row_filter = None  # Checks re:/glob: patterns mdfind only matched by their literal
+        self._is_running = True
+
+    def run(self):
         try:
-            self.process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+            self.live.start()
         except Exception as e:
             self.error_signal.emit(str(e))
             return
 
+        for added, removed in self.live.diffs():
+            if not self._is_running:
+                break
+            added_rows = [row for _path, row in stat_rows(sorted(added)) if row is not None]
+            if self.row_filter is not None:
+                added_rows = self.row_filter(added_rows)
+            self.changes_signal.emit(added_rows, sorted(removed))
+
+    def stop(self):
+        self._is_running = False
+        self.live.stop()
+
+
+class MetadataWorker(QThread):
+    """Stat result rows in the background for deferred metadata mode"""
+
+    resolved_signal = pyqtSignal(list)  # List of (path, row or None) pairs
+
+    def __init__(self, paths, workers=DEFAULT_STAT_WORKERS):
+        super().__init__()
+        self.paths = paths
+        self.workers = workers
+        self._is_running = True
+
+    def run(self):
+        for start in range(0, len(self.paths), METADATA_CHUNK_SIZE):
+            if not self._is_running:
+                return
+            chunk = self.paths[start:start + METADATA_CHUNK_SIZE]
+            self.resolved_signal.emit(list(stat_rows(chunk, self.workers)))
+
+    def is_running(self):
+        """False once stop() has been called"""
+        return self._is_running
+
+    def stop(self):
+        self._is_running = False
+
+
+class IndexBuildWorker(QThread):
+    """Crawl the roots of the file index in the background.
+    With load_trigrams the in-memory trigram index is (re)loaded from the database afterwards;
+    with crawl=False only that load runs."""
+
+    progress_signal = pyqtSignal(int)  # Entries written so far
+    done_signal = pyqtSignal(int, float)  # Entries written, seconds
+    trigram_signal = pyqtSignal(object)  # Freshly loaded TrigramIndex
+    error_signal = pyqtSignal(str)
+
+    def __init__(self, file_index, crawl=True, load_trigrams=False):
+        super().__init__()
+        self.file_index = file_index
+        self.crawl = crawl
+        self.load_trigrams = load_trigrams
+        self.stop_event = threading.Event()
+
+    def run(self):
+        started = time.monotonic()
+        try:
+            if self.crawl:
+                count = self.file_index.build(self.progress_signal.emit, self.stop_event)
+                if self.stop_event.is_set():
+                    return
+                self.done_signal.emit(count, time.monotonic() - started)
+            if self.load_trigrams:
+                trigram_index = TrigramIndex.from_file_index(self.file_index, self.stop_event)
+                if trigram_index is not None:
+                    self.trigram_signal.emit(trigram_index)
+        except (OSError, sqlite3.Error) as e:
+            self.error_signal.emit(f"File index build failed: {e}")
+
+    def stop(self):
+        self.stop_event.set()
+
+
+class IndexUpdateWorker(QThread):
+    """Keeps the file index current with an IndexUpdater (inotify or directory mtime polling)"""
+
+    cycle_signal = pyqtSignal(object, dict)  # IndexUpdate of a cycle with changes, updater summary
+
+    def __init__(self, file_index, poll_interval=INDEX_POLL_INTERVAL, use_inotify=True):
+        super().__init__()
+        self.file_index = file_index
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.stop_event = threading.Event()
+        self.summary = {}
+
+    def run(self):
+        updater = IndexUpdater(self.file_index, use_inotify=self.use_inotify)
         try:
-            while self._is_running:
-                line = self.process.stdout.readline()
-                if not line:
+            while not self.stop_event.is_set():
+                # inotify only has to drain its queue, so it can run often
+                interval = INDEX_INOTIFY_INTERVAL if updater.mode == "inotify" else self.poll_interval
+                if self.stop_event.wait(interval):
                     break
-                idx += 1
-                path = line.strip()
-                if path:
-                    try:
-                        # Use single os.stat() call instead of multiple os.path calls
-                        stat_result = os.stat(path)
-                        is_dir = stat.S_ISDIR(stat_result.st_mode)
-                        size_ = 0 if is_dir else stat_result.st_size
-                        mtime = stat_result.st_mtime
-                        files_info.append((os.path.basename(path), size_, mtime, path))
-                    except (OSError, IOError):
-                        # File may have been deleted or is inaccessible
-                        continue
-                if idx % 10 == 0:
-                    self.progress_signal.emit(min(100, idx % 100))
-            self.process.wait()
-            self.result_signal.emit(files_info)
-        except Exception as e:
-            self.error_signal.emit(str(e))
-            self.stop()
+                try:
+                    stats = updater.run_cycle(self.stop_event)
+                except (OSError, sqlite3.Error):
+                    continue  # Try again next cycle
+                self.summary = updater.summary()
+                if stats.has_changes():
+                    self.cycle_signal.emit(stats, self.summary)
         finally:
-            self.progress_signal.emit(0)
+            updater.close()
 
     def stop(self):
-        self._is_running = False
-        if self.process is not None:
-            try:
-                self.process.terminate()
-            except Exception:
-                pass
+        self.stop_event.set()
+
+
+class SnapshotWorker(QThread):
+    """Load or replace the on-disk snapshot of a saved search.
+    With rows, they are diffed against the snapshot and saved in its place; without,
+    the snapshot is only loaded. A snapshot of other search parameters is ignored."""
+
+    loaded_signal = pyqtSignal(object, float)  # ResultView of the snapshot (None if there is none), time saved
+    delta_signal = pyqtSignal(object)  # ResultDelta against the previous snapshot, None without one
+    error_signal = pyqtSignal(str)
+
+    def __init__(self, store, saved_id, search, rows=None):
+        super().__init__()
+        self.store = store
+        self.saved_id = saved_id
+        self.search = search
+        self.rows = rows
+
+    def run(self):
+        snapshot = self.store.load(self.saved_id)
+        if snapshot is not None and snapshot[2] != self.search:
+            snapshot = None
+        if self.rows is None:
+            if snapshot is None:
+                self.loaded_signal.emit(None, 0.0)
+            else:
+                self.loaded_signal.emit(ResultStore(snapshot[0]).view(), snapshot[1])
+            return
+        delta = diff_results(snapshot[0], self.rows) if snapshot is not None else None
+        try:
+            self.store.save(self.saved_id, self.rows, self.search)
+        except (OSError, ValueError) as e:
+            self.error_signal.emit(f"Saving the results of a saved search failed: {e}")
+        self.delta_signal.emit(delta)
 
 
 class DirectoryScanWorker(QThread):
@@ -723,23 +1205,7 @@ class DirectoryScanWorker(QThread):
         self.result_signal.emit(results)
 
     def _get_directory_size(self, entry):
-        try:
-            completed = subprocess.run(
-                ["du", "-skxP", str(entry)],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                check=False
-            )
-            stdout = completed.stdout.decode(errors="ignore").strip()
-            if stdout:
-                last_line = stdout.splitlines()[-1]
-                first_token = last_line.split()[0]
-                return int(first_token) * 1024
-        except (ValueError, IndexError, FileNotFoundError, PermissionError):
-            return 0
-        except Exception:
-            return 0
-        return 0
+        return directory_size(entry)
 
     def stop(self):
         self._is_running = False
@@ -758,45 +1224,9 @@ class SubdirScanWorker(QThread):
     
     def run(self):
         try:
-            completed = subprocess.run(
-                ["du", "-d", "1", "-kxP", str(self.parent_dir)],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                check=False,
-                timeout=60
-            )
-            stdout = completed.stdout.decode(errors="ignore").strip()
-            if not stdout:
-                self.result_signal.emit([])
-                return
-            
-            results = []
-            lines = stdout.splitlines()
-            parent_path = self.parent_dir.resolve()
-            
-            for line in lines:
-                if not self._is_running:
-                    return
-                
-                parts = line.split(maxsplit=1)
-                if len(parts) < 2:
-                    continue
-                try:
-                    size_kb = int(parts[0])
-                    path_str = parts[1]
-                    entry_path = Path(path_str).resolve()
-                    
-                    # Skip the parent directory itself
-                    if entry_path == parent_path:
-                        continue
-                    
-                    # Only include immediate children
-                    if entry_path.parent == parent_path and entry_path.is_dir():
-                        results.append((entry_path.name, size_kb * 1024, entry_path))
-                except (ValueError, OSError):
-                    continue
-            
-            self.result_signal.emit(results)
+            results = subdirectory_sizes(self.parent_dir)
+            if self._is_running:
+                self.result_signal.emit(results)
         except subprocess.TimeoutExpired:
             self.error_signal.emit("Scan timeout - directory too large or slow")
         except Exception as exc:
@@ -1123,7 +1553,61 @@ class MdfindApp(QMainWindow):
         self.preview_enabled = config.get("preview_enabled", False) 
         self.continuous_playback = config.get("continuous_playback", False)
         self.simple_mode = config.get("simple_mode", False)  # Simple/Advanced UI toggle
-        
+        self.stream_results = config.get("stream_results", True)  # Show results while mdfind is still running
+        self.rank_results = config.get("rank_results", True)  # Unsorted tabs show results by relevance
+        self.frecency = FrecencyStore(config.get("open_history"))  # Files opened from the app, for ranking
+        self.stat_workers = config.get("stat_workers", DEFAULT_STAT_WORKERS)  # Thread pool size for stat calls
+        self.stat_ordered = config.get("stat_ordered", True)  # Keep mdfind output order for stat-ed rows
+        self.deferred_metadata = config.get("deferred_metadata", False)  # Only stat rows that are shown, sorted or filtered by size
+        self.null_delimited = config.get("null_delimited", True)  # Read mdfind -0 output in binary blocks
+        self.search_backend = config.get("search_backend", BACKEND_AUTO)  # mdfind, scandir or auto
+        if self.search_backend != BACKEND_AUTO and self.search_backend not in BACKENDS:
+            self.search_backend = BACKEND_AUTO
+
+        # Optional SQLite file name index over user-chosen roots
+        self.file_index_enabled = config.get("file_index_enabled", False)
+        self.file_index = None
+        self.index_build_worker = None
+        # In-memory trigram index over the file index, for instant substring lookups
+        self.trigram_index_enabled = config.get("trigram_index_enabled", True)
+        self.trigram_index = None
+        # Incremental index maintenance
+        self.file_index_auto_update = config.get("file_index_auto_update", True)
+        self.file_index_poll_interval = config.get("file_index_poll_interval", INDEX_POLL_INTERVAL)
+        self.index_update_worker = None
+        if self.file_index_enabled:
+            self._open_file_index(config.get("file_index_roots", []))
+            if self.trigram_index_enabled and self.file_index is not None:
+                self.rebuild_file_index(crawl=False)
+            self._start_index_updates()
+
+        self.refined_searches = 0  # Searches answered by filtering previous results
+
+        # Search supersession: every search gets a generation; results of older ones are dropped
+        self.search_generation = 0
+        self.superseded_searches = 0
+        self.late_results_dropped = 0
+        self.retired_workers = set()  # Stopped workers whose threads have not exited yet
+
+        # Global limit on concurrent searches, visible tab first
+        self.search_scheduler = SearchScheduler(
+            config.get("max_concurrent_searches", DEFAULT_MAX_CONCURRENT_SEARCHES), self
+        )
+
+        # Result cache shared by all tabs
+        self.result_cache_enabled = config.get("result_cache_enabled", True)
+        self.result_cache = ResultCache(
+            max_bytes=config.get("result_cache_mb", DEFAULT_CACHE_BYTES // (1024 * 1024)) * 1024 * 1024,
+            ttl=config.get("result_cache_ttl", DEFAULT_CACHE_TTL),
+            stale_while_revalidate=config.get("result_cache_swr", True)
+        )
+
+        # Saved searches: pinned tabs keep their last results on disk and refresh in the background
+        self.snapshot_store = SnapshotStore()
+        self.snapshot_workers = set()
+        self.saved_search_refresh = config.get("saved_search_refresh", True)
+        self.saved_search_interval = config.get("saved_search_interval", DEFAULT_REFRESH_INTERVAL)
+
         # Keep backward compatibility with old dark_mode setting
         if "dark_mode" in config and "theme_mode" not in config:
             self.theme_mode = "dark" if config["dark_mode"] else "light"
@@ -1191,6 +1675,62 @@ class MdfindApp(QMainWindow):
         continuous_playback_action.setChecked(self.continuous_playback)
         continuous_playback_action.triggered.connect(self.toggle_continuous_playback)
         self.continuous_playback_action = continuous_playback_action
+
+        # Stream results toggle
+        stream_results_action = view_menu.addAction('🌊 Stream Results')
+        stream_results_action.setCheckable(True)
+        stream_results_action.setChecked(self.stream_results)
+        stream_results_action.triggered.connect(self.toggle_stream_results)
+
+        # Relevance ranking toggle
+        rank_results_action = view_menu.addAction('🎯 Rank Results by Relevance')
+        rank_results_action.setCheckable(True)
+        rank_results_action.setChecked(self.rank_results)
+        rank_results_action.triggered.connect(self.toggle_rank_results)
+
+        # Stat pipeline settings
+        stat_workers_action = view_menu.addAction('⚙️ Stat Thread Pool...')
+        stat_workers_action.triggered.connect(self.set_stat_workers)
+        stat_ordered_action = view_menu.addAction('🔢 Keep mdfind Result Order')
+        stat_ordered_action.setCheckable(True)
+        stat_ordered_action.setChecked(self.stat_ordered)
+        stat_ordered_action.triggered.connect(self.toggle_stat_ordered)
+        deferred_metadata_action = view_menu.addAction('🕒 Deferred Metadata')
+        deferred_metadata_action.setCheckable(True)
+        deferred_metadata_action.setChecked(self.deferred_metadata)
+        deferred_metadata_action.triggered.connect(self.toggle_deferred_metadata)
+
+        # Result cache submenu
+        cache_menu = view_menu.addMenu('🗃️ Result Cache')
+        cache_enabled_action = cache_menu.addAction('✅ Enable Result Cache')
+        cache_enabled_action.setCheckable(True)
+        cache_enabled_action.setChecked(self.result_cache_enabled)
+        cache_enabled_action.triggered.connect(self.toggle_result_cache)
+        cache_swr_action = cache_menu.addAction('♻️ Show Stale Results While Refreshing')
+        cache_swr_action.setCheckable(True)
+        cache_swr_action.setChecked(self.result_cache.stale_while_revalidate)
+        cache_swr_action.triggered.connect(self.toggle_result_cache_swr)
+        cache_menu.addAction('📈 Cache Statistics', self.show_result_cache_stats)
+        cache_menu.addAction('🧹 Clear Result Cache', self.result_cache.clear)
+        saved_refresh_action = view_menu.addAction('🔁 Refresh Pinned Searches in Background')
+        saved_refresh_action.setCheckable(True)
+        saved_refresh_action.setChecked(self.saved_search_refresh)
+        saved_refresh_action.triggered.connect(self.toggle_saved_search_refresh)
+        # Search backend submenu
+        backend_menu = view_menu.addMenu('🔌 Search Backend')
+        self.backend_action_group = QActionGroup(self)
+        backend_choices = [(BACKEND_AUTO, 'Automatic (Spotlight, walk directory if nothing found)')]
+        backend_choices += [(name, backend.label) for name, backend in BACKENDS.items()]
+        for name, label in backend_choices:
+            action = backend_menu.addAction(label)
+            action.setCheckable(True)
+            action.setChecked(name == self.search_backend)
+            action.triggered.connect(lambda checked, n=name: self.set_search_backend(n))
+            self.backend_action_group.addAction(action)
+        view_menu.addAction('🗂️ File Index...', self.show_file_index_status)
+        view_menu.addAction('🚦 Concurrent Searches...', self.set_max_concurrent_searches)
+        view_menu.addAction('🧭 Search Jobs', self.show_search_jobs)
+        view_menu.addAction('🩺 Search Diagnostics', self.show_search_diagnostics)
         
         # Theme selection submenu
         themes_menu = view_menu.addMenu('🎨 Themes')
@@ -1287,6 +1827,11 @@ class MdfindApp(QMainWindow):
         
         self.edit_query = QLineEdit()
         self.edit_query.setPlaceholderText("Enter search terms...")
+        self.edit_query.setToolTip(
+            "Filters can be typed after the search terms, e.g.\n"
+            "report ext:pdf,docx size:>10MB modified:<7d kind:image path:~/Documents -name:tmp\n"
+            "Regex and glob name patterns: re:^IMG_\\d{4}\\.jpe?g$ glob:*.tar.gz"
+        )
 
         # Create toggle buttons inside the search input (like VS Code)
         self.chk_file_name = QToolButton()
@@ -1324,6 +1869,14 @@ class MdfindApp(QMainWindow):
 
         self.lbl_items_found = QLabel("📊 0 items found")
         self.lbl_items_found.setObjectName("itemsFoundLabel")
+
+        # Counts, throughput and phase timings of the current tab's search
+        self.lbl_search_progress = QLabel("")
+        self.lbl_search_progress.setObjectName("searchProgressLabel")
+
+        # Stat throughput of the current tab's search
+        self.lbl_stat_rate = QLabel("")
+        self.lbl_stat_rate.setObjectName("statRateLabel")
         
         # Add refresh button
         self.btn_refresh = QPushButton("🔄 Refresh")
@@ -1334,6 +1887,8 @@ class MdfindApp(QMainWindow):
         form_layout.addWidget(lbl_query)
         form_layout.addWidget(self.search_container, 4)
         form_layout.addWidget(self.lbl_items_found, 1)
+        form_layout.addWidget(self.lbl_search_progress)
+        form_layout.addWidget(self.lbl_stat_rate)
         form_layout.addWidget(self.btn_refresh)
         left_layout.addLayout(form_layout)
 
@@ -1346,6 +1901,7 @@ class MdfindApp(QMainWindow):
         
         self.edit_dir = QLineEdit()
         self.edit_dir.setPlaceholderText("Leave empty to search everywhere...")
+        self.edit_dir.setToolTip("Separate several folders with ; to search them in parallel")
         
         btn_select_dir = QPushButton("📂 Select Dir")
         btn_select_dir.clicked.connect(self.select_directory)
@@ -1430,6 +1986,12 @@ class MdfindApp(QMainWindow):
         
         # Pin/Unpin action - will be updated dynamically
         self.pin_action = self.tab_context_menu.addAction("📌 Pin Tab", self.toggle_pin_tab)
+        self.live_action = self.tab_context_menu.addAction("📡 Live Updates", self.toggle_live_updates)
+        self.live_action.setCheckable(True)
+        self.refresh_interval_action = self.tab_context_menu.addAction(
+            "⏱️ Refresh Interval...", self.set_saved_search_interval
+        )
+        self.show_changes_action = self.tab_context_menu.addAction("🧾 Show Changes", self.show_saved_search_changes)
         self.tab_context_menu.addSeparator()
 
         # Scan selected directory action (enabled only when a folder is selected)
@@ -1729,6 +2291,7 @@ class MdfindApp(QMainWindow):
         self.single_context_menu.addSeparator()
         self.single_context_menu.addAction("🗜️ Compress to ZIP", self.compress_file)
         self.single_context_menu.addAction("🔍 Open in Finder", self.open_in_finder)
+        self.single_context_menu.addAction("🗂️ Select Results in Same Folder", self.select_same_folder)
         self.single_context_menu.addAction("📝 Spotlight Metadata", self.show_spotlight_metadata)
         self.single_context_menu.addAction("📤 Export Results", self.export_results)
 
@@ -1740,6 +2303,7 @@ class MdfindApp(QMainWindow):
         self.multi_context_menu.addAction("✏️ Batch Rename", self.batch_rename_files)
         self.multi_context_menu.addSeparator()
         self.multi_context_menu.addAction("🗜️ Compress to ZIP", self.compress_multiple_files)
+        self.multi_context_menu.addAction("🔍 Open Containing Folders", self.open_containing_folders)
 
         self.batch_size = 100
 
@@ -1782,6 +2346,15 @@ class MdfindApp(QMainWindow):
         
         # Restore pinned tabs from previous session
         self.restore_pinned_tabs()
+        self.saved_search_timer = QTimer(self)
+        self.saved_search_timer.setInterval(SAVED_SEARCH_CHECK_INTERVAL * 1000)
+        self.saved_search_timer.timeout.connect(self.check_saved_searches)
+        self.saved_search_timer.start()
+        # Opens are recorded in memory and written at most once per delay, and at quit
+        self.open_history_timer = QTimer(self)
+        self.open_history_timer.setSingleShot(True)
+        self.open_history_timer.setInterval(OPEN_HISTORY_SAVE_DELAY * 1000)
+        self.open_history_timer.timeout.connect(self.save_open_history)
         
         # Apply simple mode settings on startup
         if self.simple_mode:
@@ -1905,9 +2478,12 @@ class MdfindApp(QMainWindow):
         if index in self.search_tabs:
             # Stop any running search
             tab = self.search_tabs[index]
-            if tab.search_worker and tab.search_worker.isRunning():
-                tab.search_worker.stop()
-                tab.search_worker.wait()
+            tab.search_generation = -1  # Drop anything its workers still emit
+            if tab.search_worker and (tab.search_worker.isRunning() or self.search_scheduler.is_queued(tab.search_worker)):
+                self._retire_worker(tab.search_worker)
+            for worker in tab.metadata_workers:
+                self._retire_worker(worker)
+            self._stop_live_updates(tab)
             
             # Disconnect tree signals to prevent crashes
             try:
@@ -1944,14 +2520,12 @@ class MdfindApp(QMainWindow):
     
     def on_tab_changed(self, index):
         """Handle tab change event"""
+        # Searches of the visible tab get priority in the scheduler
+        shown = self.search_tabs.get(index)
+        self.search_scheduler.set_foreground_owner(shown)
+        if shown is not None and shown.needs_initial_search:
+            self.trigger_tab_search(shown, refresh=True)  # A restored pinned tab without saved results
         if index >= 0:
-            # Check if this is a restored pinned tab that needs initial search
-            if index in self.search_tabs:
-                tab = self.search_tabs[index]
-                if hasattr(tab, 'needs_initial_search') and tab.needs_initial_search:
-                    self.trigger_tab_search(index, tab)
-                    tab.needs_initial_search = False
-            
             # Get the current tab data
             current_tab = self.get_current_tab()
             if current_tab:
@@ -1984,6 +2558,9 @@ class MdfindApp(QMainWindow):
                     
                     # Update the items found label with the tab's result count
                     self.lbl_items_found.setText(f"📊 {current_tab.items_found_count} items found")
+                    self.lbl_stat_rate.setText(current_tab.stat_summary)
+                    self.lbl_stat_rate.setToolTip(self._root_progress_details(current_tab.root_progress))
+                    self.update_search_progress(current_tab)
                 finally:
                     # Re-enable signals
                     self.edit_query.blockSignals(False)
@@ -2043,6 +2620,10 @@ class MdfindApp(QMainWindow):
                 self.pin_action.setText("📌 Pin Tab")
 
             can_toggle_pin = bool(tab) and (tab.is_pinned or not tab.is_scan_tab)
+            self.live_action.setEnabled(bool(tab) and not tab.is_scan_tab)
+            self.live_action.setChecked(bool(tab) and tab.is_live)
+            self.refresh_interval_action.setEnabled(bool(tab) and tab.saved_id is not None)
+            self.show_changes_action.setEnabled(bool(tab) and tab.last_delta is not None)
             self.pin_action.setEnabled(can_toggle_pin)
             if tab and tab.is_scan_tab and not tab.is_pinned:
                 self.pin_action.setToolTip("Usage scan tabs cannot be pinned.")
@@ -2201,6 +2782,15 @@ class MdfindApp(QMainWindow):
         # Store the original title if not already stored
         if not tab.tab_title:
             tab.tab_title = self.tab_widget.tabText(index)
+
+        # A pinned tab is a saved search: its results are kept on disk from now on
+        tab.saved_id = new_saved_id()
+        tab.refresh_schedule = RefreshSchedule(self.saved_search_interval)
+        if tab.search_complete:
+            tab.refresh_schedule.refreshed()
+            self._start_snapshot_worker(tab, tab.all_file_data.copy())
+        else:
+            tab.snapshot_pending = True
         
         # Move tab to the end of pinned tabs section
         self.reorder_tabs_after_pin_change()
@@ -2218,6 +2808,11 @@ class MdfindApp(QMainWindow):
         
         tab = self.search_tabs[index]
         tab.is_pinned = False
+        if tab.saved_id is not None:
+            self.snapshot_store.delete(tab.saved_id)
+        tab.saved_id = tab.refresh_schedule = tab.last_delta = None
+        tab.snapshot_pending = False
+        self._apply_delta_marks(tab, {})
         
         # Reorder tabs
         self.reorder_tabs_after_pin_change()
@@ -2290,32 +2885,35 @@ class MdfindApp(QMainWindow):
                     "max_size": tab.max_size,
                     "extensions": tab.extensions,
                     "extra_clause": tab.extra_clause,
-                    "is_bookmark": tab.is_bookmark
+                    "is_bookmark": tab.is_bookmark,
+                    "is_live": tab.is_live,
+                    "saved_id": tab.saved_id,
+                    "refresh_interval": tab.refresh_schedule.interval if tab.refresh_schedule else None
                 })
         
         config["pinned_tabs"] = pinned_tabs_data
         write_config(config)
     
-    def trigger_tab_search(self, index, search_tab):
-        """Trigger search for a restored pinned tab"""
+    def trigger_tab_search(self, search_tab, refresh=False):
+        """Run the search of a pinned tab again with its stored parameters.
+        A refresh bypasses the result cache and replaces the rows in one piece."""
         # Don't start if already searching
-        if search_tab.search_worker is not None and search_tab.search_worker.isRunning():
+        worker = search_tab.search_worker
+        if worker is not None and (worker.isRunning() or self.search_scheduler.is_queued(worker)):
             return
+        search_tab.needs_initial_search = False
         
         # Start the search
-        search_tab.search_worker = SearchWorker(
+        self._start_search_worker(search_tab, SearchWorker(
             search_tab.query,
             search_tab.directory,
             search_tab.file_name_search,
             search_tab.match_case,
             search_tab.full_match,
             search_tab.extra_clause,
-            search_tab.is_bookmark
-        )
-        search_tab.search_worker.progress_signal.connect(self.update_progress)
-        search_tab.search_worker.result_signal.connect(lambda results, st=search_tab: self.update_tree(results, st))
-        search_tab.search_worker.error_signal.connect(self.show_error)
-        search_tab.search_worker.start()
+            search_tab.is_bookmark,
+            stream=self.stream_results and not refresh
+        ), use_cache=not refresh)
     
     def restore_pinned_tabs(self):
         """Restore pinned tabs from config on startup"""
@@ -2343,6 +2941,11 @@ class MdfindApp(QMainWindow):
                 is_bookmark=tab_data.get("is_bookmark", False)
             )
             
+            search_tab.is_live = tab_data.get("is_live", False)
+            # Pinned tabs from before saved searches get an id, and a snapshot after their first search
+            search_tab.saved_id = tab_data.get("saved_id") or new_saved_id()
+            search_tab.refresh_schedule = RefreshSchedule(tab_data.get("refresh_interval") or self.saved_search_interval)
+            
             # Apply default sort settings
             search_tab.sort_column = self.default_sort_column
             search_tab.sort_order = self.default_sort_order
@@ -2362,21 +2965,196 @@ class MdfindApp(QMainWindow):
             
             # Set custom close button (will be hidden for pinned tabs)
             self.update_tab_close_button(index)
-            
-            # Mark tab as needing search (will be triggered when user switches to it)
+
+            # Show the saved results at once; without any, the tab searches once shown or due
             if search_tab.query or search_tab.extra_clause:
-                search_tab.needs_initial_search = True
+                self._start_snapshot_worker(search_tab)
         
         # Update tab styling after all pinned tabs are restored
-        if pinned_tabs_data:
-            self.update_tab_style()
-            
-            # Trigger search for the first pinned tab only (will become active)
-            if 0 in self.search_tabs:
-                first_tab = self.search_tabs[0]
-                if hasattr(first_tab, 'needs_initial_search') and first_tab.needs_initial_search:
-                    self.trigger_tab_search(0, first_tab)
-                    first_tab.needs_initial_search = False
+        self.update_tab_style()
+        self.save_pinned_tabs()
+
+    # ========== Saved searches ==========
+    @staticmethod
+    def _saved_search_params(search_tab):
+        """Parameters that decide the rows of a saved search; a snapshot of others is not diffed"""
+        return {
+            "query": search_tab.query,
+            "directory": search_tab.directory,
+            "file_name_search": search_tab.file_name_search,
+            "match_case": search_tab.match_case,
+            "full_match": search_tab.full_match,
+            "extra_clause": search_tab.extra_clause,
+            "is_bookmark": search_tab.is_bookmark,
+        }
+
+    def _start_snapshot_worker(self, search_tab, rows=None):
+        """Load the snapshot of a saved search, or with rows diff and replace it off the UI thread"""
+        saved_id = search_tab.saved_id
+        worker = SnapshotWorker(self.snapshot_store, saved_id, self._saved_search_params(search_tab), rows)
+        worker.loaded_signal.connect(
+            lambda snapshot, saved_at, st=search_tab: st.saved_id == saved_id and self.on_snapshot_loaded(snapshot, saved_at, st)
+        )
+        worker.delta_signal.connect(
+            lambda delta, st=search_tab: st.saved_id == saved_id and self.on_saved_search_delta(delta, st)
+        )
+        worker.error_signal.connect(self.show_error)
+        self.snapshot_workers.add(worker)
+        worker.finished.connect(lambda w=worker: self.snapshot_workers.discard(w))
+        worker.start()
+
+    def on_snapshot_loaded(self, rows, saved_at, search_tab):
+        """Show the saved results of a restored pinned tab. One without any searches now if it
+        is shown, else when it is activated or its refresh comes due, which backs off while busy."""
+        if search_tab.search_worker is not None:
+            return  # A search started meanwhile
+        if rows is None:
+            if search_tab is self.get_current_tab():
+                self.trigger_tab_search(search_tab, refresh=True)
+            else:
+                search_tab.needs_initial_search = True
+            return
+        search_tab.refresh_schedule.refreshed(saved_at)
+        self.update_tree(rows, search_tab)
+        search_tab.stat_summary = f"💾 Saved results from {time.strftime('%Y-%m-%d %H:%M', time.localtime(saved_at))}"
+        if search_tab is self.get_current_tab():
+            self.lbl_stat_rate.setText(search_tab.stat_summary)
+
+    def _save_search_snapshot(self, search_tab):
+        """Diff the complete results of a saved search against its snapshot and replace it"""
+        if not search_tab.snapshot_pending:
+            return
+        if search_tab.awaiting_revalidation:
+            search_tab.awaiting_revalidation = False  # These are cached rows; the fresh ones follow
+            return
+        search_tab.snapshot_pending = False
+        worker = search_tab.search_worker
+        if search_tab.saved_id is None or (worker is not None and not worker.is_running()):
+            return  # Stopped searches leave partial results
+        search_tab.refresh_schedule.refreshed()
+        self._start_snapshot_worker(search_tab, search_tab.all_file_data.copy())
+
+    def on_saved_search_delta(self, delta, search_tab):
+        """Show what changed in a saved search since its previous snapshot"""
+        when = time.strftime('%H:%M', time.localtime(search_tab.refresh_schedule.last_refresh))
+        if delta is None:
+            search_tab.stat_summary = f"💾 Results saved at {when}"
+            tooltip = ""
+        else:
+            search_tab.last_delta = delta
+            search_tab.stat_summary = f"🔁 Refreshed at {when} · {delta.summary()}"
+            tooltip = (f"Refreshed at {when}: {len(delta.added):,} added, {len(delta.removed):,} removed, "
+                       f"{len(delta.changed):,} changed")
+        self._apply_delta_marks(search_tab, delta.marks() if delta else {})
+        for index, tab in self.search_tabs.items():
+            if tab is search_tab:
+                self.tab_widget.setTabToolTip(index, tooltip)
+        if search_tab is self.get_current_tab():
+            self.lbl_stat_rate.setText(search_tab.stat_summary)
+
+    def _apply_delta_marks(self, search_tab, marks):
+        """Highlight the rendered rows that were added or changed in the latest refresh"""
+        if not marks and not search_tab.delta_marks:
+            return
+        search_tab.delta_marks = marks
+        for idx in range(search_tab.current_loaded):
+            tree_item = search_tab.tree.topLevelItem(idx)
+            if tree_item is not None:
+                self._mark_delta_item(tree_item, marks.get(tree_item.text(3)))
+
+    @staticmethod
+    def _mark_delta_item(tree_item, mark):
+        font = tree_item.font(0)
+        font.setBold(mark is not None)
+        tree_item.setFont(0, font)
+        if mark == "added":
+            tree_item.setToolTip(0, "🆕 New since the previous refresh")
+        elif mark == "changed":
+            tree_item.setToolTip(0, "✏️ Size or date changed since the previous refresh")
+
+    def check_saved_searches(self):
+        """Refresh the saved searches that are due; while the machine is busy they back off"""
+        if not self.saved_search_refresh:
+            return
+        now = time.time()
+        due = [tab for tab in self.search_tabs.values()
+               if tab.refresh_schedule is not None and tab.refresh_schedule.due(now)]
+        if not due:
+            return
+        running = sum(1 for job in self.search_scheduler.jobs() if job.state != "queued")
+        busy = running >= self.search_scheduler.max_concurrent or machine_busy()
+        for tab in due:
+            if busy:
+                tab.refresh_schedule.back_off(now)
+            else:
+                self.trigger_tab_search(tab, refresh=True)
+
+    def toggle_saved_search_refresh(self, checked):
+        """Turn the scheduled background refresh of pinned searches on or off"""
+        self.saved_search_refresh = checked
+        config = read_config()
+        config["saved_search_refresh"] = checked
+        write_config(config)
+
+    def set_saved_search_interval(self):
+        """Ask how often the pinned search under the context menu refreshes"""
+        tab = self.search_tabs.get(getattr(self, 'context_menu_tab_index', -1))
+        if not tab or tab.refresh_schedule is None:
+            return
+        dialog = QInputDialog(self)
+        dialog.setWindowTitle("⏱️ Refresh Interval")
+        dialog.setLabelText("Minutes between background refreshes (0 = never):")
+        dialog.setInputMode(QInputDialog.InputMode.IntInput)
+        dialog.setIntRange(0, 24 * 60)
+        dialog.setIntValue(tab.refresh_schedule.interval // 60)
+        self.apply_dialog_dark_mode(dialog)
+        if not dialog.exec():
+            return
+        tab.refresh_schedule.set_interval(dialog.intValue() * 60)
+        self.save_pinned_tabs()
+
+    def show_saved_search_changes(self):
+        """List the files added, removed and changed in the latest refresh of a pinned search"""
+        tab = self.search_tabs.get(getattr(self, 'context_menu_tab_index', -1))
+        if not tab or tab.last_delta is None:
+            return
+        delta = tab.last_delta
+        lines = [f"Added ({len(delta.added):,})"] + [f"  + {row[3]}" for row in delta.added]
+        lines += ["", f"Removed ({len(delta.removed):,})"] + [f"  − {row[3]}" for row in delta.removed]
+        lines += ["", f"Changed ({len(delta.changed):,})"]
+        for old, new in delta.changed:
+            old_date, new_date = (time.strftime('%Y-%m-%d %H:%M', time.localtime(row[2])) for row in (old, new))
+            lines.append(f"  ~ {new[3]}  {format_size(old[1])} → {format_size(new[1])}, {old_date} → {new_date}")
+        text = "\n".join(lines)
+
+        dialog = QDialog(self)
+        dialog.setWindowTitle(f"🧾 Changes — {tab.tab_title or tab.query}")
+        dialog.resize(760, 520)
+        is_dark = hasattr(self, 'dark_mode') and self.dark_mode
+        dialog.setStyleSheet(get_dialog_stylesheet(dark_mode=is_dark))
+        layout = QVBoxLayout(dialog)
+        layout.setContentsMargins(16, 16, 16, 16)
+        layout.setSpacing(10)
+        title = QLabel(f"{tab.stat_summary}")
+        title.setStyleSheet("font-size: 14px; font-weight: bold; margin-bottom: 4px;")
+        layout.addWidget(title)
+        text_edit = QPlainTextEdit()
+        text_edit.setPlainText(text)
+        text_edit.setReadOnly(True)
+        layout.addWidget(text_edit, 1)
+        btn_layout = QHBoxLayout()
+        btn_layout.addStretch()
+        copy_btn = QPushButton("📋 Copy")
+        copy_btn.clicked.connect(lambda: (
+            QApplication.clipboard().setText(text),
+            self.show_tooltip("Changes copied to clipboard!")
+        ))
+        btn_layout.addWidget(copy_btn)
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(dialog.accept)
+        btn_layout.addWidget(close_btn)
+        layout.addLayout(btn_layout)
+        dialog.exec()
             
     # ========== Preview logic ==========
     def on_tree_selection_changed(self):
@@ -2638,28 +3416,33 @@ class MdfindApp(QMainWindow):
             
         if not search_tab.file_data or search_tab.current_loaded >= len(search_tab.file_data):
             return
+        if search_tab.rank_partial and search_tab.current_loaded + self.batch_size > search_tab.ranking.k:
+            self._settle_ranking(search_tab)  # Scrolling past the ranked first screen
         end_idx = min(search_tab.current_loaded + self.batch_size, len(search_tab.file_data))
-        items_to_load = search_tab.file_data[search_tab.current_loaded:end_idx]
         
         # Disable updates for better performance during batch add
         search_tab.tree.setUpdatesEnabled(False)
         
         # Batch create all tree items first
         tree_items = []
-        for item in items_to_load:
-            name, size, mtime, path = item
-            display_size = format_size(size)
-            display_time = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(mtime))
-            
-            # emoji based on file type - use size==0 check to avoid extra os.path.isdir call
-            if size == 0 and os.path.isdir(path):
-                display_name = f"📁 {name}"
-            else:
-                # Get file extension and add appropriate emoji
-                _, ext = os.path.splitext(name.lower())
-                display_name = f"{self.extension_emoji_map.get(ext, '📄')} {name}"     
-                       
-            tree_items.append(QTreeWidgetItem([display_name, display_size, display_time, path]))
+        deferred_paths = []
+        for idx in range(search_tab.current_loaded, end_idx):
+            item = search_tab.file_data[idx]
+            if not has_metadata(item):
+                # Use metadata that was already read for this row, otherwise read it in the background
+                resolved = search_tab.metadata.get(item[3])
+                if resolved is not None:
+                    item = search_tab.file_data[idx] = resolved
+                elif item[3] not in search_tab.metadata:
+                    deferred_paths.append(item[3])
+            tree_item = QTreeWidgetItem(self._tree_item_texts(item))
+            mark = search_tab.delta_marks.get(item[3])
+            if mark is not None:
+                self._mark_delta_item(tree_item, mark)
+            hit = search_tab.content_hits.get(item[3])
+            if hit is not None:
+                tree_item.setToolTip(0, f"First match on line {hit[1]:,} (byte offset {hit[0]:,})")
+            tree_items.append(tree_item)
         
         # Batch add all items at once
         search_tab.tree.addTopLevelItems(tree_items)
@@ -2668,6 +3451,135 @@ class MdfindApp(QMainWindow):
         search_tab.tree.setUpdatesEnabled(True)
         
         search_tab.current_loaded = end_idx
+        if deferred_paths:
+            self._start_metadata_worker(search_tab, deferred_paths)
+
+    def _tree_item_texts(self, item):
+        """Column texts for a result row; size and date stay empty until known"""
+        name, size, mtime, path = item
+        if size is None:
+            display_size = display_time = "…"
+        else:
+            display_size = format_size(size)
+            display_time = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(mtime))
+        
+        # emoji based on file type - use size==0 check to avoid extra os.path.isdir call
+        if size == 0 and os.path.isdir(path):
+            display_name = f"📁 {name}"
+        else:
+            # Get file extension and add appropriate emoji
+            _, ext = os.path.splitext(name.lower())
+            display_name = f"{self.extension_emoji_map.get(ext, '📄')} {name}"
+        return [display_name, display_size, display_time, path]
+
+    # ========== Deferred metadata ==========
+    def _start_metadata_worker(self, search_tab, paths, on_done=None):
+        """Stat paths of a tab in the background and merge the results into the tab"""
+        worker = MetadataWorker(paths, self.stat_workers)
+        worker.resolved_signal.connect(lambda pairs, st=search_tab: self.apply_metadata(pairs, st))
+        worker.finished.connect(lambda st=search_tab, w=worker: self._on_metadata_worker_finished(st, w, on_done))
+        search_tab.metadata_workers.append(worker)
+        worker.start()
+        return worker
+
+    def _on_metadata_worker_finished(self, search_tab, worker, on_done):
+        if worker in search_tab.metadata_workers:
+            search_tab.metadata_workers.remove(worker)
+        worker.deleteLater()
+        if on_done is not None and worker.is_running():
+            on_done()
+
+    def _stop_metadata_workers(self, search_tab):
+        for worker in search_tab.metadata_workers:
+            worker.stop()
+        search_tab.metadata = {}
+        search_tab.full_metadata_worker = None
+
+    def apply_metadata(self, pairs, search_tab):
+        """Merge stat results into the rows of a tab that are already rendered"""
+        for path, row in pairs:
+            search_tab.metadata[path] = row
+        
+        resolved = dict(pairs)
+        for idx in range(min(search_tab.current_loaded, len(search_tab.file_data))):
+            item = search_tab.file_data[idx]
+            if has_metadata(item) or item[3] not in resolved:
+                continue
+            row = resolved[item[3]]
+            if row is None:
+                continue  # Deleted file, dropped by the next full metadata pass
+            search_tab.file_data[idx] = row
+            tree_item = search_tab.tree.topLevelItem(idx)
+            if tree_item is not None:
+                for column, text in enumerate(self._tree_item_texts(row)):
+                    tree_item.setText(column, text)
+
+    def _size_filter_active(self):
+        return bool(self.edit_min_size.text().strip() or self.edit_max_size.text().strip())
+
+    def ensure_full_metadata(self, search_tab):
+        """Make sure every row of a tab has size and mtime before sorting or filtering on them.
+        Returns True if the data is complete; otherwise a full stat pass is started and the
+        tab is filtered and sorted again when it finishes."""
+        if not search_tab.has_deferred_rows():
+            return True
+        if search_tab.full_metadata_worker is None:
+            paths = [item[3] for item in search_tab.all_file_data
+                     if not has_metadata(item) and item[3] not in search_tab.metadata]
+            if search_tab is self.get_current_tab():
+                self.lbl_stat_rate.setText(f"⏳ Reading metadata of {len(paths):,} items…")
+            search_tab.full_metadata_worker = self._start_metadata_worker(
+                search_tab, paths,
+                on_done=lambda st=search_tab: self._on_full_metadata_done(st)
+            )
+        return False
+
+    def _merge_metadata(self, search_tab):
+        """Replace deferred rows of a tab with their stat results, dropping deleted files"""
+        if isinstance(search_tab.all_file_data, ResultView):
+            search_tab.all_file_data = search_tab.all_file_data.resolve(search_tab.metadata)
+            return
+        merged = []
+        for item in search_tab.all_file_data:
+            if not has_metadata(item) and item[3] in search_tab.metadata:
+                item = search_tab.metadata[item[3]]
+                if item is None:
+                    continue
+            merged.append(item)
+        search_tab.all_file_data = merged
+
+    def _on_full_metadata_done(self, search_tab):
+        search_tab.full_metadata_worker = None
+        self._merge_metadata(search_tab)
+        if search_tab is self.get_current_tab():
+            self.lbl_stat_rate.setText(search_tab.stat_summary)
+        self.reapply_filter(search_tab)
+
+    def resolve_metadata_now(self, search_tab):
+        """Stat every deferred row of a tab synchronously, e.g. before exporting"""
+        self._settle_ranking(search_tab)
+        if not search_tab.has_deferred_rows():
+            return
+        paths = [item[3] for item in search_tab.all_file_data
+                 if not has_metadata(item) and item[3] not in search_tab.metadata]
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            search_tab.metadata.update(stat_rows(paths, self.stat_workers))
+        finally:
+            QApplication.restoreOverrideCursor()
+        self._merge_metadata(search_tab)
+        if isinstance(search_tab.file_data, ResultView):
+            # The rows share the store with all_file_data, which now has their metadata
+            search_tab.file_data = search_tab.file_data.resolve(search_tab.metadata)
+            return
+        file_data = []
+        for item in search_tab.file_data:
+            if not has_metadata(item):
+                item = search_tab.metadata.get(item[3])
+                if item is None:
+                    continue
+            file_data.append(item)
+        search_tab.file_data = file_data
     # ========== Search handling ==========
     def on_query_changed(self):
         self.search_timer.start(DEBOUNCE_DELAY)
@@ -2683,27 +3595,35 @@ class MdfindApp(QMainWindow):
         if not is_bookmark and not query and extra_clause is None:
             return
 
+        # A narrowed file name query can be answered from the results of the current tab
+        source_tab = None
+        if extra_clause is None and not is_bookmark:
+            source_tab = self._find_refinement_source(query, directory)
+
         # Create a new tab for this search
         search_tab = self.create_new_tab(query, directory, tab_title, extra_clause, is_bookmark)
-        
-        # Stop any existing search in this tab
-        if search_tab.search_worker is not None and search_tab.search_worker.isRunning():
-            search_tab.search_worker.stop()
-            search_tab.search_worker.wait()
 
-        # Create new search worker
-        search_tab.search_worker = SearchWorker(
-            query, directory,
-            self.chk_file_name.isChecked(),
-            self.chk_match_case.isChecked(),
-            self.chk_full_match.isChecked(),
-            extra_clause,  # Pass extra clause if provided
-            is_bookmark    # Pass the bookmark flag
-        )
-        search_tab.search_worker.progress_signal.connect(self.update_progress)
-        search_tab.search_worker.result_signal.connect(lambda results: self.update_tree(results, search_tab))
-        search_tab.search_worker.error_signal.connect(self.show_error)
-        search_tab.search_worker.start()
+        stream = self.stream_results
+        if source_tab is not None:
+            self.update_tree(refine_rows(source_tab.all_file_data, query, search_tab.match_case), search_tab)
+            search_tab.stat_summary = "🔎 Refined from previous results"
+            self.lbl_stat_rate.setText(search_tab.stat_summary)
+            self.refined_searches += 1
+            # The previous search was still running, so mdfind has to complete the result set.
+            # Its results replace the local ones in one update.
+            stream = False
+
+        if source_tab is None or not source_tab.search_complete:
+            # Create new search worker
+            self._start_search_worker(search_tab, SearchWorker(
+                query, directory,
+                self.chk_file_name.isChecked(),
+                self.chk_match_case.isChecked(),
+                self.chk_full_match.isChecked(),
+                extra_clause,  # Pass extra clause if provided
+                is_bookmark,   # Pass the bookmark flag
+                stream=stream
+            ))
 
         # Only update history if enabled and not a bookmark search
         if not is_bookmark and self.history_enabled and query and query not in self.query_history:
@@ -2715,6 +3635,30 @@ class MdfindApp(QMainWindow):
             write_config(cfg)
             self.query_completer.model().setStringList(self.query_history)
 
+    def _find_refinement_source(self, query, directory):
+        """Return the current tab if its file name search is a strict narrowing away from query
+        under the same options, so its results contain every result of the new search."""
+        source_tab = self.get_current_tab()
+        if source_tab is None or source_tab.is_scan_tab or source_tab.is_bookmark or source_tab.extra_clause is not None:
+            return None
+        match_case = self.chk_match_case.isChecked()
+        if not (self.chk_file_name.isChecked() and source_tab.file_name_search):
+            return None
+        if self.chk_full_match.isChecked() or source_tab.full_match or source_tab.match_case != match_case:
+            return None
+        if normalize_directory(source_tab.directory) != normalize_directory(directory):
+            return None
+        try:
+            if parse_query(query).has_filters() or parse_query(source_tab.query).has_filters():
+                return None  # Filters are not part of the name match, so refinement does not apply
+        except QuerySyntaxError:
+            return None
+        if source_tab.search_worker is None and not source_tab.search_complete:
+            return None  # Never searched, e.g. a restored pinned tab
+        if not is_query_refinement(source_tab.query, query, match_case):
+            return None
+        return source_tab
+
     def refresh_current_search(self):
         """Refresh the current search in the active tab, or create a new tab if none exists"""
         current_tab = self.get_current_tab()
@@ -2739,28 +3683,204 @@ class MdfindApp(QMainWindow):
         match_case = current_tab.match_case
         full_match = current_tab.full_match
         
-        # Stop any existing search in this tab
-        if current_tab.search_worker is not None and current_tab.search_worker.isRunning():
-            current_tab.search_worker.stop()
-            current_tab.search_worker.wait()
-
-        # Create new search worker with the same parameters
-        current_tab.search_worker = SearchWorker(
+        # Create new search worker with the same parameters; a running search is superseded
+        self._start_search_worker(current_tab, SearchWorker(
             query, directory,
             file_name_search,
             match_case,
             full_match,
             None,  # No extra clause for refresh
-            False  # Not a bookmark search
-        )
-        current_tab.search_worker.progress_signal.connect(self.update_progress)
-        current_tab.search_worker.result_signal.connect(lambda results: self.update_tree(results, current_tab))
-        current_tab.search_worker.error_signal.connect(self.show_error)
-        current_tab.search_worker.start()
+            False,  # Not a bookmark search
+            stream=self.stream_results
+        ), revalidate=True)
+
+    def _start_search_worker(self, search_tab, worker, revalidate=False, use_cache=True):
+        """Connect a SearchWorker to its tab and start it.
+        A search still running in the tab is superseded: it is stopped without waiting
+        and anything it emits later is dropped.
+        With revalidate=True cached results are shown but mdfind runs anyway;
+        with use_cache=False the result cache is neither read nor filled."""
+        self._stop_live_updates(search_tab)  # Restarted against the new results once the search completes
+        old_worker = search_tab.search_worker
+        if old_worker is not None and (old_worker.isRunning() or self.search_scheduler.is_queued(old_worker)):
+            self._retire_worker(old_worker)
+            self.superseded_searches += 1
+        self.search_generation += 1
+        worker.generation = search_tab.search_generation = self.search_generation
+        search_tab.search_worker = worker
+        search_tab.pending_reset = True
+        search_tab.search_complete = False
+        search_tab.backend_name = ""
+        search_tab.content_hits = {}
+        search_tab.root_progress = []
+        search_tab.pattern_counts = None
+        search_tab.search_progress = worker.search_progress
+        search_tab.snapshot_pending = search_tab.saved_id is not None
+        search_tab.awaiting_revalidation = False
+        self._apply_delta_marks(search_tab, {})
+        worker.result_cache = self.result_cache if self.result_cache_enabled and use_cache else None
+        worker.revalidate = revalidate
+        worker.stat_workers = self.stat_workers
+        worker.stat_ordered = self.stat_ordered
+        worker.deferred_metadata = self.deferred_metadata
+        worker.null_delimited = self.null_delimited
+        worker.backend_mode = self.search_backend
+        worker.file_index = self.file_index if self.file_index_enabled else None
+        worker.trigram_index = self.trigram_index if self.trigram_index_enabled else None
+        self._connect_search_signal(worker.progress_signal, search_tab, worker, self.update_progress)
+        self._connect_search_signal(worker.progress_event_signal, search_tab, worker,
+                                    lambda _snapshot: self.update_search_progress(search_tab))
+        self._connect_search_signal(worker.backend_signal, search_tab, worker,
+                                    lambda name: self.on_search_backend(name, search_tab))
+        self._connect_search_signal(worker.content_hits_signal, search_tab, worker, search_tab.content_hits.update)
+        self._connect_search_signal(worker.roots_signal, search_tab, worker,
+                                    lambda snapshots: self.update_root_progress(snapshots, search_tab))
+        self._connect_search_signal(worker.pattern_signal, search_tab, worker,
+                                    lambda fetched, survived: self.update_pattern_counts(fetched, survived, search_tab))
+        self._connect_search_signal(worker.stat_rate_signal, search_tab, worker,
+                                    lambda count, rate: self.update_stat_rate(count, rate, search_tab))
+        self._connect_search_signal(worker.cache_signal, search_tab, worker,
+                                    lambda refreshing: self.on_cached_results(refreshing, search_tab))
+        self._connect_search_signal(worker.result_signal, search_tab, worker,
+                                    lambda results: self._render_results(self.update_tree, results, search_tab))
+        self._connect_search_signal(worker.batch_signal, search_tab, worker,
+                                    lambda batch: self._render_results(self.append_results, batch, search_tab))
+        self._connect_search_signal(worker.done_signal, search_tab, worker,
+                                    lambda total: self.finish_results(search_tab))
+        self._connect_search_signal(worker.error_signal, search_tab, worker, self.show_error)
+        self.search_scheduler.submit(worker, owner=search_tab, label=search_tab.tab_title or search_tab.query)
+
+    def _connect_search_signal(self, signal, search_tab, worker, handler):
+        """Connect a worker signal to a handler, dropping emissions of superseded workers"""
+        def slot(*args):
+            if worker.generation != search_tab.search_generation:
+                self.late_results_dropped += 1
+                return
+            handler(*args)
+        signal.connect(slot)
+
+    def _retire_worker(self, worker):
+        """Stop a worker thread without blocking the UI; it is kept alive until it has exited"""
+        worker.stop()
+        if isinstance(worker, SearchWorker) and self.search_scheduler.cancel(worker):
+            return  # Never started
+        self.retired_workers.add(worker)
+        worker.finished.connect(lambda w=worker: self._on_retired_worker_finished(w))
+        if not worker.isRunning():
+            self.retired_workers.discard(worker)
+
+    def _on_retired_worker_finished(self, worker):
+        worker.wait()  # Returns at once: the thread is exiting
+        self.retired_workers.discard(worker)
 
     def update_progress(self, value):
+        """Percent done, or a busy indicator for a negative value"""
+        if value < 0:
+            self.progress.setRange(0, 0)
+            return
+        self.progress.setRange(0, 100)
         self.progress.setValue(value)
 
+    def update_search_progress(self, search_tab):
+        """Show the progress counters of a tab's search, with phase timings in the tooltip"""
+        if search_tab is not self.get_current_tab():
+            return
+        progress = search_tab.search_progress
+        if progress is None:
+            self.lbl_search_progress.setText("")
+            self.lbl_search_progress.setToolTip("")
+            return
+        snapshot = progress.snapshot()
+        text = (f"⏱️ {snapshot['paths_read']:,} read · {snapshot['stat_done']:,} stat · "
+                f"{snapshot['rows_per_second']:,.0f} rows/s · {snapshot['elapsed']:.2f}s")
+        if snapshot["failures"]:
+            text += f" · {snapshot['failures']:,} failed"
+        self.lbl_search_progress.setText(text)
+        phases = snapshot["phases"]
+        lines = [f"Backend: {snapshot['backend'] or 'cache'}", f"Rows found: {snapshot['rows_found']:,}"]
+        lines += [f"{phase.replace('_', ' ')}: {phases[phase] * 1000:,.1f} ms" for phase in SEARCH_PHASES]
+        self.lbl_search_progress.setToolTip("\n".join(lines))
+
+    def _render_results(self, handler, rows, search_tab):
+        """Show search results with handler, adding the time taken to the render phase"""
+        started = time.monotonic()
+        handler(rows, search_tab)
+        if search_tab.search_progress is not None:
+            search_tab.search_progress.add_time("render", time.monotonic() - started)
+
+    def on_cached_results(self, refreshing, search_tab):
+        """Note in the status area that a tab shows cached results"""
+        search_tab.stat_summary = "🗃️ Cached results · refreshing…" if refreshing else "🗃️ Cached results"
+        search_tab.awaiting_revalidation = refreshing
+        if search_tab is self.get_current_tab():
+            self.lbl_stat_rate.setText(search_tab.stat_summary)
+
+    def on_search_backend(self, name, search_tab):
+        """Remember which backend answers a tab's search; note fallbacks in the status area"""
+        fallback = search_tab.backend_name == "mdfind" and name != "mdfind"
+        search_tab.backend_name = name
+        if name == "index":
+            search_tab.stat_summary = "🗂️ From file index"
+        elif name == "roots":
+            search_tab.stat_summary = f"🌐 Searching {len(split_roots(search_tab.directory))} roots…"
+        elif fallback:
+            search_tab.stat_summary = f"📂 Spotlight found nothing, walking {search_tab.directory or '~'}…"
+        elif name != "mdfind":
+            search_tab.stat_summary = f"📂 Walking {search_tab.directory or '~'}…"
+        else:
+            return
+        if search_tab is self.get_current_tab():
+            self.lbl_stat_rate.setText(search_tab.stat_summary)
+
+    def update_stat_rate(self, count, rate, search_tab):
+        """Show how many paths a tab's search has stat-ed and how fast"""
+        parts = [f"⚡ {count:,} stat · {rate:,.0f}/s"]
+        if search_tab.pattern_counts is not None:
+            parts.insert(0, self._pattern_counts_text(*search_tab.pattern_counts))
+        if search_tab.root_progress:
+            parts.insert(0, self._root_progress_text(search_tab.root_progress))
+        search_tab.stat_summary = " · ".join(parts)
+        if search_tab is self.get_current_tab():
+            self.lbl_stat_rate.setText(search_tab.stat_summary)
+            self.lbl_stat_rate.setToolTip(self._root_progress_details(search_tab.root_progress))
+
+    def update_root_progress(self, snapshots, search_tab):
+        """Show per-root progress and timing of a multi-root search"""
+        search_tab.root_progress = snapshots
+        search_tab.stat_summary = self._root_progress_text(snapshots)
+        if search_tab is self.get_current_tab():
+            self.lbl_stat_rate.setText(search_tab.stat_summary)
+            self.lbl_stat_rate.setToolTip(self._root_progress_details(snapshots))
+
+    def update_pattern_counts(self, fetched, survived, search_tab):
+        """Show how selective the literal pushed down from a re: or glob: pattern was"""
+        search_tab.pattern_counts = (fetched, survived)
+        search_tab.stat_summary = self._pattern_counts_text(fetched, survived)
+        if search_tab is self.get_current_tab():
+            self.lbl_stat_rate.setText(search_tab.stat_summary)
+
+    @staticmethod
+    def _pattern_counts_text(fetched, survived):
+        share = f" ({survived / fetched:.1%})" if fetched else ""
+        return f"🔣 {fetched:,} fetched → {survived:,} matched{share}"
+
+    @staticmethod
+    def _root_progress_text(snapshots):
+        parts = []
+        for root, _backend, found, _duplicates, seconds, done, error in snapshots:
+            state = "⚠️" if error else ("✓" if done else "⏳")
+            parts.append(f"{state} {os.path.basename(root.rstrip('/')) or root} {found:,} · {seconds:.1f}s")
+        return "🌐 " + " | ".join(parts)
+
+    @staticmethod
+    def _root_progress_details(snapshots):
+        lines = []
+        for root, backend, found, duplicates, seconds, done, error in snapshots:
+            state = f"failed: {error}" if error else ("done" if done else "searching")
+            lines.append(f"{root} ({backend or 'waiting'}): {found:,} results, {duplicates:,} duplicates, "
+                         f"{seconds:.2f} s, {state}")
+        return "\n".join(lines)
+
     def update_tree(self, files_info, search_tab=None):
         if search_tab is None:
             search_tab = self.get_current_tab()
@@ -2768,8 +3888,16 @@ class MdfindApp(QMainWindow):
             return
             
         search_tab.tree.clear()
+        self._stop_metadata_workers(search_tab)
+        if not isinstance(files_info, ResultView):
+            files_info = ResultStore(files_info).view()
         search_tab.all_file_data = files_info
         search_tab.current_loaded = 0
+        search_tab.pending_reset = False
+        search_tab.search_complete = True
+        self._on_search_complete(search_tab)
+        if self._size_filter_active() and not self.ensure_full_metadata(search_tab):
+            return
         filtered_files = self.apply_filters_and_sorting(search_tab.all_file_data)
         search_tab.file_data = filtered_files
         
@@ -2782,11 +3910,191 @@ class MdfindApp(QMainWindow):
         
         self.lbl_items_found.setText(f"📊 {len(filtered_files)} items found")
 
-        if search_tab.sort_column != -1:
+        if search_tab.sort_column != -1 or self._ranks_results(search_tab):
             self.sort_data(search_tab)
         else:
             self.load_more_items(search_tab)
 
+    def _reset_tab_results(self, search_tab):
+        """Drop the previous results of a tab before new ones are shown"""
+        search_tab.tree.clear()
+        store = ResultStore()
+        search_tab.all_file_data = store.view()
+        search_tab.file_data = store.view()
+        search_tab.current_loaded = 0
+        search_tab.pending_reset = False
+        search_tab.ranking = None
+        search_tab.rank_partial = False
+        self._stop_metadata_workers(search_tab)
+
+    def append_results(self, batch, search_tab):
+        """Append a streamed batch of results to a tab while its search is still running"""
+        if search_tab.pending_reset:
+            self._reset_tab_results(search_tab)
+
+        visible = self.apply_filters_and_sorting(search_tab.all_file_data.append_rows(batch))
+        search_tab.items_found_count = len(search_tab.file_data) + len(visible)
+        if search_tab is self.get_current_tab():
+            self.lbl_items_found.setText(f"📊 {search_tab.items_found_count} items found")
+
+        if self._ranks_results(search_tab) and search_tab.ranking is None:
+            search_tab.ranking = self._new_ranking(search_tab)
+            search_tab.rank_partial = True
+        if self._ranks_results(search_tab) and search_tab.rank_partial:
+            # file_data keeps the best rows first and the rest after them; only the first
+            # screen is shown, so only it is rendered again when the best rows change
+            if search_tab.ranking.add_to_order(self._rank_keys(search_tab.file_data), visible,
+                                               self._rank_keys(visible)):
+                search_tab.tree.clear()
+                search_tab.current_loaded = 0
+                self.load_more_items(search_tab)
+                return
+        elif self._ranks_results(search_tab):
+            # Already scrolled past the first screen: new rows go below until the search completes
+            search_tab.ranking.add(visible, self._rank_keys(visible))
+            search_tab.file_data.extend(visible)
+        else:
+            search_tab.file_data.extend(visible)
+
+        # Only fill the first screen here; the rest is loaded on scroll as usual.
+        # Column sorting is applied once the search completes.
+        if search_tab.current_loaded < self.batch_size:
+            self.load_more_items(search_tab)
+
+    def finish_results(self, search_tab):
+        """Finalize a streamed search: apply the sort order over the complete result set"""
+        if search_tab.pending_reset:
+            # No batch arrived, so the search found nothing
+            self._reset_tab_results(search_tab)
+            search_tab.items_found_count = 0
+            if search_tab is self.get_current_tab():
+                self.lbl_items_found.setText("📊 0 items found")
+        search_tab.search_complete = True
+        self._on_search_complete(search_tab)
+        if self._size_filter_active() and search_tab.has_deferred_rows():
+            # Unknown sizes passed the size filter while streaming; filter again once they are known
+            self.ensure_full_metadata(search_tab)
+        elif search_tab.sort_column != -1:
+            self.sort_data(search_tab)
+        elif self._ranks_results(search_tab) and search_tab.ranking is None:
+            self.sort_data(search_tab)
+        elif self._ranks_results(search_tab):
+            self._finish_ranking(search_tab)
+
+    # ========== Live updates ==========
+    def _on_search_complete(self, search_tab):
+        """Hook run when a tab has its complete result set"""
+        # mdfind -live only tracks Spotlight results; walked directories are not watched
+        spotlight_roots = all(snapshot[1] == "mdfind" for snapshot in search_tab.root_progress)
+        if search_tab.is_live and search_tab.backend_name != "scandir" and spotlight_roots:
+            self._start_live_updates(search_tab)
+        self._save_search_snapshot(search_tab)
+
+    def toggle_live_updates(self):
+        """Turn mdfind -live updates on or off for the tab under the context menu"""
+        tab = self.search_tabs.get(getattr(self, 'context_menu_tab_index', -1))
+        if not tab or tab.is_scan_tab:
+            return
+        tab.is_live = not tab.is_live
+        if not tab.is_live:
+            self._stop_live_updates(tab)
+        elif tab.search_complete:
+            self._on_search_complete(tab)
+        # Otherwise live updates start when the running search completes
+        if tab.is_pinned:
+            self.save_pinned_tabs()
+
+    def _start_live_updates(self, search_tab):
+        """(Re)start the mdfind -live process of a tab against its current results"""
+        self._stop_live_updates(search_tab)
+        try:
+            options = SearchOptions.from_text(
+                search_tab.query, search_tab.directory, search_tab.file_name_search, search_tab.match_case,
+                search_tab.full_match, search_tab.extra_clause, search_tab.is_bookmark
+            )
+        except QuerySyntaxError:
+            return
+        query_str = options.spotlight_query()
+        if query_str is None:
+            return
+        worker = LiveSearchWorker(query_str, options.directory, [item[3] for item in search_tab.all_file_data])
+        worker.row_filter = options.row_filter(patterns_only=True)
+        worker.changes_signal.connect(
+            lambda added, removed, st=search_tab, w=worker: st.live_worker is w and self.apply_live_changes(added, removed, st)
+        )
+        worker.error_signal.connect(self.show_error)
+        search_tab.live_worker = worker
+        worker.start()
+
+    def _stop_live_updates(self, search_tab):
+        worker = search_tab.live_worker
+        if worker is None:
+            return
+        search_tab.live_worker = None
+        self._retire_worker(worker)
+
+    def apply_live_changes(self, added, removed, search_tab):
+        """Apply a live diff to a tab's results and rendered rows without rebuilding the tree"""
+        self._settle_ranking(search_tab)
+        if removed:
+            removed = set(removed)
+            search_tab.all_file_data = self._without_paths(search_tab.all_file_data, removed)
+            # Drop rendered rows from the bottom up so indices stay valid
+            for idx in range(search_tab.current_loaded - 1, -1, -1):
+                if search_tab.file_data[idx][3] in removed:
+                    search_tab.tree.takeTopLevelItem(idx)
+                    search_tab.current_loaded -= 1
+            search_tab.file_data = self._without_paths(search_tab.file_data, removed)
+
+        if added:
+            if isinstance(search_tab.all_file_data, ResultView):
+                added = search_tab.all_file_data.append_rows(added)
+            else:
+                search_tab.all_file_data.extend(added)
+            visible = self.apply_filters_and_sorting(added)
+            if isinstance(search_tab.file_data, list) and isinstance(visible, ResultView):
+                visible = list(visible)  # Ranked rows: the tab holds a plain list
+            if search_tab.sort_column == -1:
+                search_tab.file_data.extend(visible)
+            else:
+                key = self._sort_key_func(search_tab.sort_column)
+                descending = search_tab.sort_order == Qt.SortOrder.DescendingOrder
+                for position, item in enumerate(visible):
+                    pos = self._sorted_insert_position(search_tab.file_data, key, key(item), descending)
+                    if isinstance(visible, ResultView):
+                        search_tab.file_data.insert_index(pos, visible.indexes[position])
+                    else:
+                        search_tab.file_data.insert(pos, item)
+                    # Rows inside the rendered range are inserted in place; later rows load on scroll
+                    if pos < search_tab.current_loaded:
+                        search_tab.tree.insertTopLevelItem(pos, QTreeWidgetItem(self._tree_item_texts(item)))
+                        search_tab.current_loaded += 1
+            if search_tab.current_loaded < self.batch_size:
+                self.load_more_items(search_tab)
+
+        search_tab.items_found_count = len(search_tab.file_data)
+        if search_tab is self.get_current_tab():
+            self.lbl_items_found.setText(f"📊 {search_tab.items_found_count} items found")
+
+    @staticmethod
+    def _without_paths(rows, paths):
+        if isinstance(rows, ResultView):
+            return rows.without_paths(paths)
+        return [item for item in rows if item[3] not in paths]
+
+    @staticmethod
+    def _sorted_insert_position(rows, key, item_key, descending):
+        """Binary search for the insert position of a key in rows sorted by key"""
+        lo, hi = 0, len(rows)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            mid_key = key(rows[mid])
+            if (mid_key > item_key) if descending else (mid_key <= item_key):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
     def show_error(self, msg):
         self.show_critical("❌ Error", msg)
 
@@ -3414,10 +4722,13 @@ class MdfindApp(QMainWindow):
         # Reapply the filter with updated values
         self.reapply_filter()
     
-    def reapply_filter(self):
-        search_tab = self.get_current_tab()
+    def reapply_filter(self, search_tab=None):
+        if search_tab is None:
+            search_tab = self.get_current_tab()
         if not search_tab or not search_tab.all_file_data:
             return
+        if self._size_filter_active() and not self.ensure_full_metadata(search_tab):
+            return
         filtered_files = self.apply_filters_and_sorting(search_tab.all_file_data)
         search_tab.file_data = filtered_files
         search_tab.tree.clear()
@@ -3426,15 +4737,15 @@ class MdfindApp(QMainWindow):
         # Update the tab's items found count
         search_tab.items_found_count = len(filtered_files)
 
-        if search_tab.sort_column != -1:
+        if search_tab.sort_column != -1 or self._ranks_results(search_tab):
             self.sort_data(search_tab)
         else:
             self.load_more_items(search_tab)
 
-        self.lbl_items_found.setText(f"📊 {len(filtered_files)} items found")
+        if search_tab is self.get_current_tab():
+            self.lbl_items_found.setText(f"📊 {len(filtered_files)} items found")
 
     def apply_filters_and_sorting(self, files_info):
-        filtered = files_info[:]
         try:
             min_size = int(self.edit_min_size.text()) if self.edit_min_size.text() else None
         except ValueError:
@@ -3443,31 +4754,24 @@ class MdfindApp(QMainWindow):
             max_size = int(self.edit_max_size.text()) if self.edit_max_size.text() else None
         except ValueError:
             max_size = None
-
-        if min_size is not None:
-            filtered = [item for item in filtered if item[1] >= min_size]
-        if max_size is not None:
-            filtered = [item for item in filtered if item[1] <= max_size]
-
-        ext_text = self.edit_extension.text().strip()
-        if ext_text:
-            exts = []
-            for part in ext_text.split(";"):
-                part = part.strip()
-                if part and not part.startswith("."):
-                    part = "." + part
-                if part:
-                    exts.append(part.lower())
-            if exts:
-                filtered = [item for item in filtered if any(item[0].lower().endswith(e) for e in exts)]
-
-        return filtered
+        extensions = parse_extensions(self.edit_extension.text())
+        if isinstance(files_info, ResultView):
+            return files_info.filter(min_size, max_size, extensions)
+        return filter_by_size_and_extension(files_info, min_size, max_size, extensions)
 
     def on_header_clicked(self, column):
         search_tab = self.get_current_tab()
         if not search_tab:
             return
             
+        if (search_tab.sort_column == column and search_tab.sort_order == Qt.SortOrder.DescendingOrder
+                and self.rank_results):
+            # Third click on a column: back to relevance order
+            search_tab.sort_column = -1
+            search_tab.sort_order = Qt.SortOrder.AscendingOrder
+            search_tab.tree.header().setSortIndicator(-1, search_tab.sort_order)
+            self.reapply_filter(search_tab)
+            return
         if search_tab.sort_column == column:
             search_tab.sort_order = (Qt.SortOrder.DescendingOrder
                                if search_tab.sort_order == Qt.SortOrder.AscendingOrder
@@ -3484,27 +4788,91 @@ class MdfindApp(QMainWindow):
         if not search_tab:
             return
             
-        if not search_tab.file_data or search_tab.sort_column == -1:
+        if not search_tab.file_data:
+            return
+        if search_tab.sort_column == -1:
+            if self._ranks_results(search_tab):
+                self._rank_tab_results(search_tab)
             return
 
-        def get_sort_key(item):
-            if search_tab.sort_column == 0:
-                return item[0].lower()
-            elif search_tab.sort_column == 1:
-                return float(item[1])
-            elif search_tab.sort_column == 2:
-                return float(item[2])
-            else:
-                return item[3].lower()
+        # Sorting by size or date needs the metadata of every row
+        if search_tab.sort_column in (1, 2) and not self.ensure_full_metadata(search_tab):
+            return
 
-        search_tab.file_data.sort(
-            key=get_sort_key,
-            reverse=(search_tab.sort_order == Qt.SortOrder.DescendingOrder)
-        )
+        descending = search_tab.sort_order == Qt.SortOrder.DescendingOrder
+        if isinstance(search_tab.file_data, ResultView):
+            search_tab.file_data.sort(search_tab.sort_column, descending)
+        else:
+            search_tab.file_data.sort(key=self._sort_key_func(search_tab.sort_column), reverse=descending)
+        search_tab.tree.clear()
+        search_tab.current_loaded = 0
+        self.load_more_items(search_tab)
+
+    def _ranks_results(self, search_tab):
+        """Whether a tab shows its results in relevance order"""
+        return self.rank_results and search_tab.sort_column == -1 and not search_tab.is_scan_tab
+
+    def _new_ranking(self, search_tab):
+        query = "" if search_tab.is_bookmark else search_tab.query
+        try:
+            query = parse_query(query).text  # Rank on the name query, not on inline filters
+        except QuerySyntaxError:
+            pass
+        return IncrementalRanking(Ranker(query, search_tab.match_case, self.frecency), self.batch_size)
+
+    @staticmethod
+    def _rank_keys(rows):
+        """What a ranking keeps per row: the row indexes of a ResultView, otherwise the rows"""
+        return rows.indexes if isinstance(rows, ResultView) else rows
+
+    @staticmethod
+    def _in_rank_order(rows, keys):
+        """Rows in the order of ranking keys, as a view of the same store when rows is one"""
+        return rows.store.view(keys) if isinstance(rows, ResultView) else list(keys)
+
+    def _settle_ranking(self, search_tab):
+        """Put every row of a ranked tab in order, before its rows are changed or exported"""
+        if search_tab.rank_partial:
+            search_tab.file_data = self._in_rank_order(search_tab.file_data, search_tab.ranking.sorted_keys())
+            search_tab.rank_partial = False
+
+    def _finish_ranking(self, search_tab):
+        """Put the rows of a streamed, ranked search in order, once, when it completes"""
+        keys = search_tab.ranking.sorted_keys()
+        if len(keys) != len(search_tab.file_data):
+            # Deleted files were dropped from file_data since they were ranked
+            present = set(self._rank_keys(search_tab.file_data))
+            keys = [key for key in keys if key in present]
+        shown = search_tab.current_loaded
+        first_screen_only = search_tab.rank_partial
+        search_tab.file_data = self._in_rank_order(search_tab.file_data, keys)
+        search_tab.rank_partial = False
+        if first_screen_only:
+            return  # Streaming kept the shown rows the best ones, in order
+        # Rows that came in after the order was settled were shown unranked: show as many again, in order
+        search_tab.tree.clear()
+        search_tab.current_loaded = 0
+        while search_tab.current_loaded < shown:
+            loaded = search_tab.current_loaded
+            self.load_more_items(search_tab)
+            if search_tab.current_loaded == loaded:
+                break
+
+    def _rank_tab_results(self, search_tab):
+        """Order a tab's results by relevance; only the first screen is sorted right away"""
+        search_tab.ranking = self._new_ranking(search_tab)
+        search_tab.ranking.add(search_tab.file_data, self._rank_keys(search_tab.file_data))
+        search_tab.file_data = self._in_rank_order(search_tab.file_data, search_tab.ranking.ordered())
+        search_tab.rank_partial = True
         search_tab.tree.clear()
         search_tab.current_loaded = 0
         self.load_more_items(search_tab)
 
+    @staticmethod
+    def _sort_key_func(column):
+        """Sort key for a result column; rows with unknown metadata sort first"""
+        return row_sort_key(column)
+
     # ========== Context menu logic ==========
     def show_context_menu(self, pos):
         tree = self.get_current_tree()
@@ -3536,11 +4904,83 @@ class MdfindApp(QMainWindow):
             return []
         return [item.text(3) for item in tree.selectedItems()]
 
+    def _selected_row_indexes(self, search_tab, items):
+        """Store row indexes of selected tree items, or None if the tab does not hold a ResultView"""
+        if not isinstance(search_tab.file_data, ResultView):
+            return None
+        indexes = search_tab.file_data.indexes
+        positions = (search_tab.tree.indexOfTopLevelItem(item) for item in items)
+        return [indexes[position] for position in positions if 0 <= position < len(indexes)]
+
+    def select_same_folder(self):
+        """Select the loaded results that share the folder of the current one"""
+        search_tab = self.get_current_tab()
+        item = search_tab.tree.currentItem() if search_tab else None
+        if item is None:
+            return
+        selected = self._selected_row_indexes(search_tab, [item])
+        if selected:
+            # Rows are grouped by directory id, so no path string is compared
+            loaded = search_tab.file_data[:search_tab.current_loaded]
+            dir_id = next(iter(loaded.store.view(selected).group_by_directory()))
+            same_folder = set(loaded.group_by_directory().get(dir_id, ()))
+            matches = [index in same_folder for index in loaded.indexes]
+        else:
+            folder = os.path.dirname(item.text(3))
+            matches = [os.path.dirname(search_tab.tree.topLevelItem(position).text(3)) == folder
+                       for position in range(search_tab.tree.topLevelItemCount())]
+        search_tab.tree.clearSelection()
+        for position, match in enumerate(matches):
+            if match:
+                search_tab.tree.topLevelItem(position).setSelected(True)
+
+    def open_containing_folders(self):
+        """Open the folder of each selected result in Finder, each folder once"""
+        search_tab = self.get_current_tab()
+        if not search_tab:
+            return
+        items = search_tab.tree.selectedItems()
+        selected = self._selected_row_indexes(search_tab, items)
+        if selected is not None:
+            store = search_tab.file_data.store
+            folders = [store.directory_of(dir_id) for dir_id in store.view(selected).group_by_directory()]
+        else:
+            folders = list(dict.fromkeys(os.path.dirname(item.text(3)) for item in items))
+        if len(folders) > MAX_FOLDERS_TO_OPEN:
+            reply = self.show_question(
+                "Open Folders",
+                f"Open {len(folders)} folders in Finder?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            )
+            if reply != QMessageBox.StandardButton.Yes:
+                return
+        for folder in folders:
+            try:
+                subprocess.Popen(["open", folder])
+            except Exception as e:
+                self.show_critical("Error", f"Could not open Finder: {e}")
+                return
+
     # ========== File operations ==========
+    def record_opened(self, paths):
+        """Remember files opened from the app; relevance ranking favors them"""
+        for path in paths:
+            self.frecency.record(path)
+        if not self.open_history_timer.isActive():
+            self.open_history_timer.start()
+
+    def save_open_history(self):
+        if not self.frecency.dirty:
+            return
+        config = read_config()
+        config["open_history"] = self.frecency.to_dict()
+        write_config(config)
+
     def open_with_default_app(self):
         path = self.get_selected_file()
         if not path:
             return
+        self.record_opened([path])
         try:
             process = subprocess.Popen(["open", path], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
             _, stderr = process.communicate()
@@ -3558,6 +4998,7 @@ class MdfindApp(QMainWindow):
             self.show_critical("Error", f"Error opening file: {str(e)}")
 
     def open_multiple_files(self):
+        self.record_opened(self.get_selected_files())
         for path in self.get_selected_files():
             try:
                 subprocess.Popen(["open", path])
@@ -3944,6 +5385,7 @@ class MdfindApp(QMainWindow):
         if not search_tab or not search_tab.file_data:
             self.show_warning("⚠️ Warning", "No data to export.")
             return
+        self.resolve_metadata_now(search_tab)
         
         # Show format selection dialog
         format_dialog = ExportFormatDialog(self)
@@ -4318,11 +5760,7 @@ class MdfindApp(QMainWindow):
         if not path:
             return
         try:
-            result = subprocess.run(
-                ["mdls", path],
-                capture_output=True, text=True, timeout=10
-            )
-            output = result.stdout.strip() if result.stdout else "No metadata available."
+            output = run_mdls(path) or "No metadata available."
         except FileNotFoundError:
             self.show_warning("⚠️ Not Available", "mdls is not available on this system (macOS only).")
             return
@@ -4388,7 +5826,8 @@ class MdfindApp(QMainWindow):
         dialog.exec()
 
     def select_directory(self):
-        current = os.path.expanduser(self.edit_dir.text())
+        roots = split_roots(self.edit_dir.text())
+        current = os.path.expanduser(roots[0]) if roots else ""
         directory = QFileDialog.getExistingDirectory(self, "Select Directory", current)
         if directory:
             self.edit_dir.setText(directory)
@@ -5677,6 +7116,18 @@ class MdfindApp(QMainWindow):
             if hasattr(self, 'player_manager'):
                 self.player_manager.stop()
 
+            if self.index_build_worker and self.index_build_worker.isRunning():
+                self.index_build_worker.stop()
+                self.index_build_worker.wait(3000)
+            self._stop_index_updates()
+
+            # Give stopped search workers a moment to exit
+            for worker in list(self.retired_workers):
+                worker.wait(2000)
+            # Let saved search snapshots finish writing
+            for worker in list(self.snapshot_workers):
+                worker.wait(5000)
+
             # Stop directory scan worker
             if self.scan_worker and self.scan_worker.isRunning():
                 self.scan_worker.stop()
@@ -5700,6 +7151,8 @@ class MdfindApp(QMainWindow):
             try:
                 config = read_config()
                 config["window_size"] = {"width": self.width(), "height": self.height()}
+                if self.frecency.dirty:
+                    config["open_history"] = self.frecency.to_dict()
                 write_config(config)
             except Exception as cfg_exc:
                 print(f"Failed to save window size: {cfg_exc}")
@@ -5707,20 +7160,8 @@ class MdfindApp(QMainWindow):
             super().closeEvent(event)
             
     # === Updated bookmark methods ===
-    BOOKMARK_QUERIES = {
-        'large_files': ('kMDItemFSSize >= 52428800', 'Large Files'),
-        'videos': ('kMDItemContentTypeTree = "public.movie"', 'Video Files'),
-        'audio': ('kMDItemContentTypeTree = "public.audio"', 'Audio Files'),
-        'images': ('kMDItemContentTypeTree = "public.image"', 'Images'),
-        'archives': ('kMDItemContentTypeTree = "public.archive"', 'Archives'),
-        'applications': ('kMDItemContentType == "com.apple.application-bundle"', 'Applications'),
-        'recent_24h': ('kMDItemFSContentChangeDate >= $time.today(-1)', 'Recent 24h'),
-        'recent_7d': ('kMDItemFSContentChangeDate >= $time.today(-7)', 'Recent 7 Days'),
-        'recent_30d': ('kMDItemFSContentChangeDate >= $time.today(-30)', 'Recent 30 Days'),
-    }
-
     def _run_bookmark(self, key):
-        clause, title = self.BOOKMARK_QUERIES[key]
+        clause, title = BOOKMARK_QUERIES[key]
         self.start_search(extra_clause=clause, is_bookmark=True, tab_title=title)
 
     def bookmark_large_files(self): self._run_bookmark('large_files')
@@ -6018,6 +7459,397 @@ class MdfindApp(QMainWindow):
         config["simple_mode"] = self.simple_mode
         write_config(config)
     
+    def toggle_stream_results(self, checked):
+        """Toggle streaming of search results while mdfind is running"""
+        self.stream_results = checked
+        config = read_config()
+        config["stream_results"] = self.stream_results
+        write_config(config)
+
+    def toggle_rank_results(self, checked):
+        """Toggle relevance order for tabs without a sort column"""
+        self.rank_results = checked
+        config = read_config()
+        config["rank_results"] = self.rank_results
+        write_config(config)
+        search_tab = self.get_current_tab()
+        if search_tab is not None and search_tab.sort_column == -1:
+            self.reapply_filter(search_tab)
+
+    def set_stat_workers(self):
+        """Ask for the number of threads used to stat search results"""
+        dialog = QInputDialog(self)
+        dialog.setWindowTitle("⚙️ Stat Thread Pool")
+        dialog.setLabelText(f"Threads used to read file metadata (1-{MAX_STAT_WORKERS}):")
+        dialog.setInputMode(QInputDialog.InputMode.IntInput)
+        dialog.setIntRange(1, MAX_STAT_WORKERS)
+        dialog.setIntValue(self.stat_workers)
+        self.apply_dialog_dark_mode(dialog)
+        if not dialog.exec():
+            return
+        self.stat_workers = dialog.intValue()
+        config = read_config()
+        config["stat_workers"] = self.stat_workers
+        write_config(config)
+
+    def toggle_stat_ordered(self, checked):
+        """Toggle between mdfind output order and stat completion order"""
+        self.stat_ordered = checked
+        config = read_config()
+        config["stat_ordered"] = self.stat_ordered
+        write_config(config)
+
+    def toggle_deferred_metadata(self, checked):
+        """Toggle deferred metadata mode for new searches"""
+        self.deferred_metadata = checked
+        config = read_config()
+        config["deferred_metadata"] = self.deferred_metadata
+        write_config(config)
+
+    def toggle_result_cache(self, checked):
+        """Enable or disable the in-process result cache"""
+        self.result_cache_enabled = checked
+        if not checked:
+            self.result_cache.clear()
+        config = read_config()
+        config["result_cache_enabled"] = self.result_cache_enabled
+        write_config(config)
+
+    def toggle_result_cache_swr(self, checked):
+        """Toggle showing expired cached results while a fresh search runs"""
+        self.result_cache.stale_while_revalidate = checked
+        config = read_config()
+        config["result_cache_swr"] = checked
+        write_config(config)
+
+    def show_result_cache_stats(self):
+        stats = self.result_cache.stats()
+        lookups = stats["hits"] + stats["stale_hits"] + stats["misses"]
+        hit_rate = (stats["hits"] + stats["stale_hits"]) / lookups * 100 if lookups else 0.0
+        self.show_info(
+            "📈 Result Cache",
+            f"Entries: {stats['entries']}\n"
+            f"Memory: {format_size(stats['bytes'])} of {format_size(stats['max_bytes'])}\n"
+            f"TTL: {self.result_cache.ttl} seconds\n\n"
+            f"Hits: {stats['hits']}\n"
+            f"Stale hits: {stats['stale_hits']}\n"
+            f"Misses: {stats['misses']}\n"
+            f"Hit rate: {hit_rate:.1f}%\n"
+            f"Evictions: {stats['evictions']}"
+        )
+
+    def set_search_backend(self, name):
+        """Choose the backend used by new searches"""
+        self.search_backend = name
+        config = read_config()
+        config["search_backend"] = name
+        write_config(config)
+
+    # ========== File index ==========
+    def _open_file_index(self, roots=None):
+        """Open the index database; roots, if given, replace the indexed roots"""
+        try:
+            if self.file_index is None:
+                self.file_index = FileIndex()
+            if roots is not None:
+                self.file_index.set_roots(roots)
+        except sqlite3.Error as e:
+            self.file_index = None
+            self.show_error(f"Cannot open file index: {e}")
+        return self.file_index
+
+    def _save_file_index_config(self):
+        config = read_config()
+        config["file_index_enabled"] = self.file_index_enabled
+        config["trigram_index_enabled"] = self.trigram_index_enabled
+        config["file_index_auto_update"] = self.file_index_auto_update
+        config["file_index_roots"] = self.file_index.roots() if self.file_index else []
+        write_config(config)
+
+    def rebuild_file_index(self, on_progress=None, on_done=None, crawl=True):
+        """Crawl the index roots in the background, then reload the trigram index.
+        With crawl=False only the trigram index is loaded from the existing database."""
+        if self._open_file_index() is None:
+            return None
+        if self.index_build_worker and self.index_build_worker.isRunning():
+            return self.index_build_worker
+        worker = IndexBuildWorker(self.file_index, crawl=crawl, load_trigrams=self.trigram_index_enabled)
+        if on_progress is not None:
+            worker.progress_signal.connect(on_progress)
+        if on_done is not None:
+            worker.done_signal.connect(on_done)
+        worker.trigram_signal.connect(self._set_trigram_index)
+        worker.error_signal.connect(self.show_error)
+        if crawl:
+            # New directories need watches; restart the updater against the fresh crawl
+            self._stop_index_updates()
+            worker.finished.connect(self._start_index_updates)
+        self.index_build_worker = worker
+        worker.start()
+        return worker
+
+    def _start_index_updates(self):
+        """Start incremental index maintenance if it is enabled and the index has been built"""
+        if not (self.file_index_enabled and self.file_index_auto_update) or self.file_index is None:
+            return
+        if self.index_update_worker is not None and self.index_update_worker.isRunning():
+            return
+        if self.index_build_worker is not None and self.index_build_worker.isRunning():
+            return  # Started when the build finishes
+        if not self.file_index.built_roots():
+            return
+        worker = IndexUpdateWorker(self.file_index, self.file_index_poll_interval)
+        worker.cycle_signal.connect(self.apply_index_update)
+        self.index_update_worker = worker
+        worker.start()
+
+    def _stop_index_updates(self):
+        worker = self.index_update_worker
+        if worker is None:
+            return
+        self.index_update_worker = None
+        worker.stop()
+        worker.wait(3000)
+
+    def apply_index_update(self, stats, summary):
+        """Mirror an incremental index update in the trigram index"""
+        if self.trigram_index is None:
+            return
+        for path in stats.removed:
+            self.trigram_index.remove(path)
+        self.trigram_index.add_paths(stats.added)
+
+    def _set_trigram_index(self, trigram_index):
+        self.trigram_index = trigram_index if self.trigram_index_enabled else None
+
+    def show_file_index_status(self):
+        """Index status panel: entries, build time, last refresh and the indexed roots"""
+        if self._open_file_index() is None:
+            return
+        dialog = QDialog(self)
+        dialog.setWindowTitle("🗂️ File Index")
+        dialog.resize(560, 420)
+        layout = QVBoxLayout(dialog)
+
+        chk_enabled = QCheckBox("Answer file name searches inside these folders from the index")
+        chk_enabled.setChecked(self.file_index_enabled)
+        layout.addWidget(chk_enabled)
+        chk_trigrams = QCheckBox("Keep a trigram index in memory for instant substring search")
+        chk_trigrams.setChecked(self.trigram_index_enabled)
+        layout.addWidget(chk_trigrams)
+        chk_auto_update = QCheckBox("Keep the index up to date (inotify where available, else directory polling)")
+        chk_auto_update.setChecked(self.file_index_auto_update)
+        layout.addWidget(chk_auto_update)
+
+        roots_list = QListWidget()
+        roots_list.addItems(self.file_index.roots())
+        layout.addWidget(roots_list)
+
+        roots_buttons = QHBoxLayout()
+        btn_add = QPushButton("➕ Add Folder...")
+        btn_remove = QPushButton("➖ Remove")
+        roots_buttons.addWidget(btn_add)
+        roots_buttons.addWidget(btn_remove)
+        roots_buttons.addStretch()
+        layout.addLayout(roots_buttons)
+
+        status_label = QLabel()
+        status_label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        layout.addWidget(status_label)
+
+        action_buttons = QHBoxLayout()
+        btn_rebuild = QPushButton("🔄 Rebuild Index")
+        btn_close = QPushButton("Close")
+        action_buttons.addStretch()
+        action_buttons.addWidget(btn_rebuild)
+        action_buttons.addWidget(btn_close)
+        layout.addLayout(action_buttons)
+
+        def format_time(timestamp):
+            if not timestamp:
+                return "never"
+            return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp))
+
+        report_cache = {}
+
+        def refresh_status(progress_text=""):
+            status = self.file_index.status()
+            lines = [
+                f"Entries: {status['entries']:,}",
+                f"Database size: {format_size(status['db_bytes'])}",
+                f"Last refresh: {format_time(self.file_index.last_refresh())}",
+            ]
+            for root in status["roots"]:
+                lines.append(f"  {root['path']}: {root['entries']:,} entries, "
+                             f"built in {root['build_seconds']:.1f} s, {format_time(root['built_at'])}")
+            if self.trigram_index is not None:
+                # Walking every name is not free on large indexes; measure each loaded index once
+                if report_cache.get("index") is not self.trigram_index:
+                    report_cache.update(index=self.trigram_index, report=self.trigram_index.memory_report())
+                report = report_cache["report"]
+                lines.append(f"Trigram index: {report['files']:,} names, {report['trigrams']:,} trigrams, "
+                             f"{format_size(report['total_bytes'])} in memory")
+                lines.append(f"  postings {format_size(report['postings_bytes'])} · "
+                             f"names {format_size(report['names_bytes'])} · "
+                             f"directories {format_size(report['directories_bytes'])} · "
+                             f"duplicate check {format_size(report['dedup_bytes'])}")
+            elif self.trigram_index_enabled:
+                lines.append("Trigram index: not loaded")
+            update_worker = self.index_update_worker
+            if update_worker is not None and update_worker.summary:
+                summary = update_worker.summary
+                lines.append(f"Updates: {summary['mode']} · {summary['cycles']} recent cycles · "
+                             f"{summary['avg_rescanned']:.1f} directories rescanned per cycle · "
+                             f"average latency {summary['avg_latency'] * 1000:.0f} ms")
+                last = summary["last"]
+                lines.append(f"  Last cycle: {last.checked:,} checked, {last.rescanned:,} rescanned, "
+                             f"+{len(last.added):,} / −{len(last.removed):,} / ~{len(last.changed):,} entries "
+                             f"in {last.duration * 1000:.0f} ms")
+            elif update_worker is not None:
+                lines.append("Updates: waiting for the first cycle")
+            if progress_text:
+                lines.append(progress_text)
+            status_label.setText("\n".join(lines))
+
+        def roots_changed():
+            roots = [roots_list.item(i).text() for i in range(roots_list.count())]
+            self.file_index.set_roots(roots)
+            self._save_file_index_config()
+            refresh_status()
+
+        def add_root():
+            folder = QFileDialog.getExistingDirectory(dialog, "Add Folder to Index", os.path.expanduser("~"))
+            if folder and not roots_list.findItems(folder, Qt.MatchFlag.MatchExactly):
+                roots_list.addItem(folder)
+                roots_changed()
+
+        def remove_root():
+            for item in roots_list.selectedItems():
+                roots_list.takeItem(roots_list.row(item))
+            roots_changed()
+
+        def toggle_enabled(checked):
+            self.file_index_enabled = checked
+            self._save_file_index_config()
+            if checked:
+                self._start_index_updates()
+            else:
+                self._stop_index_updates()
+
+        def toggle_auto_update(checked):
+            self.file_index_auto_update = checked
+            self._save_file_index_config()
+            if checked:
+                self._start_index_updates()
+            else:
+                self._stop_index_updates()
+            refresh_status()
+
+        def toggle_trigrams(checked):
+            self.trigram_index_enabled = checked
+            self._save_file_index_config()
+            if not checked:
+                self.trigram_index = None
+                refresh_status()
+            elif self.file_index.built_roots():
+                worker = self.rebuild_file_index(crawl=False)
+                if worker is not None:
+                    worker.finished.connect(lambda: dialog.isVisible() and refresh_status())
+
+        def on_progress(count):
+            if dialog.isVisible():
+                refresh_status(f"⏳ Indexing… {count:,} entries")
+
+        def on_done(count, seconds):
+            if dialog.isVisible():
+                refresh_status(f"✅ Indexed {count:,} entries in {seconds:.1f} s")
+            btn_rebuild.setEnabled(True)
+
+        def rebuild():
+            btn_rebuild.setEnabled(False)
+            worker = self.rebuild_file_index(on_progress, on_done)
+            if worker is not None:
+                worker.finished.connect(lambda: btn_rebuild.setEnabled(True))
+
+        btn_add.clicked.connect(add_root)
+        btn_remove.clicked.connect(remove_root)
+        chk_enabled.toggled.connect(toggle_enabled)
+        chk_trigrams.toggled.connect(toggle_trigrams)
+        chk_auto_update.toggled.connect(toggle_auto_update)
+        btn_rebuild.clicked.connect(rebuild)
+        btn_close.clicked.connect(dialog.accept)
+        if self.index_build_worker and self.index_build_worker.isRunning():
+            btn_rebuild.setEnabled(False)
+            self.index_build_worker.progress_signal.connect(on_progress)
+            self.index_build_worker.done_signal.connect(on_done)
+        refresh_status()
+        self.apply_dialog_dark_mode(dialog)
+        dialog.exec()
+
+    def set_max_concurrent_searches(self):
+        """Ask for the number of searches that may run at the same time"""
+        dialog = QInputDialog(self)
+        dialog.setWindowTitle("🚦 Concurrent Searches")
+        dialog.setLabelText("Searches that may run at the same time (1-16):")
+        dialog.setInputMode(QInputDialog.InputMode.IntInput)
+        dialog.setIntRange(1, 16)
+        dialog.setIntValue(self.search_scheduler.max_concurrent)
+        self.apply_dialog_dark_mode(dialog)
+        if not dialog.exec():
+            return
+        self.search_scheduler.set_max_concurrent(dialog.intValue())
+        config = read_config()
+        config["max_concurrent_searches"] = self.search_scheduler.max_concurrent
+        write_config(config)
+
+    def show_search_jobs(self):
+        """Inspector listing queued, running and paused searches"""
+        dialog = QDialog(self)
+        dialog.setWindowTitle("🧭 Search Jobs")
+        dialog.resize(560, 320)
+        layout = QVBoxLayout(dialog)
+        summary = QLabel()
+        layout.addWidget(summary)
+        jobs_tree = QTreeWidget()
+        jobs_tree.setColumnCount(4)
+        jobs_tree.setHeaderLabels(["Search", "State", "Priority", "Time"])
+        jobs_tree.setColumnWidth(0, 240)
+        layout.addWidget(jobs_tree)
+
+        def refresh():
+            now = time.monotonic()
+            jobs = self.search_scheduler.jobs()
+            jobs_tree.clear()
+            for job in jobs:
+                since = job.started_at if job.started_at is not None else job.queued_at
+                jobs_tree.addTopLevelItem(QTreeWidgetItem([
+                    job.label or "(untitled)",
+                    job.state,
+                    "foreground" if self.search_scheduler.priority(job) == 0 else "background",
+                    f"{now - since:.1f} s"
+                ]))
+            running = sum(1 for job in jobs if job.state == "running")
+            summary.setText(f"{running} running of max {self.search_scheduler.max_concurrent} · "
+                            f"{sum(1 for job in jobs if job.state == 'queued')} queued · "
+                            f"{sum(1 for job in jobs if job.state == 'paused')} paused")
+
+        timer = QTimer(dialog)
+        timer.timeout.connect(refresh)
+        timer.start(500)
+        refresh()
+        self.apply_dialog_dark_mode(dialog)
+        dialog.exec()
+
+    def show_search_diagnostics(self):
+        self.show_info(
+            "🩺 Search Diagnostics",
+            f"Searches started: {self.search_generation}\n"
+            f"Superseded searches: {self.superseded_searches}\n"
+            f"Late results dropped: {self.late_results_dropped}\n"
+            f"Stopped workers still exiting: {len(self.retired_workers)}\n"
+            f"Searches refined from previous results: {self.refined_searches}"
+        )
+
     def toggle_filters(self):
         """Toggle visibility of advanced filters"""
         is_visible = self.group_advanced.isVisible()
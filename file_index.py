@@ -0,0 +1,566 @@
+# Copyright 2025 Apple Dragon
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Persistent file name index (Everything-style) stored in SQLite.
+
+A crawler records path, name, size, mtime and is_dir of everything below a set of
+user-chosen roots. File name searches under those roots are then answered from the
+database instead of Spotlight.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import sqlite3
+import struct
+import sys
+import threading
+import time
+import unicodedata
+from collections import deque
+from contextlib import contextmanager
+
+from search_engine import fold_name, normalize_directory
+
+DEFAULT_INDEX_PATH = os.path.expanduser("~/.everythingByMdfind.index.sqlite")
+INSERT_BATCH_SIZE = 5000  # Rows per executemany while crawling
+LOOKUP_CHUNK_SIZE = 500  # Paths per "IN (...)" lookup, below SQLite's parameter limit
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    parent TEXT NOT NULL,
+    name TEXT NOT NULL,
+    name_folded TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    is_dir INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_parent ON entries(parent);
+CREATE TABLE IF NOT EXISTS directories (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS roots (
+    path TEXT PRIMARY KEY,
+    entries INTEGER NOT NULL DEFAULT 0,
+    build_seconds REAL NOT NULL DEFAULT 0,
+    built_at REAL,
+    refreshed_at REAL
+);
+"""
+
+
+def _like_escape(text):
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _glob_escape(text):
+    return text.replace("[", "[[]")
+
+
+def name_pattern(query, match_case, full_match):
+    """SQL condition and parameter matching names like a kMDItemFSName search.
+    Case- and diacritic-insensitive searches use LIKE on the folded name, case-sensitive
+    ones GLOB on the name; Spotlight's * and ? wildcards map onto both."""
+    if match_case:
+        needle = _glob_escape(unicodedata.normalize("NFC", query))
+        pattern = needle if full_match else f"*{needle}*"
+        return "name GLOB ?", pattern
+    needle = _like_escape(fold_name(query, False)).replace("*", "%").replace("?", "_")
+    pattern = needle if full_match else f"%{needle}%"
+    return "name_folded LIKE ? ESCAPE '\\'", pattern
+
+
+def _under(directory):
+    """Range condition for paths strictly below a directory ("/" sorts right before "0")"""
+    base = directory.rstrip("/")
+    return "path > ? AND path < ?", (base + "/", base + "0")
+
+
+def _entry_record(entry, directory):
+    """(path, parent, name, size, mtime, is_dir) of a DirEntry, or None if it vanished"""
+    try:
+        st = entry.stat(follow_symlinks=False)
+        is_dir = entry.is_dir(follow_symlinks=False)
+    except OSError:
+        return None
+    return (entry.path, directory, entry.name, 0 if is_dir else st.st_size, st.st_mtime, int(is_dir))
+
+
+def crawl(root, stop_event=None, dir_mtimes=None):
+    """Yield (path, parent, name, size, mtime, is_dir) for everything below root.
+    Symlinks are recorded but not followed; unreadable directories are skipped.
+    If dir_mtimes is a dict, the mtime of every scanned directory is stored in it,
+    taken before the directory is listed so a change during the listing is not missed."""
+    stack = [root]
+    while stack:
+        if stop_event is not None and stop_event.is_set():
+            return
+        directory = stack.pop()
+        try:
+            if dir_mtimes is not None:
+                dir_mtimes[directory] = os.stat(directory).st_mtime
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    record = _entry_record(entry, directory)
+                    if record is None:
+                        continue
+                    if record[5]:
+                        stack.append(entry.path)
+                    yield record
+        except OSError:
+            if dir_mtimes is not None:
+                dir_mtimes.pop(directory, None)
+            continue
+
+
+class FileIndex:
+    """SQLite file name index. Safe to use from several threads: every call opens
+    its own connection, and readers keep seeing the previous data while a build runs."""
+
+    def __init__(self, db_path=DEFAULT_INDEX_PATH):
+        self.db_path = db_path
+        self._write_lock = threading.Lock()
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        """Connection that commits on success, rolls back on error and is always closed"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def roots(self):
+        with self._connect() as conn:
+            return [row[0] for row in conn.execute("SELECT path FROM roots ORDER BY path")]
+
+    def set_roots(self, roots):
+        """Replace the indexed roots. Entries of roots that were removed are dropped."""
+        roots = sorted({normalize_directory(root) for root in roots if root})
+        with self._write_lock, self._connect() as conn:
+            for (old_root,) in conn.execute("SELECT path FROM roots").fetchall():
+                if old_root not in roots:
+                    self._delete_tree(conn, old_root)
+                    conn.execute("DELETE FROM roots WHERE path = ?", (old_root,))
+            conn.executemany("INSERT OR IGNORE INTO roots(path) VALUES (?)", [(root,) for root in roots])
+
+    @staticmethod
+    def _delete_tree(conn, root):
+        condition, params = _under(root)
+        conn.execute(f"DELETE FROM entries WHERE {condition}", params)
+        conn.execute(f"DELETE FROM directories WHERE path = ? OR ({condition})", (root,) + params)
+
+    def built_roots(self):
+        with self._connect() as conn:
+            return [row[0] for row in conn.execute("SELECT path FROM roots WHERE built_at IS NOT NULL")]
+
+    def covers(self, directory):
+        """Whether a search directory lies inside a root that has been built.
+        An empty directory (search everywhere) is never covered: files outside the
+        roots would be missed."""
+        if not directory:
+            return False
+        directory = normalize_directory(directory)
+        return any(directory == root or directory.startswith(root.rstrip("/") + "/") for root in self.built_roots())
+
+    def build(self, progress=None, stop_event=None):
+        """Crawl every root and replace its entries. progress(entries_so_far) is called
+        after every batch. Returns the number of entries written."""
+        total = 0
+        for root in self.roots():
+            if stop_event is not None and stop_event.is_set():
+                break
+            total += self.build_root(root, progress, stop_event, total)
+        return total
+
+    def build_root(self, root, progress=None, stop_event=None, offset=0):
+        started = time.monotonic()
+        count = 0
+        with self._write_lock, self._connect() as conn:
+            # One transaction per root: searches keep the old entries until it commits
+            self._delete_tree(conn, root)
+            batch = []
+            dir_mtimes = {}
+            for record in crawl(root, stop_event, dir_mtimes):
+                path, parent, name, size, mtime, is_dir = record
+                batch.append((path, parent, name, fold_name(name, False), size, mtime, is_dir))
+                if len(batch) >= INSERT_BATCH_SIZE:
+                    self._insert(conn, batch)
+                    count += len(batch)
+                    batch = []
+                    if progress is not None:
+                        progress(offset + count)
+            if stop_event is not None and stop_event.is_set():
+                conn.rollback()
+                return 0
+            self._insert(conn, batch)
+            count += len(batch)
+            conn.executemany("INSERT OR REPLACE INTO directories(path, mtime) VALUES (?, ?)", dir_mtimes.items())
+            now = time.time()
+            conn.execute(
+                "UPDATE roots SET entries = ?, build_seconds = ?, built_at = ?, refreshed_at = ? WHERE path = ?",
+                (count, time.monotonic() - started, now, now, root)
+            )
+        if progress is not None:
+            progress(offset + count)
+        return count
+
+    @staticmethod
+    def _insert(conn, batch):
+        conn.executemany(
+            "INSERT OR REPLACE INTO entries(path, parent, name, name_folded, size, mtime, is_dir) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            batch
+        )
+
+    # ---------- Incremental updates ----------
+    def directory_mtimes(self):
+        """Last-seen mtime of every crawled directory"""
+        with self._connect() as conn:
+            return dict(conn.execute("SELECT path, mtime FROM directories"))
+
+    def changed_directories(self, stop_event=None, stats=None):
+        """Crawled directories whose mtime differs from the recorded one, or that are gone"""
+        changed = []
+        for directory, mtime in self.directory_mtimes().items():
+            if stop_event is not None and stop_event.is_set():
+                break
+            if stats is not None:
+                stats.checked += 1
+            try:
+                if os.stat(directory).st_mtime != mtime:
+                    changed.append(directory)
+            except OSError:
+                changed.append(directory)
+        return changed
+
+    def update(self, directories, stats=None):
+        """Rescan the given directories and apply the differences in one transaction.
+        New subdirectories are crawled completely, vanished ones are dropped with
+        everything below them. Returns an IndexUpdate with the changed paths."""
+        stats = stats if stats is not None else IndexUpdate()
+        with self._write_lock, self._connect() as conn:
+            # Parents first, so a subtree removed with its parent is not rescanned as well
+            for directory in sorted(set(directories)):
+                if conn.execute("SELECT 1 FROM directories WHERE path = ?", (directory,)).fetchone() is None:
+                    continue  # Already removed as part of a vanished parent
+                self._rescan_directory(conn, directory, stats)
+                stats.rescanned += 1
+            if stats.added or stats.removed or stats.changed:
+                conn.execute("UPDATE roots SET refreshed_at = ? WHERE built_at IS NOT NULL", (time.time(),))
+        return stats
+
+    def _rescan_directory(self, conn, directory, stats):
+        try:
+            mtime = os.stat(directory).st_mtime
+            with os.scandir(directory) as entries:
+                records = [record for record in (_entry_record(entry, directory) for entry in entries) if record]
+        except OSError:
+            self._remove_subtree(conn, directory, stats)
+            return
+        known = {row[0]: row[1:] for row in conn.execute(
+            "SELECT path, size, mtime, is_dir FROM entries WHERE parent = ?", (directory,))}
+        inserts = []
+        for record in records:
+            path, parent, name, size, entry_mtime, is_dir = record
+            old = known.pop(path, None)
+            if old is not None and old[2] == is_dir:
+                if old[0] != size or old[1] != entry_mtime:
+                    inserts.append((path, parent, name, fold_name(name, False), size, entry_mtime, is_dir))
+                    stats.changed.append(path)
+                continue
+            if old is not None:
+                # A file replaced by a directory or the other way round
+                self._remove_subtree(conn, path, stats)
+            inserts.append((path, parent, name, fold_name(name, False), size, entry_mtime, is_dir))
+            stats.added.append(path)
+            if is_dir:
+                dir_mtimes = {}
+                for sub_record in crawl(path, dir_mtimes=dir_mtimes):
+                    sub_path, sub_parent, sub_name, sub_size, sub_mtime, sub_is_dir = sub_record
+                    inserts.append((sub_path, sub_parent, sub_name, fold_name(sub_name, False), sub_size, sub_mtime,
+                                    sub_is_dir))
+                    stats.added.append(sub_path)
+                conn.executemany("INSERT OR REPLACE INTO directories(path, mtime) VALUES (?, ?)",
+                                 dir_mtimes.items())
+                stats.new_directories.extend(dir_mtimes)
+        for path, (_size, _mtime, is_dir) in known.items():
+            if is_dir:
+                self._remove_subtree(conn, path, stats)
+            else:
+                conn.execute("DELETE FROM entries WHERE path = ?", (path,))
+                stats.removed.append(path)
+        self._insert(conn, inserts)
+        conn.execute("INSERT OR REPLACE INTO directories(path, mtime) VALUES (?, ?)", (directory, mtime))
+
+    def _remove_subtree(self, conn, directory, stats):
+        """Drop a directory, its entry and everything below it"""
+        condition, params = _under(directory)
+        stats.removed.extend(row[0] for row in conn.execute(f"SELECT path FROM entries WHERE {condition}", params))
+        if conn.execute("DELETE FROM entries WHERE path = ?", (directory,)).rowcount:
+            stats.removed.append(directory)
+        self._delete_tree(conn, directory)
+
+    def search(self, query, match_case=False, full_match=False, directory=""):
+        """Result rows (name, size, mtime, path) whose name matches query"""
+        condition, pattern = name_pattern(query, match_case, full_match)
+        sql = f"SELECT name, size, mtime, path FROM entries WHERE {condition}"
+        params = [pattern]
+        if directory:
+            under, under_params = _under(normalize_directory(directory))
+            sql += f" AND {under}"
+            params.extend(under_params)
+        with self._connect() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def iter_paths(self):
+        """Every indexed path, in insertion order"""
+        with self._connect() as conn:
+            yield from (row[0] for row in conn.execute("SELECT path FROM entries ORDER BY id"))
+
+    def rows_for_paths(self, paths):
+        """Result rows for the given paths, in the same order; unknown paths are skipped"""
+        found = {}
+        with self._connect() as conn:
+            for start in range(0, len(paths), LOOKUP_CHUNK_SIZE):
+                chunk = paths[start:start + LOOKUP_CHUNK_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                for row in conn.execute(
+                        f"SELECT name, size, mtime, path FROM entries WHERE path IN ({placeholders})", chunk):
+                    found[row[3]] = row
+        return [found[path] for path in paths if path in found]
+
+    def last_refresh(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT MAX(refreshed_at) FROM roots").fetchone()[0]
+
+    def status(self):
+        """Entry count, database size and per-root build information for the status panel"""
+        with self._connect() as conn:
+            entries = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            roots = [
+                {"path": path, "entries": count, "build_seconds": seconds, "built_at": built_at,
+                 "refreshed_at": refreshed_at}
+                for path, count, seconds, built_at, refreshed_at in conn.execute(
+                    "SELECT path, entries, build_seconds, built_at, refreshed_at FROM roots ORDER BY path")
+            ]
+        try:
+            db_bytes = sum(os.path.getsize(self.db_path + suffix) for suffix in ("", "-wal")
+                           if os.path.exists(self.db_path + suffix))
+        except OSError:
+            db_bytes = 0
+        return {"entries": entries, "db_bytes": db_bytes, "roots": roots}
+
+
+class IndexUpdate:
+    """Outcome of one incremental update cycle"""
+
+    def __init__(self, mode="poll"):
+        self.mode = mode  # "poll" or "inotify"
+        self.started = time.monotonic()
+        self.detected_at = self.started  # When the oldest change of this cycle was noticed
+        self.checked = 0  # Directories whose mtime was compared (polling)
+        self.rescanned = 0
+        self.added = []
+        self.removed = []
+        self.changed = []  # Files whose size or mtime changed
+        self.new_directories = []
+        self.duration = 0.0  # Seconds spent in the cycle
+        self.latency = 0.0  # Seconds from noticing a change to having it committed
+
+    def has_changes(self):
+        return bool(self.added or self.removed or self.changed)
+
+
+class InotifyWatcher:
+    """Directory change notifications through the Linux inotify API, called via ctypes.
+
+    One watch is kept per directory. Events only mark their directory as dirty; the
+    updater rescans dirty directories like changed ones found by polling. Use
+    create(), which returns None where inotify is unavailable.
+    """
+
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+                  | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self, libc, fd):
+        self._libc = libc
+        self.fd = fd
+        self._watches = {}  # Watch descriptor -> directory
+        self._dirty = set()
+        self.first_event_at = None
+        self.overflowed = False  # Events were lost; a full poll is needed
+
+    @classmethod
+    def create(cls):
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            libc.inotify_init1.argtypes = [ctypes.c_int]
+            libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        except (OSError, AttributeError):
+            return None
+        fd = libc.inotify_init1(cls.IN_NONBLOCK | cls.IN_CLOEXEC)
+        if fd < 0:
+            return None
+        return cls(libc, fd)
+
+    def watch(self, directories):
+        """Add watches; returns False once the kernel refuses more (fs.inotify.max_user_watches)"""
+        for directory in directories:
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), self.WATCH_MASK)
+            if wd < 0:
+                if ctypes.get_errno() == errno.ENOSPC:
+                    return False
+                continue  # Vanished or unreadable; the next rescan of its parent notices
+            self._watches[wd] = directory
+        return True
+
+    def drain(self):
+        """Read pending events and return the set of dirty directories since the last call"""
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            except OSError:
+                break
+            if not data:
+                break
+            if self.first_event_at is None:
+                self.first_event_at = time.monotonic()
+            offset = 0
+            while offset + self._EVENT.size <= len(data):
+                wd, mask, _cookie, length = self._EVENT.unpack_from(data, offset)
+                offset += self._EVENT.size + length
+                if mask & self.IN_Q_OVERFLOW:
+                    self.overflowed = True
+                    continue
+                directory = self._watches.get(wd)
+                if directory is None:
+                    continue
+                if mask & self.IN_IGNORED:
+                    del self._watches[wd]
+                    continue
+                if mask & (self.IN_DELETE_SELF | self.IN_MOVE_SELF):
+                    # The parent lists the removal
+                    self._dirty.add(os.path.dirname(directory))
+                else:
+                    self._dirty.add(directory)
+        dirty, self._dirty = self._dirty, set()
+        return dirty
+
+    def close(self):
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+
+class IndexUpdater:
+    """Keeps a FileIndex current without recrawling.
+
+    Polling mode compares the mtime of every crawled directory with the recorded one
+    and rescans the directories that changed. On Linux, inotify (use_inotify=True)
+    reports dirty directories directly, and polling remains the fallback when
+    inotify is unavailable, runs out of watches or overflows its event queue. The
+    first inotify cycle also polls once, for changes made while nothing watched.
+    Note that a directory mtime only changes when entries are added, removed or
+    renamed; in polling mode, edits to existing files are picked up once their
+    directory is rescanned for another reason.
+    """
+
+    def __init__(self, file_index, use_inotify=True, history_size=50):
+        self.file_index = file_index
+        self.watcher = InotifyWatcher.create() if use_inotify else None
+        if self.watcher is not None and not self.watcher.watch(file_index.directory_mtimes()):
+            self.watcher.close()
+            self.watcher = None
+        # Watches only see changes from now on; the first cycle polls for the ones made before
+        self._caught_up = self.watcher is None
+        self.history = deque(maxlen=history_size)
+
+    @property
+    def mode(self):
+        return "inotify" if self.watcher is not None else "poll"
+
+    def run_cycle(self, stop_event=None):
+        """Find changed directories, rescan them and return the IndexUpdate"""
+        stats = IndexUpdate(self.mode)
+        if self.watcher is not None:
+            dirty = self.watcher.drain()
+            if self.watcher.first_event_at is not None:
+                stats.detected_at = self.watcher.first_event_at
+                self.watcher.first_event_at = None
+            if self.watcher.overflowed or not self._caught_up:
+                self.watcher.overflowed = False
+                stats.mode = "poll"
+                dirty |= set(self.file_index.changed_directories(stop_event, stats))
+                self._caught_up = stop_event is None or not stop_event.is_set()
+        else:
+            dirty = self.file_index.changed_directories(stop_event, stats)
+        if dirty and not (stop_event is not None and stop_event.is_set()):
+            self.file_index.update(dirty, stats)
+            if self.watcher is not None and stats.new_directories:
+                if not self.watcher.watch(stats.new_directories):
+                    self.watcher.close()
+                    self.watcher = None
+        now = time.monotonic()
+        stats.duration = now - stats.started
+        stats.latency = now - stats.detected_at if stats.has_changes() else 0.0
+        self.history.append(stats)
+        return stats
+
+    def summary(self):
+        """Averages over the recent cycles, for the status panel"""
+        cycles = list(self.history)
+        with_changes = [cycle for cycle in cycles if cycle.has_changes()]
+        return {
+            "mode": self.mode,
+            "cycles": len(cycles),
+            "last": cycles[-1] if cycles else None,
+            "avg_rescanned": sum(cycle.rescanned for cycle in cycles) / len(cycles) if cycles else 0.0,
+            "avg_duration": sum(cycle.duration for cycle in cycles) / len(cycles) if cycles else 0.0,
+            "avg_latency": (sum(cycle.latency for cycle in with_changes) / len(with_changes)
+                            if with_changes else 0.0),
+        }
+
+    def close(self):
+        if self.watcher is not None:
+            self.watcher.close()
+            self.watcher = None
@@ -0,0 +1,146 @@
+# Copyright 2025 Apple Dragon
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Regex and glob file name patterns.
+
+Spotlight cannot evaluate either, so a pattern search runs in two steps: the
+longest literal every match must contain is pushed into the backend query as a
+"*literal*" name search, and the pattern itself, compiled once, filters the
+candidates in batches. PatternStats counts both sides so the selectivity of the
+pushed-down literal can be shown.
+"""
+
+import fnmatch
+import os
+import re
+import unicodedata
+
+from search_engine import fold_name
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+# Characters Spotlight treats as wildcards in a name comparison; a literal is split on them
+_SPOTLIGHT_WILDCARDS = re.compile(r"[*?]")
+
+
+class PatternError(ValueError):
+    pass
+
+
+def _longest(runs):
+    pieces = [piece for run in runs for piece in _SPOTLIGHT_WILDCARDS.split(run)]
+    return max(pieces, key=len, default="")
+
+
+def _regex_literal_runs(parsed, runs, current):
+    """Collect runs of consecutive literal characters of a parsed regex.
+    Anything that is not a plain literal ends the current run."""
+    for op, arg in parsed:
+        if op is sre_parse.LITERAL:
+            current.append(chr(arg))
+            continue
+        if op is sre_parse.SUBPATTERN and not arg[1] and not arg[2]:
+            # A group without flag changes matches its contents in sequence
+            _regex_literal_runs(arg[3], runs, current)
+            continue
+        if current:
+            runs.append("".join(current))
+            current.clear()
+
+
+def regex_literal(pattern):
+    """(literal, ignore_case): the longest substring every match of a regex contains.
+    The literal is empty when there is none, e.g. for alternations."""
+    try:
+        parsed = sre_parse.parse(pattern)
+    except (re.error, OverflowError, RecursionError) as e:
+        raise PatternError(f"Invalid regular expression: {e}") from None
+    runs, current = [], []
+    _regex_literal_runs(parsed, runs, current)
+    if current:
+        runs.append("".join(current))
+    return _longest(runs), bool(parsed.state.flags & re.IGNORECASE)
+
+
+def glob_literal(pattern):
+    """The longest run of a glob pattern without wildcards or character classes"""
+    return _longest(re.split(r"\[[^\]]*\]?|[*?]", pattern))
+
+
+class NamePattern:
+    """A regex or glob compiled once and matched against file names.
+
+    Regexes search anywhere in the name (anchor them with ^ and $); globs always
+    describe the whole name, like in a shell. Unless match_case, both
+    ignore case (globs also diacritics, like a Spotlight "cd" comparison).
+    Names are compared in NFC, since macOS file names are often decomposed.
+    """
+
+    def __init__(self, kind, pattern, match_case=False):
+        if kind not in ("regex", "glob"):
+            raise PatternError(f"Unknown pattern kind: {kind}")
+        self.kind = kind
+        self.pattern = pattern
+        self.match_case = match_case
+        if kind == "regex":
+            self.literal, inline_ignore_case = regex_literal(pattern)
+            self.literal_ignores_case = inline_ignore_case or not match_case
+            flags = 0 if match_case else re.IGNORECASE
+            compiled = re.compile(unicodedata.normalize("NFC", pattern), flags)
+            self._match = compiled.search
+            self._prepare = lambda name: unicodedata.normalize("NFC", name)
+        else:
+            self.literal = glob_literal(pattern)
+            self.literal_ignores_case = not match_case
+            compiled = re.compile(fnmatch.translate(fold_name(pattern, match_case)), re.DOTALL)
+            self._match = compiled.match
+            self._prepare = lambda name: fold_name(name, match_case)
+
+    def matches(self, name):
+        return self._match(self._prepare(name)) is not None
+
+    def spotlight_clause(self):
+        """Name comparison on the pushed-down literal, or None if there is no literal"""
+        if not self.literal:
+            return None
+        literal = self.literal.replace("\\", "\\\\").replace('"', '\\"')
+        return f'kMDItemFSName == "*{literal}*"{"cd" if self.literal_ignores_case else ""}'
+
+    def filter_rows(self, rows, stats=None):
+        """Rows of a batch whose file name matches, (name, size, mtime, path) or paths"""
+        match, prepare = self._match, self._prepare
+        kept = [row for row in rows
+                if match(prepare(row[0] if isinstance(row, tuple) else os.path.basename(row))) is not None]
+        if stats is not None:
+            stats.add(len(rows), len(kept))
+        return kept
+
+
+class PatternStats:
+    """How many candidates a pattern search fetched and how many matched the pattern"""
+
+    def __init__(self):
+        self.fetched = 0
+        self.survived = 0
+
+    def add(self, fetched, survived):
+        self.fetched += fetched
+        self.survived += survived
+
+    def selectivity(self):
+        """Fraction of the fetched candidates that matched"""
+        return self.survived / self.fetched if self.fetched else 0.0
@@ -0,0 +1,303 @@
+# Copyright 2025 Apple Dragon
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+r"""Inline filter syntax for the search box.
+
+    report ext:pdf,docx size:>10MB modified:<7d kind:image path:~/Documents -name:tmp
+
+Filters are compiled into one Spotlight predicate, so mdfind filters inside the
+index instead of returning rows that are dropped later. Words that are not
+filters remain the name (or content) query. A leading "-" negates a filter.
+
+    ext:pdf,docx      name ends with one of the extensions
+    name:tmp          name contains tmp (same case rules as the search)
+    size:>10MB        also <, >=, <=, = and ranges like 1MB..1GB; units B, KB, MB, GB, TB
+    modified:<7d      changed within 7 days; >7d is older. Units s, min, h, d, w, y,
+                      or a date: modified:>2024-01-31
+    kind:image        Spotlight content type (image, video, audio, pdf, text, folder, ...)
+    path:~/Documents  limit the search to a folder
+    re:^IMG_\d{4}    name matches a regular expression (also regex:)
+    glob:*.tar.gz     whole name matches a shell pattern
+
+Spotlight cannot evaluate re: and glob:, so only the longest literal of the pattern
+is pushed into the predicate and the fetched candidates are filtered afterwards
+(see name_patterns).
+"""
+
+import os
+import re
+import time
+
+from name_patterns import NamePattern, PatternError
+from search_engine import fold_name
+
+SIZE_UNITS = {"": 1, "b": 1, "k": 1024, "kb": 1024, "m": 1024 ** 2, "mb": 1024 ** 2,
+              "g": 1024 ** 3, "gb": 1024 ** 3, "t": 1024 ** 4, "tb": 1024 ** 4}
+AGE_UNITS = {"s": 1, "min": 60, "h": 3600, "d": 86400, "w": 7 * 86400, "y": 365 * 86400}
+KIND_TYPES = {
+    "image": "public.image",
+    "video": "public.movie",
+    "movie": "public.movie",
+    "audio": "public.audio",
+    "music": "public.audio",
+    "pdf": "com.adobe.pdf",
+    "text": "public.text",
+    "code": "public.source-code",
+    "folder": "public.folder",
+    "app": "com.apple.application",
+    "archive": "public.archive",
+    "presentation": "public.presentation",
+    "spreadsheet": "public.spreadsheet",
+    "document": "public.composite-content",
+}
+FILTER_KEYS = ("ext", "name", "size", "modified", "kind", "path", "re", "regex", "glob")
+PATTERN_KEYS = ("regex", "glob")  # Evaluated on the rows even when the backend query contains the filter
+
+_TOKEN = re.compile(r'(-?)([a-z]+):("[^"]*"|\S+)|("[^"]*"|\S+)', re.IGNORECASE)
+_COMPARISON = re.compile(r"^(>=|<=|>|<|=)?(.+)$")
+_NEGATED_OPS = {">": "<=", "<": ">=", ">=": "<", "<=": ">", "==": "!="}
+
+
+class QuerySyntaxError(ValueError):
+    pass
+
+
+def _unquote(value):
+    return value[1:-1] if len(value) >= 2 and value[0] == value[-1] == '"' else value
+
+
+def _spotlight_string(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def parse_size(text):
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)\s*([a-z]*)", text.strip().lower())
+    if not match or match.group(2) not in SIZE_UNITS:
+        raise QuerySyntaxError(f"Invalid size: {text}")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2)])
+
+
+def parse_age_or_date(text):
+    """("age", seconds) for values like 7d, ("date", epoch seconds of local midnight) for YYYY-MM-DD"""
+    text = text.strip().lower()
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)\s*([a-z]+)", text)
+    if match and match.group(2) in AGE_UNITS:
+        return "age", float(match.group(1)) * AGE_UNITS[match.group(2)]
+    try:
+        return "date", time.mktime(time.strptime(text, "%Y-%m-%d"))
+    except ValueError:
+        raise QuerySyntaxError(f"Invalid age or date: {text}") from None
+
+
+class Filter:
+    """One key:value term. op is the comparison for size and modified, "==" otherwise."""
+
+    def __init__(self, key, value, op="==", negated=False):
+        self.key = key
+        self.value = value
+        self.op = op
+        self.negated = negated
+
+    def __repr__(self):
+        return f"Filter({'-' if self.negated else ''}{self.key} {self.op} {self.value!r})"
+
+
+def _parse_filter(key, raw, negated):
+    value = _unquote(raw)
+    if not value:
+        raise QuerySyntaxError(f"Missing value for {key}:")
+    if key == "ext":
+        exts = [part.strip().lstrip(".").lower() for part in re.split(r"[,;]", value) if part.strip().lstrip(".")]
+        return Filter(key, exts, negated=negated)
+    if key in ("name", "path"):
+        return Filter(key, value, negated=negated)
+    if key in PATTERN_KEYS:
+        try:
+            NamePattern(key, value)
+        except (PatternError, re.error) as e:
+            raise QuerySyntaxError(str(e)) from None
+        return Filter(key, value, negated=negated)
+    if key == "kind":
+        uti = KIND_TYPES.get(value.lower())
+        if uti is None:
+            if "." not in value:
+                raise QuerySyntaxError(f"Unknown kind: {value} (try {', '.join(sorted(KIND_TYPES))})")
+            uti = value  # A content type identifier such as com.microsoft.word.doc
+        return Filter(key, uti, negated=negated)
+    if key == "size" and ".." in value:
+        low, high = value.split("..", 1)
+        return [Filter(key, parse_size(low), ">=", negated), Filter(key, parse_size(high), "<=", negated)]
+    op, operand = _COMPARISON.match(value).groups()
+    if key == "size":
+        return Filter(key, parse_size(operand), "==" if op in (None, "=") else op, negated)
+    when = parse_age_or_date(operand)
+    if op is None and when[0] == "age":
+        op = "<"  # modified:7d means within the last 7 days
+    return Filter(key, when, "==" if op in (None, "=") else op, negated)
+
+
+class ParsedQuery:
+    """Search box text split into the remaining query text and its filters"""
+
+    def __init__(self, text, filters, directory=""):
+        self.text = text
+        self.filters = filters
+        self.directory = directory
+        self._patterns = {}  # (filter index, match_case) -> compiled NamePattern
+
+    def has_filters(self):
+        return bool(self.filters) or bool(self.directory)
+
+    def needs_spotlight(self):
+        """Content types can only be evaluated by Spotlight"""
+        return any(f.key == "kind" for f in self.filters)
+
+    def has_patterns(self):
+        return any(f.key in PATTERN_KEYS for f in self.filters)
+
+    def pattern(self, index, match_case=False):
+        """NamePattern of the re: or glob: filter at index, compiled on first use"""
+        key = (index, match_case)
+        pattern = self._patterns.get(key)
+        if pattern is None:
+            f = self.filters[index]
+            pattern = self._patterns[key] = NamePattern(f.key, f.value, match_case)
+        return pattern
+
+    def candidate_literal(self, match_case=False):
+        """Longest pushed-down literal of the patterns, to fetch candidates by name
+        from backends without Spotlight predicates; "" if there is none"""
+        literals = [self.pattern(i, match_case).literal for i, f in enumerate(self.filters)
+                    if f.key in PATTERN_KEYS and not f.negated]
+        return max(literals, key=len, default="")
+
+    def spotlight_clause(self, match_case=False):
+        """Spotlight predicate for the filters, or None if there are none"""
+        clauses = []
+        for i, f in enumerate(self.filters):
+            if f.key in PATTERN_KEYS:
+                # A negated pattern excludes files by a test Spotlight cannot do
+                clause = None if f.negated else self.pattern(i, match_case).spotlight_clause()
+            else:
+                clause = _spotlight_filter(f, match_case)
+            if clause:
+                clauses.append(clause)
+        return " && ".join(clauses) if clauses else None
+
+    def filter_rows(self, rows, match_case=False, patterns_only=False, stats=None):
+        """Rows of a batch of (name, size, mtime, path) rows that pass the filters.
+
+        Backends without Spotlight predicates evaluate every filter here; Spotlight
+        results only need the patterns (patterns_only), whose pushed-down literal
+        fetched a superset. Unknown size or mtime (deferred metadata) passes, like the
+        filter panel. stats, a name_patterns.PatternStats, counts rows in and out."""
+        fetched = len(rows)
+        for i, f in enumerate(self.filters):
+            if not rows:
+                break
+            if f.key in PATTERN_KEYS:
+                pattern = self.pattern(i, match_case)
+                if f.negated:
+                    rows = [row for row in rows if not pattern.matches(row[0])]
+                else:
+                    rows = pattern.filter_rows(rows)
+            elif not patterns_only:
+                rows = [row for row in rows if _row_filter(f, row, match_case)]
+        if stats is not None:
+            stats.add(fetched, len(rows))
+        return rows
+
+
+def parse_query(text):
+    """Split search box text into query text and filters. Raises QuerySyntaxError."""
+    words = []
+    filters = []
+    directory = ""
+    for match in _TOKEN.finditer(text):
+        negated, key, raw, word = match.groups()
+        key = key.lower() if key else None
+        key = "regex" if key == "re" else key
+        if key not in FILTER_KEYS:
+            words.append(_unquote(word) if word is not None else match.group(0))
+            continue
+        parsed = _parse_filter(key, raw, bool(negated))
+        if key == "path":
+            if parsed.negated:
+                raise QuerySyntaxError("path: cannot be negated")
+            directory = os.path.expanduser(parsed.value)
+            continue
+        filters.extend(parsed if isinstance(parsed, list) else [parsed])
+    return ParsedQuery(" ".join(words), filters, directory)
+
+
+def _iso_utc(epoch):
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(epoch))
+
+
+def _spotlight_filter(f, match_case):
+    op = _NEGATED_OPS[f.op] if f.negated else f.op
+    if f.key == "ext":
+        # Extensions never care about case
+        comparisons = [f'kMDItemFSName {"!=" if f.negated else "=="} "*.{_spotlight_string(ext)}"c' for ext in f.value]
+        joined = (" && " if f.negated else " || ").join(comparisons)
+        return f"({joined})" if len(comparisons) > 1 else joined
+    if f.key == "name":
+        modifier = "" if match_case else "cd"
+        return f'kMDItemFSName {op} "*{_spotlight_string(f.value)}*"{modifier}'
+    if f.key == "kind":
+        return f'kMDItemContentTypeTree {op} "{_spotlight_string(f.value)}"'
+    if f.key == "size":
+        return f"kMDItemFSSize {op} {f.value}"
+    kind, amount = f.value
+    if kind == "age":
+        # A younger age is a later date: swap the comparison
+        date_op = {">": "<", "<": ">", ">=": "<=", "<=": ">=", "==": "==", "!=": "!="}[op]
+        return f"kMDItemFSContentChangeDate {date_op} $time.now(-{int(amount)})"
+    if f.op == "==":
+        # A date matches the whole local day
+        start, end = _iso_utc(amount), _iso_utc(amount + 86400)
+        if f.negated:
+            return f"(kMDItemFSContentChangeDate < $time.iso({start}) || kMDItemFSContentChangeDate >= $time.iso({end}))"
+        return f"(kMDItemFSContentChangeDate >= $time.iso({start}) && kMDItemFSContentChangeDate < $time.iso({end}))"
+    return f"kMDItemFSContentChangeDate {op} $time.iso({_iso_utc(amount)})"
+
+
+def _compare(left, op, right):
+    return {"==": left == right, ">": left > right, "<": left < right, ">=": left >= right, "<=": left <= right}[op]
+
+
+def _row_filter(f, row, match_case):
+    """Whether a row passes the filter. Unknown size or mtime passes, negated or not."""
+    name, size, mtime = row[0], row[1], row[2]
+    if f.key == "ext":
+        lowered = name.lower()
+        return any(lowered.endswith("." + ext) for ext in f.value) != f.negated
+    if f.key == "name":
+        return (fold_name(f.value, match_case) in fold_name(name, match_case)) != f.negated
+    if f.key == "size":
+        return size is None or _compare(size, f.op, f.value) != f.negated
+    if f.key == "modified":
+        if mtime is None:
+            return True
+        kind, amount = f.value
+        if kind == "age":
+            matched = _compare(time.time() - mtime, f.op, amount)
+        elif f.op == "==":
+            # A date matches the whole local day
+            matched = amount <= mtime < amount + 86400
+        else:
+            matched = _compare(mtime, f.op, amount)
+        return matched != f.negated
+    return True  # kind: never reaches here, see needs_spotlight()
+
@@ -0,0 +1,213 @@
+# Copyright 2025 Apple Dragon
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Relevance order for search results.
+
+A result scores on how its name matches the query (exact, prefix, word start or
+plain substring), how shallow its path is, how recently it changed, and its
+frecency: how often and how recently it was opened from the app.
+
+Results are ranked incrementally as they stream in. Only the best K (the first
+screen) are kept ordered, in a heap; everything is sorted only once the user
+scrolls past them.
+"""
+
+import heapq
+import math
+import os
+import time
+from array import array
+
+from search_engine import fold_name
+
+# Score weights
+NAME_EXACT = 100.0
+NAME_PREFIX = 60.0
+NAME_WORD = 40.0  # Query starts a word inside the name, e.g. "report" in "q3_report.pdf"
+NAME_SUBSTRING = 20.0
+DEPTH_PENALTY = 2.0  # Per directory level
+MAX_DEPTH_PENALTY = 30.0
+RECENCY_WEIGHT = 20.0
+RECENCY_HALF_LIFE = 30 * 86400  # Seconds until a modification counts half as much
+FRECENCY_WEIGHT = 15.0
+
+FRECENCY_HALF_LIFE = 14 * 86400  # Seconds until an open counts half as much
+MAX_FRECENCY_ENTRIES = 2000
+
+_WORD_SEPARATORS = " _-.()[]"
+
+
+class FrecencyStore:
+    """Open counts and times per path; each open's weight halves every FRECENCY_HALF_LIFE.
+
+    The decayed weight is kept as one number per path, so recording an open and
+    scoring a path are O(1). dirty tells whether opens were recorded since the store
+    was loaded or last saved.
+    """
+
+    def __init__(self, entries=None):
+        self.dirty = False
+        self._entries = {}  # path -> (decayed weight, time of last update)
+        for path, entry in (entries or {}).items():
+            try:
+                weight, updated = entry
+                self._entries[path] = (float(weight), float(updated))
+            except (TypeError, ValueError):
+                continue
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def _decay(weight, updated, now):
+        return weight * 0.5 ** (max(0.0, now - updated) / FRECENCY_HALF_LIFE)
+
+    def record(self, path, now=None):
+        now = time.time() if now is None else now
+        weight, updated = self._entries.get(path, (0.0, now))
+        self._entries[path] = (self._decay(weight, updated, now) + 1.0, now)
+        self.dirty = True
+        if len(self._entries) > MAX_FRECENCY_ENTRIES:
+            self._prune(now)
+
+    def _prune(self, now):
+        ranked = sorted(self._entries.items(), key=lambda item: self._decay(*item[1], now), reverse=True)
+        self._entries = dict(ranked[:MAX_FRECENCY_ENTRIES * 3 // 4])
+
+    def score(self, path, now=None):
+        entry = self._entries.get(path)
+        if entry is None:
+            return 0.0
+        return self._decay(*entry, time.time() if now is None else now)
+
+    def to_dict(self):
+        """JSON-friendly form for the config file; clears dirty"""
+        self.dirty = False
+        return {path: [round(weight, 4), updated] for path, (weight, updated) in self._entries.items()}
+
+
+class Ranker:
+    """Scores result rows for one query; higher is better"""
+
+    def __init__(self, query, match_case=False, frecency=None, now=None):
+        self.needle = fold_name(query, match_case) if query else ""
+        self.match_case = match_case
+        self.frecency = frecency
+        self.now = time.time() if now is None else now
+
+    def name_score(self, name):
+        needle = self.needle
+        if not needle:
+            return 0.0
+        folded = name.lower() if not self.match_case and name.isascii() else fold_name(name, self.match_case)
+        if folded == needle or os.path.splitext(folded)[0] == needle:
+            return NAME_EXACT
+        if folded.startswith(needle):
+            return NAME_PREFIX
+        position = folded.find(needle)
+        if position < 0:
+            return 0.0  # Content match, or a wildcard or pattern search
+        if folded[position - 1] in _WORD_SEPARATORS:
+            return NAME_WORD
+        return NAME_SUBSTRING
+
+    def score(self, row):
+        name, _size, mtime, path = row
+        score = self.name_score(name)
+        score -= min(MAX_DEPTH_PENALTY, DEPTH_PENALTY * path.count("/"))
+        if mtime is not None:
+            score += RECENCY_WEIGHT * 0.5 ** (max(0.0, self.now - mtime) / RECENCY_HALF_LIFE)
+        if self.frecency is not None:
+            opened = self.frecency.score(path, self.now)
+            if opened:
+                score += FRECENCY_WEIGHT * math.log1p(opened)
+        return score
+
+
+class IncrementalRanking:
+    """Ranks rows as they arrive and keeps only the best k ordered.
+
+    add() pushes each row through a min-heap of the k best, so a batch costs
+    O(n log k); rows that fall out are kept in arrival order. Each row is ranked
+    under a key, the row itself unless add() is given others, such as the row
+    indexes of a ResultView; the methods below return keys. ordered() gives the
+    best k sorted, followed by the rest unsorted, which is enough to render the
+    first screen, and add_to_order() keeps such an order up to date batch by batch.
+    sorted_keys() sorts everything, once, when more is needed.
+    """
+
+    def __init__(self, ranker, k):
+        self.ranker = ranker
+        self.k = max(1, k)
+        self._heap = []  # (score, -sequence, key): the worst of the best k on top
+        self._rest = []  # Entries outside the best k, in arrival order
+        self._sequence = 0
+        self._sorted = None  # Cache of sorted_keys()
+
+    def __len__(self):
+        return len(self._heap) + len(self._rest)
+
+    def add(self, rows, keys=None):
+        """Rank a batch of rows under keys (one per row, the rows by default); returns True if the best k changed"""
+        heap, rest, score = self._heap, self._rest, self.ranker.score
+        changed = False
+        added = False
+        for row, key in zip(rows, rows if keys is None else keys):
+            # Earlier rows win ties, keeping the backend order among equal scores
+            entry = (score(row), -self._sequence, key)
+            self._sequence += 1
+            added = True
+            if len(heap) < self.k:
+                heapq.heappush(heap, entry)
+                changed = True
+            elif entry > heap[0]:
+                rest.append(heapq.heapreplace(heap, entry))
+                changed = True
+            else:
+                rest.append(entry)
+        if added:
+            self._sorted = None
+        return changed
+
+    def add_to_order(self, order, rows, keys=None):
+        """Rank a batch and keep order, a list or array of the keys ranked so far, as the
+        best k sorted followed by the rest. Only rows of the batch can enter the best k,
+        so this rewrites the first k keys and appends the others: O(k + batch) instead
+        of rebuilding the order. Returns True if the best k changed."""
+        keys = rows if keys is None else keys
+        shown = self.top()
+        if not self.add(rows, keys):
+            order.extend(keys)
+            return False
+        top = self.top()
+        in_top = set(top)
+        order[:len(shown)] = array("l", top) if isinstance(order, array) else top
+        order.extend(key for key in shown if key not in in_top)
+        order.extend(key for key in keys if key not in in_top)
+        return True
+
+    def top(self):
+        """Keys of the best k rows, best first"""
+        return [entry[2] for entry in sorted(self._heap, reverse=True)]
+
+    def ordered(self):
+        """Keys of the best k rows in order, then the others in arrival order"""
+        return self.top() + [entry[2] for entry in self._rest]
+
+    def sorted_keys(self):
+        """Every key, best first; the heap order is kept for the first k"""
+        if self._sorted is None:
+            # Every entry outside the heap scores at most its minimum
+            self._sorted = self.top() + [entry[2] for entry in sorted(self._rest, reverse=True)]
+        return self._sorted
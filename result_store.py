@@ -0,0 +1,284 @@
+# Copyright 2025 Apple Dragon
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Columnar storage for search results.
+
+A ResultStore keeps its rows in parallel arrays: sizes, mtimes, flags and
+extension codes as machine values. Paths are not stored whole: each directory is
+kept once in a path table and a row is a (directory id, name id) pair, so the
+full path is rebuilt only when it is read, and rows can be grouped by folder by
+comparing integers. Rows are appended and never moved, so a row index stays
+valid for the life of the store. A ResultView is a selection and order of rows given by an array of
+row indexes; filtering and sorting build new index arrays instead of copying
+rows. Both give (name, size, mtime, path) tuples when read, like a result list.
+"""
+
+import sys
+from array import array
+
+FLAG_METADATA = 1  # Size and mtime are known
+
+_UNKNOWN = -1  # Size and mtime of rows without metadata; sorts first, like row_sort_key
+
+
+def extension_of(name):
+    """Lowercased suffix from the last dot of a name, "" without one"""
+    _head, dot, tail = name.rpartition(".")
+    return "." + tail.lower() if dot else ""
+
+
+class ResultStore:
+    """Append-only columnar store of result rows"""
+
+    def __init__(self, rows=()):
+        self._names = []  # Name id -> name, each distinct name once
+        self._name_ids = {}
+        self._name_extensions = array("I")  # Name id -> extension code
+        self._extensions = [""]  # Extension code -> extension
+        self._extension_codes = {"": 0}
+        self._dirs = []  # Directory id -> directory with a trailing "/", each directory once
+        self._dir_ids = {}
+        self._odd_paths = {}  # Row index -> path, for the rare row whose name is not its last path component
+        self.name_ids = array("I")
+        self.dir_ids = array("I")
+        self.sizes = array("q")
+        self.mtimes = array("d")
+        self.flags = array("B")
+        self.extension_codes = array("I")
+        self.extend(rows)
+
+    def __len__(self):
+        return len(self.name_ids)
+
+    def _name_id(self, name):
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            name_id = self._name_ids[name] = len(self._names)
+            self._names.append(sys.intern(name))
+            extension = extension_of(name)
+            code = self._extension_codes.get(extension)
+            if code is None:
+                code = self._extension_codes[extension] = len(self._extensions)
+                self._extensions.append(extension)
+            self._name_extensions.append(code)
+        return name_id
+
+    def _dir_id(self, directory):
+        dir_id = self._dir_ids.get(directory)
+        if dir_id is None:
+            dir_id = self._dir_ids[directory] = len(self._dirs)
+            self._dirs.append(sys.intern(directory))
+        return dir_id
+
+    def append(self, row):
+        """Add a (name, size, mtime, path) row; returns its index"""
+        name, size, mtime, path = row
+        cut = path.rfind("/") + 1
+        if path[cut:] != name:
+            self._odd_paths[len(self.name_ids)] = path
+        name_id = self._name_id(name)
+        self.name_ids.append(name_id)
+        self.dir_ids.append(self._dir_id(path[:cut]))
+        if size is None:
+            self.sizes.append(_UNKNOWN)
+            self.mtimes.append(_UNKNOWN)
+            self.flags.append(0)
+        else:
+            self.sizes.append(size)
+            self.mtimes.append(mtime)
+            self.flags.append(FLAG_METADATA)
+        self.extension_codes.append(self._name_extensions[name_id])
+        return len(self.name_ids) - 1
+
+    def extend(self, rows):
+        """Add rows; returns the range of their indexes"""
+        start = len(self.name_ids)
+        for row in rows:
+            self.append(row)
+        return range(start, len(self.name_ids))
+
+    def name(self, index):
+        return self._names[self.name_ids[index]]
+
+    def path(self, index):
+        """Full path of a row, rebuilt from its directory and name"""
+        if index in self._odd_paths:
+            return self._odd_paths[index]
+        return self._dirs[self.dir_ids[index]] + self._names[self.name_ids[index]]
+
+    def directory(self, index):
+        """Containing folder of a row"""
+        return self.directory_of(self.dir_ids[index])
+
+    def directory_of(self, dir_id):
+        directory = self._dirs[dir_id]
+        return directory[:-1] if len(directory) > 1 else directory
+
+    def row(self, index):
+        name = self._names[self.name_ids[index]]
+        if self.flags[index] & FLAG_METADATA:
+            return (name, self.sizes[index], self.mtimes[index], self.path(index))
+        return (name, None, None, self.path(index))
+
+    def set_row(self, index, row):
+        """Update the size and mtime of a row, e.g. once deferred metadata has been read"""
+        _name, size, mtime, _path = row
+        if size is None:
+            self.sizes[index], self.mtimes[index] = _UNKNOWN, _UNKNOWN
+            self.flags[index] &= ~FLAG_METADATA
+        else:
+            self.sizes[index], self.mtimes[index] = size, mtime
+            self.flags[index] |= FLAG_METADATA
+
+    def view(self, indexes=None):
+        """View of the given rows, or of every row in insertion order"""
+        if indexes is None:
+            indexes = range(len(self.name_ids))
+        return ResultView(self, array("l", indexes))
+
+
+class ResultView:
+    """Rows of a ResultStore in the order of an index array.
+
+    Reads like a list of (name, size, mtime, path) rows. Assigning a row updates
+    the store, so every view of the row sees its new metadata.
+    """
+
+    def __init__(self, store, indexes):
+        self.store = store
+        self.indexes = indexes
+
+    def __len__(self):
+        return len(self.indexes)
+
+    def __iter__(self):
+        store = self.store
+        names, name_ids, dirs, dir_ids = store._names, store.name_ids, store._dirs, store.dir_ids
+        sizes, mtimes, flags, odd_paths = store.sizes, store.mtimes, store.flags, store._odd_paths
+        for index in self.indexes:
+            name = names[name_ids[index]]
+            path = odd_paths[index] if odd_paths and index in odd_paths else dirs[dir_ids[index]] + name
+            if flags[index] & FLAG_METADATA:
+                yield (name, sizes[index], mtimes[index], path)
+            else:
+                yield (name, None, None, path)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return ResultView(self.store, self.indexes[position])
+        return self.store.row(self.indexes[position])
+
+    def __setitem__(self, position, row):
+        self.store.set_row(self.indexes[position], row)
+
+    def copy(self):
+        return ResultView(self.store, array("l", self.indexes))
+
+    def append_rows(self, rows):
+        """Add new rows to the store and to this view; returns a view of just the new rows"""
+        added = array("l", self.store.extend(rows))
+        self.indexes.extend(added)
+        return ResultView(self.store, added)
+
+    def extend(self, other):
+        """Append the rows of another view of the same store"""
+        if other.store is not self.store:
+            raise ValueError("views of different stores")
+        self.indexes.extend(other.indexes)
+
+    def insert_index(self, position, index):
+        self.indexes.insert(position, index)
+
+    def group_by_directory(self):
+        """Directory id -> array of the row indexes in that folder, in view order"""
+        groups = {}
+        dir_ids = self.store.dir_ids
+        for index in self.indexes:
+            group = groups.get(dir_ids[index])
+            if group is None:
+                group = groups[dir_ids[index]] = array("l")
+            group.append(index)
+        return groups
+
+    def has_deferred_rows(self):
+        flags = self.store.flags
+        return any(not flags[index] & FLAG_METADATA for index in self.indexes)
+
+    def where(self, keep):
+        """View of the rows whose index passes keep(index)"""
+        return ResultView(self.store, array("l", filter(keep, self.indexes)))
+
+    def without_paths(self, paths):
+        path = self.store.path
+        return self.where(lambda index: path(index) not in paths)
+
+    def filter(self, min_size=None, max_size=None, extensions=None):
+        """Rows within a size range (bytes) and ending in one of the extensions, as a new view.
+        Rows with unknown size pass, as in filter_by_size_and_extension."""
+        store = self.store
+        sizes, flags = store.sizes, store.flags
+        indexes = self.indexes
+        if min_size is not None:
+            indexes = [i for i in indexes if sizes[i] >= min_size or not flags[i] & FLAG_METADATA]
+        if max_size is not None:
+            indexes = [i for i in indexes if sizes[i] <= max_size or not flags[i] & FLAG_METADATA]
+        if extensions:
+            # A single-dot extension matches exactly the names whose last suffix it is,
+            # so it compares codes; ".tar.gz" and the like are checked on the name
+            codes = {store._extension_codes[ext] for ext in extensions
+                     if ext.count(".") == 1 and ext in store._extension_codes}
+            multi = tuple(ext for ext in extensions if ext.count(".") != 1)
+            extension_codes = store.extension_codes
+            if multi:
+                indexes = [i for i in indexes if extension_codes[i] in codes or store.name(i).lower().endswith(multi)]
+            else:
+                indexes = [i for i in indexes if extension_codes[i] in codes]
+        return ResultView(store, array("l", indexes))
+
+    def sort(self, column, descending=False):
+        """Sort in place by a result column (0 name, 1 size, 2 date, 3 path), stable like row_sort_key"""
+        store = self.store
+        if column == 0:
+            folded = [name.lower() for name in store._names]
+            name_ids = store.name_ids
+            key = lambda index: folded[name_ids[index]]
+        elif column == 1:
+            key = store.sizes.__getitem__
+        elif column == 2:
+            key = store.mtimes.__getitem__
+        else:
+            # Folded once per directory and name instead of once per path
+            folded_dirs = [directory.lower() for directory in store._dirs]
+            folded = [name.lower() for name in store._names]
+            name_ids, dir_ids, odd_paths = store.name_ids, store.dir_ids, store._odd_paths
+            key = lambda index: (odd_paths[index].lower() if index in odd_paths
+                                 else folded_dirs[dir_ids[index]] + folded[name_ids[index]])
+        self.indexes = array("l", sorted(self.indexes, key=key, reverse=descending))
+
+    def resolve(self, metadata):
+        """Fill in rows without metadata from path -> row; rows mapped to None (deleted) are dropped.
+        Returns the view without the dropped rows."""
+        store = self.store
+        dropped = set()
+        for index in self.indexes:
+            if store.flags[index] & FLAG_METADATA:
+                continue
+            path = store.path(index)
+            if path in metadata:
+                row = metadata[path]
+                if row is None:
+                    dropped.add(index)
+                else:
+                    store.set_row(index, row)
+        return self.where(lambda index: index not in dropped) if dropped else self
@@ -0,0 +1,170 @@
+# Copyright 2025 Apple Dragon
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Saved searches: pinned searches refreshed on a schedule, with result diffs.
+
+The last result set of every saved search is kept on disk as a snapshot. A
+refresh compares its rows with the snapshot by path: rows that appeared, rows
+that disappeared, and rows whose size or mtime changed. Refreshes that come due
+while the machine is busy are put off, each time for twice as long.
+"""
+
+import json
+import os
+import time
+import uuid
+
+SAVED_RESULTS_DIR = os.path.expanduser("~/.everythingByMdfind.saved")
+SNAPSHOT_VERSION = 1
+
+DEFAULT_REFRESH_INTERVAL = 15 * 60  # Seconds between refreshes of a saved search
+MAX_BACKOFF = 8  # Busy machine: the interval doubles up to this factor
+BUSY_LOAD_PER_CPU = 1.0  # 1-minute load average per CPU above which the machine counts as busy
+
+
+def new_saved_id():
+    return uuid.uuid4().hex
+
+
+class ResultDelta:
+    """Rows added, removed and changed between two result sets of a search"""
+
+    def __init__(self, added=(), removed=(), changed=()):
+        self.added = list(added)
+        self.removed = list(removed)
+        self.changed = list(changed)  # (old row, new row) pairs
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+    def summary(self):
+        if not self:
+            return "no changes"
+        return f"+{len(self.added):,} −{len(self.removed):,} ~{len(self.changed):,}"
+
+    def marks(self):
+        """path -> "added" or "changed", for highlighting rows"""
+        marks = {row[3]: "added" for row in self.added}
+        marks.update((new[3], "changed") for _old, new in self.changed)
+        return marks
+
+
+def diff_results(old_rows, new_rows):
+    """ResultDelta between two lists of (name, size, mtime, path) rows, matched by path.
+
+    A row counts as changed only when both sides know its size and mtime, so rows
+    still waiting for deferred metadata are not reported.
+    """
+    old_by_path = {row[3]: row for row in old_rows}
+    added, changed = [], []
+    seen = set()
+    for row in new_rows:
+        path = row[3]
+        if path in seen:
+            continue
+        seen.add(path)
+        old = old_by_path.get(path)
+        if old is None:
+            added.append(row)
+        elif None not in (old[1], old[2], row[1], row[2]) and (old[1] != row[1] or old[2] != row[2]):
+            changed.append((old, row))
+    removed = [row for path, row in old_by_path.items() if path not in seen]
+    return ResultDelta(added, removed, changed)
+
+
+class SnapshotStore:
+    """Last result set of each saved search, one JSON file per search"""
+
+    def __init__(self, directory=SAVED_RESULTS_DIR):
+        self.directory = directory
+
+    def _path(self, saved_id):
+        return os.path.join(self.directory, f"{saved_id}.json")
+
+    def load(self, saved_id):
+        """(rows, saved_at, search) of a saved search, or None if it has no readable snapshot.
+        search is the dict of search parameters the rows were found with."""
+        try:
+            with open(self._path(saved_id), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != SNAPSHOT_VERSION:
+                return None
+            return [tuple(row) for row in data["rows"]], float(data["saved_at"]), data.get("search")
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+
+    def save(self, saved_id, rows, search=None, saved_at=None):
+        """Write a snapshot atomically, so a crash never leaves half a file behind"""
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        path = self._path(saved_id)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        data = {"version": SNAPSHOT_VERSION, "saved_at": time.time() if saved_at is None else saved_at,
+                "search": search, "rows": [list(row) for row in rows]}
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(temp_path, path)
+        except OSError:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+    def delete(self, saved_id):
+        try:
+            os.remove(self._path(saved_id))
+        except OSError:
+            pass
+
+
+def machine_busy(threshold=BUSY_LOAD_PER_CPU):
+    """Whether the 1-minute load average per CPU is above threshold"""
+    try:
+        load = os.getloadavg()[0]
+    except (AttributeError, OSError):
+        return False  # No load average on this platform
+    return load / (os.cpu_count() or 1) > threshold
+
+
+class RefreshSchedule:
+    """When a saved search refreshes next.
+
+    Every refresh that comes due on a busy machine is skipped and the wait
+    doubles, up to MAX_BACKOFF times the interval; a refresh that runs resets it.
+    """
+
+    def __init__(self, interval=DEFAULT_REFRESH_INTERVAL, last_refresh=None):
+        self.interval = interval
+        self.last_refresh = last_refresh
+        self.backoff = 1
+        self.next_due = (last_refresh or 0) + interval
+
+    def due(self, now=None):
+        return self.interval > 0 and (time.time() if now is None else now) >= self.next_due
+
+    def refreshed(self, now=None):
+        now = time.time() if now is None else now
+        self.last_refresh = now
+        self.backoff = 1
+        self.next_due = now + self.interval
+
+    def back_off(self, now=None):
+        self.backoff = min(self.backoff * 2, MAX_BACKOFF)
+        self.next_due = (time.time() if now is None else now) + self.interval * self.backoff
+
+    def set_interval(self, interval):
+        self.interval = interval
+        self.backoff = 1
+        self.next_due = (self.last_refresh or 0) + interval
@@ -0,0 +1,594 @@
+# Copyright 2025 Apple Dragon
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Search backends: where the paths of a search come from.
+
+A backend turns the search options of a tab into a stream of matching paths.
+MdfindBackend asks Spotlight; ScandirBackend walks the directory tree itself and
+works on volumes Spotlight does not index, or without Spotlight at all;
+IndexBackend answers file name searches from the persistent file index.
+MultiRootBackend runs one search per root of a multi-root directory field
+concurrently and merges them.
+"""
+
+import copy
+import fnmatch
+import os
+import queue
+import re
+import shutil
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from query_language import parse_query
+from search_engine import (
+    MDFIND_COMMAND, build_mdfind_command, build_mdfind_query, fold_name, iter_null_delimited, iter_output_lines,
+    SKIP_ROW, normalize_directory, result_cache_key, row_from_stat, split_roots
+)
+
+BACKEND_AUTO = "auto"  # Spotlight, falling back to a directory walk per directory
+DEFAULT_WALK_WORKERS = 8
+
+
+class SearchOptions:
+    """The search options of a tab, independent of the backend that runs them"""
+
+    def __init__(self, query="", directory="", search_by_file_name=True, match_case=False, full_match=False,
+                 extra_clause=None, is_bookmark=False, filters=None):
+        self.query = query
+        self.directory = directory
+        self.search_by_file_name = search_by_file_name
+        self.match_case = match_case
+        self.full_match = full_match
+        self.extra_clause = extra_clause
+        self.is_bookmark = is_bookmark
+        self.filters = filters  # ParsedQuery of inline filters (ext:, size:, ...), if any
+
+    @classmethod
+    def from_text(cls, text, directory="", search_by_file_name=True, match_case=False, full_match=False,
+                  extra_clause=None, is_bookmark=False):
+        """Options for search box text that may contain inline filters; a path: filter
+        replaces the directory. Raises query_language.QuerySyntaxError."""
+        if is_bookmark:
+            return cls(text, directory, search_by_file_name, match_case, full_match, extra_clause, is_bookmark)
+        parsed = parse_query(text)
+        if not parsed.has_filters():
+            return cls(text, directory, search_by_file_name, match_case, full_match, extra_clause)
+        # Without query text only the filters select files, so there is nothing to match fully
+        return cls(parsed.text, parsed.directory or directory, search_by_file_name, match_case,
+                   full_match and bool(parsed.text), extra_clause, filters=parsed if parsed.filters else None)
+
+    def filter_clause(self):
+        """Spotlight predicate of the extra clause and the inline filters together"""
+        clauses = [clause for clause in (
+            self.extra_clause, self.filters.spotlight_clause(self.match_case) if self.filters else None
+        ) if clause]
+        if len(clauses) > 1:
+            return " && ".join(f"({clause})" for clause in clauses)
+        return clauses[0] if clauses else None
+
+    def for_directory(self, directory):
+        """Copy of these options searching another directory"""
+        options = copy.copy(self)
+        options.directory = directory
+        return options
+
+    def row_filter(self, patterns_only=False, stats=None):
+        """Function filtering a batch of result rows by the inline filters, or None if there
+        is nothing to check. Backends that put the filters into a Spotlight query only need
+        the re: and glob: patterns checked (patterns_only). stats is a PatternStats."""
+        if not self.filters or (patterns_only and not self.filters.has_patterns()):
+            return None
+        return lambda rows: self.filters.filter_rows(rows, self.match_case, patterns_only, stats)
+
+    def name_query(self):
+        """(query, full_match) to fetch candidate names with: the query text, or without one
+        the literal pushed down from a re: or glob: pattern"""
+        if self.query or not self.filters:
+            return self.query, self.full_match
+        return self.filters.candidate_literal(self.match_case), False
+
+    def spotlight_query(self):
+        """Spotlight query string for these options, None if there is nothing to search for"""
+        return build_mdfind_query(
+            self.query, self.search_by_file_name, self.match_case, self.full_match,
+            self.filter_clause(), self.is_bookmark
+        )
+
+
+class BackendRun:
+    """A running backend search. Iterate paths; stop() cancels it.
+    Backends that already know size and mtime (the file index) pass complete
+    result rows instead, which skips the stat stage."""
+
+    def __init__(self, paths, process=None, on_stop=None, rows=None):
+        self.paths = paths
+        self.rows = rows
+        self.hits = None  # Content search: path -> (line offset, line number) of the first match
+        self.progress = None  # Multi-root search: RootProgress per root
+        self.process = process
+        self._on_stop = on_stop
+
+    def wait(self):
+        if self.process is not None:
+            self.process.wait()
+
+    def send_signal(self, sig):
+        """Forward a signal to the backend process (used to pause and resume searches)"""
+        if self.process is None or self.process.poll() is not None:
+            return
+        try:
+            self.process.send_signal(sig)
+        except Exception:
+            pass
+
+    def stat_with(self, stat):
+        """Stat function for the paths of this run, given the one the caller would use"""
+        return stat
+
+    def stop(self):
+        if self.process is not None:
+            try:
+                self.process.terminate()
+            except Exception:
+                pass
+        if self._on_stop is not None:
+            self._on_stop()
+
+
+class SearchBackend:
+    """Base class of search backends"""
+
+    name = ""
+    label = ""
+    filters_in_query = False  # Inline filters are part of the backend query; otherwise rows are filtered after
+
+    def available(self):
+        return True
+
+    def supports(self, options):
+        """Whether this backend can run a search with these options"""
+        return True
+
+    def cache_key(self, options, deferred=False):
+        query_str = options.spotlight_query()
+        if query_str is None:
+            return None
+        return (self.name,) + result_cache_key(query_str, options.directory, deferred)
+
+    def start(self, options, null_delimited=True):
+        """Start a search and return its BackendRun"""
+        raise NotImplementedError
+
+
+class MdfindBackend(SearchBackend):
+    """Spotlight search through the mdfind command"""
+
+    name = "mdfind"
+    label = "Spotlight (mdfind)"
+    filters_in_query = True
+
+    def available(self):
+        return shutil.which(MDFIND_COMMAND) is not None
+
+    def start(self, options, null_delimited=True):
+        cmd = build_mdfind_command(options.spotlight_query(), options.directory, null_delimited)
+        if null_delimited:
+            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+            return BackendRun(iter_null_delimited(process.stdout), process)
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        return BackendRun(iter_output_lines(process.stdout), process)
+
+
+def _has_wildcards(text):
+    return "*" in text or "?" in text
+
+
+def name_matcher(query, match_case, full_match):
+    """Predicate on file names with kMDItemFSName semantics: "*query*" unless full_match,
+    "*" and "?" as wildcards, case and diacritic insensitive unless match_case."""
+    needle = fold_name(query, match_case)
+    if not _has_wildcards(needle):
+        if full_match:
+            return lambda name: fold_name(name, match_case) == needle
+        return lambda name: needle in fold_name(name, match_case)
+    pattern = needle if full_match else f"*{needle}*"
+    match = re.compile(fnmatch.translate(pattern), re.DOTALL).match
+    return lambda name: match(fold_name(name, match_case)) is not None
+
+
+def parallel_walk(root, match_name=None, files_only=False, workers=DEFAULT_WALK_WORKERS, stop_event=None):
+    """Walk a directory tree with a pool of scandir workers and yield matching paths.
+
+    Every directory is scanned by its own task, so sibling subtrees are read in
+    parallel; output order is therefore not deterministic. Symlinks are reported
+    but never followed. match_name filters on the entry name; files_only limits
+    the output to regular files (the candidates of a content search).
+    """
+    stop_event = stop_event if stop_event is not None else threading.Event()
+    results = queue.Queue()
+    pending = [1]
+    lock = threading.Lock()
+    executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="walk")
+
+    def scan(directory):
+        found = []
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if stop_event.is_set():
+                        break
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                    except OSError:
+                        is_dir = False
+                    if is_dir:
+                        subdirs.append(entry.path)
+                    if match_name is not None and not match_name(entry.name):
+                        continue
+                    if files_only:
+                        try:
+                            if is_dir or not entry.is_file(follow_symlinks=False):
+                                continue
+                        except OSError:
+                            continue
+                    found.append(entry.path)
+        except OSError:
+            pass  # Unreadable directory: skipped, like Spotlight does for directories it cannot index
+        if found:
+            results.put(found)
+        with lock:
+            if not stop_event.is_set():
+                for subdir in subdirs:
+                    pending[0] += 1
+                    try:
+                        executor.submit(scan, subdir)
+                    except RuntimeError:
+                        pending[0] -= 1
+            pending[0] -= 1
+            if pending[0] == 0:
+                results.put(None)
+
+    executor.submit(scan, root)
+    try:
+        while True:
+            chunk = results.get()
+            if chunk is None:
+                break
+            yield from chunk
+            if stop_event.is_set():
+                break
+    finally:
+        stop_event.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+class ScandirBackend(SearchBackend):
+    """Walks the search directory with os.scandir; no index needed"""
+
+    name = "scandir"
+    label = "Directory walk (scandir)"
+
+    def __init__(self, workers=DEFAULT_WALK_WORKERS):
+        self.workers = workers
+
+    def supports(self, options):
+        # Spotlight predicates (bookmarks, extra clauses, kind:) cannot be evaluated on the file system
+        if options.is_bookmark or options.extra_clause is not None:
+            return False
+        if options.filters is not None and options.filters.needs_spotlight():
+            return False
+        # Inline filters alone are enough for a name search: every file is a candidate
+        return bool(options.query) or (options.filters is not None and options.search_by_file_name)
+
+    def walk_root(self, options):
+        return normalize_directory(options.directory) or os.path.expanduser("~")
+
+    def start(self, options, null_delimited=True):
+        stop_event = threading.Event()
+        root = self.walk_root(options)
+        if options.search_by_file_name:
+            query, full_match = options.name_query()
+            match_name = name_matcher(query, options.match_case, full_match)
+            paths = parallel_walk(root, match_name, workers=self.workers, stop_event=stop_event)
+            return BackendRun(paths, on_stop=stop_event.set)
+
+        # Content search: the walk feeds candidate files to the mmap scanner pool. The walk
+        # sets its own event when it is done, so it must not share the scanner's.
+        from content_search import ContentScanner  # Imports multiprocessing; only content searches need it
+        walk_stop = threading.Event()
+        candidates = parallel_walk(root, files_only=True, workers=self.workers, stop_event=walk_stop)
+        scanner = ContentScanner()
+
+        def stop():
+            walk_stop.set()
+            stop_event.set()
+
+        run = BackendRun(None, on_stop=stop)
+        run.hits = {}
+
+        def hit_paths():
+            for hit in scanner.scan(candidates, options.query, options.match_case, options.full_match, stop_event):
+                run.hits[hit.path] = (hit.line_offset, hit.line_number)
+                yield hit.path
+
+        run.paths = hit_paths()
+        run.scan_stats = scanner.stats
+        return run
+
+
+class IndexBackend(SearchBackend):
+    """File name search answered from the persistent FileIndex"""
+
+    name = "index"
+    label = "File index"
+
+    def __init__(self, file_index, trigram_index=None):
+        self.file_index = file_index
+        self.trigram_index = trigram_index
+
+    def supports(self, options):
+        if not options.search_by_file_name or options.is_bookmark or options.extra_clause is not None:
+            return False
+        if options.filters is not None and options.filters.needs_spotlight():
+            return False
+        return bool(options.query or options.filters) and self.file_index.covers(options.directory)
+
+    def cache_key(self, options, deferred=False):
+        # Rows from the index are complete either way; a rebuild makes older entries unreachable
+        return (self.name, self.file_index.last_refresh(), options.spotlight_query(), options.match_case,
+                options.full_match, normalize_directory(options.directory))
+
+    def start(self, options, null_delimited=True):
+        trigram = self.trigram_index
+        query, full_match = options.name_query()
+        if trigram is not None and trigram.supports(query) and trigram.covers(options.directory):
+            # Substring lookup in memory; size and mtime still come from the database
+            paths = trigram.search(query, options.match_case, full_match, options.directory)
+            rows = self.file_index.rows_for_paths(paths)
+        else:
+            rows = self.file_index.search(query, options.match_case, full_match, options.directory)
+        return BackendRun((row[3] for row in rows), rows=rows)
+
+
+class RootProgress:
+    """Progress of one root of a multi-root search"""
+
+    def __init__(self, root):
+        self.root = root
+        self.backend = ""
+        self.found = 0  # Paths this root contributed
+        self.duplicates = 0  # Paths another root had already reported
+        self.error = None
+        self.started = time.monotonic()
+        self.finished = None
+
+    def elapsed(self):
+        return (self.finished or time.monotonic()) - self.started
+
+    def snapshot(self):
+        """(root, backend, found, duplicates, seconds, done, error) for the UI"""
+        return (self.root, self.backend, self.found, self.duplicates, self.elapsed(),
+                self.finished is not None, self.error)
+
+
+_ROOT_DONE = object()
+
+
+class MultiRootRun(BackendRun):
+    """Searches every root on its own thread and merges their paths into one stream.
+
+    Each root tries its planned backends in order like a single-root search. A path
+    reported by several roots (nested roots) is passed on once. A file reached by
+    different paths (symlinks, hard links) is dropped by the stat from stat_with(),
+    keyed by (st_dev, st_ino), so the stats still run in the StatPipeline's pool.
+    """
+
+    def __init__(self, options, roots, plan, null_delimited=True):
+        super().__init__(None)
+        self.progress = [RootProgress(root) for root in roots]
+        self.hits = None if options.search_by_file_name else {}
+        self.paths = self._merge()
+        self._plan = plan
+        self._null_delimited = null_delimited
+        self._runs = []
+        self._seen_paths = set()
+        self._seen_files = set()  # (st_dev, st_ino) of the files passed on by the stat stage
+        self._origins = None  # path -> RootProgress of the root that reported it, until it is stat-ed
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._stop_event = threading.Event()
+        self._threads = [
+            threading.Thread(target=self._search_root, args=(progress, options.for_directory(progress.root)),
+                             name="root-search", daemon=True)
+            for progress in self.progress
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def _search_root(self, progress, options):
+        try:
+            for backend in self._plan(options):
+                if self._stop_event.is_set():
+                    break
+                if not backend.supports(options):
+                    continue
+                progress.backend = backend.name
+                run = backend.start(options, self._null_delimited)
+                with self._lock:
+                    self._runs.append(run)
+                if self._stop_event.is_set():
+                    run.stop()
+                for path in run.paths:
+                    if self._stop_event.is_set():
+                        break
+                    if not path:
+                        continue
+                    with self._lock:
+                        first = path not in self._seen_paths
+                        self._seen_paths.add(path)
+                        if first:
+                            progress.found += 1
+                        else:
+                            progress.duplicates += 1
+                    if not first:
+                        continue
+                    if run.hits is not None and self.hits is not None and path in run.hits:
+                        self.hits[path] = run.hits[path]
+                    self._queue.put((path, progress))
+                run.wait()
+                if progress.found or progress.duplicates:
+                    break
+        except Exception as e:
+            progress.error = str(e)
+        finally:
+            progress.finished = time.monotonic()
+            self._queue.put(_ROOT_DONE)
+
+    def _merge(self):
+        remaining = len(self.progress)
+        while remaining:
+            item = self._queue.get()
+            if item is _ROOT_DONE:
+                remaining -= 1
+                continue
+            path, progress = item
+            if self._origins is not None:
+                self._origins[path] = progress
+            yield path
+
+    def stat_with(self, stat):
+        """Stat function that drops files another path already led to (SKIP_ROW).
+        Its os.stat() gives the row too, so stat is not called. Call it before iterating paths."""
+        origins = self._origins = {}
+
+        def first_sighting(path):
+            progress = origins.pop(path, None)
+            try:
+                st = os.stat(path)
+            except (OSError, ValueError):
+                return None
+            key = (st.st_dev, st.st_ino)
+            with self._lock:
+                if key in self._seen_files:
+                    if progress is not None:
+                        progress.found -= 1
+                        progress.duplicates += 1
+                    return SKIP_ROW
+                self._seen_files.add(key)
+            return row_from_stat(path, st)
+        return first_sighting
+
+    def wait(self):
+        for thread in self._threads:
+            thread.join()
+
+    def send_signal(self, sig):
+        with self._lock:
+            runs = list(self._runs)
+        for run in runs:
+            run.send_signal(sig)
+
+    def stop(self):
+        self._stop_event.set()
+        with self._lock:
+            runs = list(self._runs)
+        for run in runs:
+            run.stop()
+
+
+class MultiRootBackend(SearchBackend):
+    """Fans a search out over several roots; see MultiRootRun"""
+
+    name = "roots"
+    label = "Several roots"
+
+    def __init__(self, roots, plan):
+        self.roots = roots
+        self.plan = plan  # options -> backends to try for one root
+
+    def start(self, options, null_delimited=True):
+        return MultiRootRun(options, self.roots, self.plan, null_delimited)
+
+
+_indexing_status = {}  # st_dev -> bool, Spotlight indexing state per volume
+
+
+def spotlight_indexing_enabled(directory):
+    """Whether Spotlight indexes the volume of a directory, according to mdutil -s.
+    Returns None when it cannot be determined. Results are cached per volume."""
+    path = normalize_directory(directory) or "/"
+    try:
+        device = os.stat(path).st_dev
+    except OSError:
+        return None
+    if device in _indexing_status:
+        return _indexing_status[device]
+    try:
+        completed = subprocess.run(["mdutil", "-s", path], capture_output=True, text=True, timeout=5, check=False)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    output = completed.stdout.lower()
+    if "indexing enabled" in output:
+        enabled = True
+    elif "indexing disabled" in output or "no index" in output:
+        enabled = False
+    else:
+        return None
+    _indexing_status[device] = enabled
+    return enabled
+
+
+BACKENDS = {backend.name: backend for backend in (MdfindBackend(), ScandirBackend())}
+
+
+def get_backend(name):
+    return BACKENDS.get(name)
+
+
+def plan_backends(mode, options, file_index=None, trigram_index=None):
+    """Backends to try for a search, in order; a later one runs only if the previous found nothing.
+
+    mode is a backend name or BACKEND_AUTO. In auto mode Spotlight is used unless it is
+    unavailable or indexing is disabled for the search directory, and the directory walk
+    is the fallback when Spotlight returns nothing for a search limited to a directory.
+    With a file_index, file name searches inside its roots are answered from the index,
+    substring lookups through trigram_index when one is loaded.
+    A directory field with several roots is searched by a MultiRootBackend that plans
+    each root this way.
+    """
+    roots = split_roots(options.directory)
+    if len(roots) > 1:
+        return [MultiRootBackend(roots, lambda root_options: plan_backends(
+            mode, root_options, file_index, trigram_index))]
+    if file_index is not None:
+        index = IndexBackend(file_index, trigram_index)
+        if mode in (BACKEND_AUTO, index.name) and index.supports(options):
+            return [index]
+    if mode != BACKEND_AUTO:
+        backend = BACKENDS.get(mode)
+        return [backend] if backend is not None else []
+    mdfind, scandir = BACKENDS["mdfind"], BACKENDS["scandir"]
+    if not scandir.supports(options):
+        return [mdfind]
+    if not mdfind.available():
+        return [scandir]
+    if options.directory:
+        if spotlight_indexing_enabled(options.directory) is False:
+            return [scandir]
+        return [mdfind, scandir]
+    return [mdfind]
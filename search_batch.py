@@ -0,0 +1,258 @@
+# Copyright 2025 Apple Dragon
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Batch searches: run a file of named queries and write one combined report.
+
+The queries run concurrently on a bounded pool, each through the same backends
+and stat pipeline as a tab. They share one stat cache, so a path found by several
+queries (a large archive that also changed recently) is stat-ed once.
+
+A query file is either JSON, a list of objects (or {"queries": [...]}) with a
+"name" and the options of a search:
+
+    [{"name": "Big archives", "bookmark": "archives", "min_size": "1GB"},
+     {"name": "Old logs", "query": "ext:log modified:>90d", "directory": "~/Library/Logs"},
+     {"name": "Huge files", "predicate": "kMDItemFSSize > 10000000000"}]
+
+or plain text with one "name = Spotlight predicate" per line, # for comments:
+
+    Large files = kMDItemFSSize >= 52428800
+    Recent 7 days = kMDItemFSContentChangeDate >= $time.today(-7)
+
+    python everything.py --batch audit.txt -d /Volumes/Backup -o report.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from app_config import read_config
+from query_language import parse_size
+from search_backends import BACKEND_AUTO, plan_backends
+from search_cli import SORT_COLUMNS, HeadlessSearch, build_options, open_file_index, row_record, sort_rows
+from search_engine import DEFAULT_STAT_WORKERS, ROOT_SEPARATOR, parse_extensions, stat_row
+
+DEFAULT_BATCH_JOBS = 4  # Queries running at the same time
+
+_SPEC_KEYS = {"name", "query", "predicate", "bookmark", "directory", "content", "match_case", "full_match",
+              "min_size", "max_size", "ext", "sort", "desc", "limit"}
+
+
+class BatchFileError(ValueError):
+    pass
+
+
+class SharedStats:
+    """stat_row results shared by the queries of a batch: every path is stat-ed once.
+
+    A query asking for a path that another query is stat-ing waits for that result
+    instead of calling stat again.
+    """
+
+    def __init__(self):
+        self._rows = {}  # path -> Future of its stat_row result
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.reused = 0
+
+    def stat(self, path, counts=None):
+        with self._lock:
+            future = self._rows.get(path)
+            owner = future is None
+            if owner:
+                future = self._rows[path] = Future()
+                self.calls += 1
+            else:
+                self.reused += 1
+            if counts is not None:
+                counts["stat_calls" if owner else "reused"] += 1
+        if owner:
+            future.set_result(stat_row(path))
+        return future.result()
+
+    def for_query(self, counts):
+        """stat function for the StatPipeline of one query, counting its own calls and reuses"""
+        return lambda path: self.stat(path, counts)
+
+    def snapshot(self):
+        with self._lock:
+            return {"unique_paths": len(self._rows), "stat_calls": self.calls, "reused": self.reused}
+
+
+def _parse_text(text):
+    specs = []
+    for number, line in enumerate(text.splitlines(), start=1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        name, sep, predicate = line.partition("=")
+        if not sep or not name.strip() or not predicate.strip():
+            raise BatchFileError(f"line {number}: expected 'name = Spotlight predicate'")
+        specs.append({"name": name.strip(), "predicate": predicate.strip()})
+    return specs
+
+
+def load_queries(path):
+    """Query specs (dicts) from a JSON or text query file. Raises BatchFileError."""
+    try:
+        with open(os.path.expanduser(path), "r", encoding="utf-8") as f:
+            text = f.read()
+    except OSError as e:
+        raise BatchFileError(f"cannot read {path}: {e}") from None
+    if not text.lstrip().startswith(("[", "{")):
+        specs = _parse_text(text)
+    else:
+        try:
+            data = json.loads(text)
+        except ValueError as e:
+            raise BatchFileError(f"{path}: {e}") from None
+        specs = data.get("queries") if isinstance(data, dict) else data
+        if not isinstance(specs, list) or not all(isinstance(spec, dict) for spec in specs):
+            raise BatchFileError(f"{path}: expected a list of query objects")
+    names = set()
+    for index, spec in enumerate(specs, start=1):
+        name = spec.get("name")
+        if not isinstance(name, str) or not name:
+            raise BatchFileError(f"query {index}: a name is required")
+        if name in names:
+            raise BatchFileError(f"query {index}: duplicate name {name!r}")
+        names.add(name)
+        unknown = set(spec) - _SPEC_KEYS
+        if unknown:
+            raise BatchFileError(f"query {name!r}: unknown keys {', '.join(sorted(unknown))}")
+        if spec.get("sort") not in (None, "relevance", *SORT_COLUMNS):
+            raise BatchFileError(f"query {name!r}: unknown sort {spec['sort']!r}")
+    if not specs:
+        raise BatchFileError(f"{path}: no queries")
+    return specs
+
+
+def _size(spec, key):
+    value = spec.get(key)
+    return parse_size(value) if isinstance(value, str) else value
+
+
+class BatchRunner:
+    """Runs the queries of a batch on a bounded pool and builds the combined report"""
+
+    def __init__(self, specs, default_directory="", jobs=DEFAULT_BATCH_JOBS, backend_mode=BACKEND_AUTO,
+                 file_index=None, stat_workers=DEFAULT_STAT_WORKERS, include_rows=True, open_history=None):
+        self.specs = specs
+        self.default_directory = default_directory
+        self.jobs = max(1, jobs)
+        self.backend_mode = backend_mode
+        self.file_index = file_index
+        self.stat_workers = stat_workers
+        self.include_rows = include_rows
+        self.open_history = open_history
+        self.shared = SharedStats()
+
+    def run_query(self, spec):
+        """Report entry of one query; errors are reported, not raised"""
+        entry = {"name": spec["name"]}
+        counts = {"stat_calls": 0, "reused": 0}
+        started = time.monotonic()
+        try:
+            directory = spec.get("directory", self.default_directory)
+            directories = [directory] if isinstance(directory, str) else directory
+            options = build_options(
+                spec.get("query", ""), directories, bool(spec.get("content")), bool(spec.get("match_case")),
+                bool(spec.get("full_match")), spec.get("bookmark"), spec.get("predicate")
+            )
+            entry["spotlight_query"] = options.spotlight_query()
+            entry["directory"] = options.directory
+            backends = plan_backends(self.backend_mode, options, self.file_index)
+            if not any(backend.supports(options) for backend in backends):
+                raise ValueError(f"the {self.backend_mode} backend cannot run this search")
+            search = HeadlessSearch(
+                options, backends, None, stat_workers=self.stat_workers,
+                min_size=_size(spec, "min_size"), max_size=_size(spec, "max_size"),
+                extensions=parse_extensions(spec.get("ext", "")), collect=True, stat=self.shared.for_query(counts)
+            )
+            search.run()
+            limit = spec.get("limit")
+            if spec.get("sort"):
+                rows = sort_rows(search.rows, spec["sort"], bool(spec.get("desc")), limit, options,
+                                 self.open_history)
+            else:
+                rows = search.rows[:limit]
+            entry["backend"] = search.progress.backend
+            entry["count"] = len(rows)
+            entry["total_size"] = sum(row[1] or 0 for row in rows)
+            entry["phases"] = search.progress.snapshot()["phases"]
+            if self.include_rows:
+                entry["rows"] = [row_record(row, search.hits) for row in rows]
+        except Exception as e:
+            entry["error"] = str(e)
+        entry["seconds"] = time.monotonic() - started
+        entry.update(counts)
+        return entry
+
+    def run(self):
+        """The combined report, with the queries in file order"""
+        started_at, started = time.time(), time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.jobs, thread_name_prefix="batch") as executor:
+            entries = list(executor.map(self.run_query, self.specs))
+        return {
+            "started": started_at,
+            "seconds": time.monotonic() - started,
+            "jobs": self.jobs,
+            "backend": self.backend_mode,
+            "queries": entries,
+            "errors": sum(1 for entry in entries if "error" in entry),
+            "stat": self.shared.snapshot(),
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="everything.py --batch",
+                                     description="Run a file of named searches and write one combined report.")
+    parser.add_argument("queries", help="query file: JSON, or 'name = Spotlight predicate' lines")
+    parser.add_argument("-o", "--output", metavar="FILE", help="write the JSON report here instead of stdout")
+    parser.add_argument("-d", "--dir", action="append", default=[], metavar="DIR",
+                        help="directory for queries that do not name one; repeat for several roots")
+    parser.add_argument("-j", "--jobs", type=int, default=DEFAULT_BATCH_JOBS, help="queries to run at the same time")
+    parser.add_argument("--summary", action="store_true", help="leave the result rows out of the report")
+    parser.add_argument("--backend", help="search backend: auto, mdfind, scandir or index (default: as in the app)")
+    args = parser.parse_args(argv)
+
+    try:
+        specs = load_queries(args.queries)
+    except BatchFileError as e:
+        parser.error(str(e))
+    config = read_config()
+    runner = BatchRunner(
+        specs, ROOT_SEPARATOR.join(args.dir), args.jobs, args.backend or config.get("search_backend", BACKEND_AUTO),
+        open_file_index(config), config.get("stat_workers", DEFAULT_STAT_WORKERS), not args.summary,
+        config.get("open_history")
+    )
+    report = runner.run()
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8", errors="surrogateescape") as f:
+            f.write(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
+    for entry in report["queries"]:
+        status = entry["error"] if "error" in entry else f"{entry['count']} files"
+        print(f"{entry['name']}: {status} in {entry['seconds']:.2f}s", file=sys.stderr)
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,328 @@
+# Copyright 2025 Apple Dragon
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Headless search from the command line, without Qt.
+
+Runs the same search as a tab of the app: the query is built from the same
+options (file name or content, case, full match, directories, inline filters or
+a bookmark) and answered by the same backends, then stat-ed and filtered by size
+and extension. Results are streamed to stdout as JSON lines, or as NUL-separated
+paths for xargs -0, as soon as they are found; sorting waits for all of them.
+
+    python everything.py --cli report -d ~/Documents --ext pdf --sort size --desc
+    python search_cli.py --bookmark large_files -d /Volumes/Backup -0 | xargs -0 ls -l
+
+Exits with 0 when something was found, 1 when nothing was and 2 on errors.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from app_config import read_config
+from query_language import QuerySyntaxError, parse_size
+from search_backends import BACKEND_AUTO, SearchOptions, plan_backends
+from search_engine import (
+    BOOKMARK_QUERIES, DEFAULT_STAT_WORKERS, ROOT_SEPARATOR, SearchProgress, StatPipeline, StatThroughput,
+    filter_by_size_and_extension, parse_extensions, row_sort_key, stat_row
+)
+
+POLL_INTERVAL = 0.05  # Seconds between flushes of streamed results
+SORT_COLUMNS = {"name": 0, "size": 1, "date": 2, "path": 3}
+EXIT_FOUND, EXIT_NOT_FOUND, EXIT_ERROR = 0, 1, 2
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="everything.py --cli",
+        description="Search files like the app does and print the results.",
+        epilog="The query accepts the inline filters of the search box, e.g. 'ext:pdf size:>10MB modified:<7d'."
+    )
+    parser.add_argument("query", nargs="?", default="", help="file name (or content) to search for")
+    parser.add_argument("-d", "--dir", action="append", default=[], metavar="DIR",
+                        help=f"limit the search to DIR; repeat or separate with '{ROOT_SEPARATOR}' for several roots")
+    parser.add_argument("--content", action="store_true", help="search file contents instead of file names")
+    parser.add_argument("-c", "--match-case", action="store_true", help="case-sensitive match")
+    parser.add_argument("-x", "--full-match", action="store_true", help="match the whole name instead of a part")
+    parser.add_argument("-b", "--bookmark", choices=sorted(BOOKMARK_QUERIES),
+                        help="run a bookmark search; the query is ignored")
+    parser.add_argument("--min-size", metavar="SIZE", help="minimum size, in bytes or with a unit like 10MB")
+    parser.add_argument("--max-size", metavar="SIZE", help="maximum size, in bytes or with a unit like 1GB")
+    parser.add_argument("-e", "--ext", default="", metavar="EXTS", help="extensions to keep, e.g. 'pdf;docx'")
+    parser.add_argument("-s", "--sort", choices=sorted(SORT_COLUMNS) + ["relevance"],
+                        help="sort the results (waits for the search to finish)")
+    parser.add_argument("-r", "--desc", action="store_true", help="sort in descending order")
+    parser.add_argument("-n", "--limit", type=int, metavar="N", help="stop after N results")
+    parser.add_argument("-0", "--null", action="store_true",
+                        help="print NUL-separated paths instead of JSON lines")
+    parser.add_argument("--backend", help="search backend: auto, mdfind, scandir or index (default: as in the app)")
+    parser.add_argument("--stat-workers", type=int, metavar="N", help="threads for stat calls (default: as in the app)")
+    parser.add_argument("--progress", action="store_true",
+                        help="print the search progress and phase timings to stderr when done")
+    return parser
+
+
+def row_record(row, hits=None):
+    """JSON object of a result row; content hits add the offset and number of the matching line"""
+    name, size, mtime, path = row
+    record = {"name": name, "size": size, "mtime": mtime, "path": path}
+    if hits is not None and path in hits:
+        record["line_offset"], record["line"] = hits[path]
+    return record
+
+
+class ResultWriter:
+    """Writes result rows to a binary stream as JSON lines or NUL-separated paths"""
+
+    def __init__(self, stream, null_delimited=False, hits=None):
+        self.stream = stream
+        self.null_delimited = null_delimited
+        self.hits = hits  # Content search: path -> (line offset, line number) of the first match
+        self.count = 0
+
+    def write(self, rows):
+        if not rows:
+            return
+        if self.null_delimited:
+            data = b"".join(os.fsencode(row[3]) + b"\0" for row in rows)
+        else:
+            lines = [json.dumps(row_record(row, self.hits), ensure_ascii=False) for row in rows]
+            data = ("\n".join(lines) + "\n").encode("utf-8", "surrogateescape")
+        self.stream.write(data)
+        self.stream.flush()
+        self.count += len(rows)
+
+
+def _size_argument(parser, text):
+    if text is None:
+        return None
+    try:
+        return parse_size(text)
+    except QuerySyntaxError as e:
+        parser.error(str(e))
+
+
+def build_options(query="", directories=(), content=False, match_case=False, full_match=False, bookmark=None,
+                  clause=None):
+    """SearchOptions the way a tab builds them. A bookmark, or a raw Spotlight predicate
+    in clause, is searched on its own like a bookmark tab. Raises ValueError
+    (QuerySyntaxError for inline filters) when the search is invalid or there is
+    nothing to search for."""
+    directory = ROOT_SEPARATOR.join(directories)
+    if bookmark:
+        if bookmark not in BOOKMARK_QUERIES:
+            raise ValueError(f"unknown bookmark: {bookmark}")
+        clause, _title = BOOKMARK_QUERIES[bookmark]
+    if clause:
+        options = SearchOptions.from_text("", directory, True, match_case, full_match,
+                                          extra_clause=clause, is_bookmark=True)
+    else:
+        options = SearchOptions.from_text(query, directory, not content, match_case, full_match)
+    if options.spotlight_query() is None:
+        raise ValueError("nothing to search for: give a query, inline filters or a bookmark")
+    return options
+
+
+def open_file_index(config):
+    """The app's file index, when it is enabled, so name searches inside its roots use it"""
+    if not config.get("file_index_enabled", False):
+        return None
+    from file_index import DEFAULT_INDEX_PATH, FileIndex
+    if not os.path.isfile(DEFAULT_INDEX_PATH):
+        return None
+    try:
+        return FileIndex()
+    except Exception:
+        return None
+
+
+def sort_rows(rows, sort, descending=False, limit=None, options=None, open_history=None):
+    """The first limit rows (all without one) in a SORT_COLUMNS order or by relevance to options.
+    Descending relevance is worst first, so with a limit it gives the worst rows."""
+    if sort == "relevance":
+        from ranking import FrecencyStore, IncrementalRanking, Ranker
+        query = "" if options is None or options.is_bookmark else options.query
+        match_case = options is not None and options.match_case
+        # Only the best limit rows need ranking in order, unless the worst ones are asked for
+        top_n = limit if limit and not descending else len(rows)
+        ranking = IncrementalRanking(Ranker(query, match_case, FrecencyStore(open_history)), top_n)
+        ranking.add(rows)
+        ranked = ranking.sorted_keys()
+        return (ranked[::-1] if descending else ranked)[:limit]
+    return sorted(rows, key=row_sort_key(SORT_COLUMNS[sort]), reverse=descending)[:limit]
+
+
+class HeadlessSearch:
+    """One search without Qt: tries the planned backends, stats their paths and writes the rows.
+
+    Rows that pass the size and extension filter go to the writer as they come, or
+    into rows when they are collected for sorting. With keep_fetched, every row the
+    backend found is also kept in fetched, unfiltered, for a result cache; complete
+    tells whether that is the whole result set. stat is passed on to StatPipeline.
+    """
+
+    def __init__(self, options, backends, writer, stat_workers=DEFAULT_STAT_WORKERS, stat_ordered=True,
+                 min_size=None, max_size=None, extensions=None, limit=None, collect=False, keep_fetched=False,
+                 stat=stat_row):
+        self.options = options
+        self.backends = backends
+        self.writer = writer
+        self.stat_workers = stat_workers
+        self.stat_ordered = stat_ordered
+        self.min_size = min_size
+        self.max_size = max_size
+        self.extensions = extensions
+        self.limit = limit
+        self.collect = collect  # Keep the rows for sorting instead of writing them as they come
+        self.stat = stat
+        self.rows = []
+        self.hits = None  # Content search: path -> (line offset, line number) of the first match
+        self.fetched = [] if keep_fetched else None
+        self.complete = False
+        self.found = 0
+        self._stopped = False
+        self.stat_counter = StatThroughput()
+        self.progress = SearchProgress()
+
+    def _keep(self, rows, row_filter):
+        if row_filter is not None:
+            rows = row_filter(rows)
+        if self.fetched is not None:
+            self.fetched.extend(rows)
+        if self.min_size is not None or self.max_size is not None or self.extensions:
+            rows = filter_by_size_and_extension(rows, self.min_size, self.max_size, self.extensions)
+        if self.limit is not None and not self.collect:
+            rows = rows[:self.limit - self.found]
+        return rows
+
+    def _deliver(self, rows):
+        self.found += len(rows)
+        self.progress.rows_found += len(rows)
+        if self.collect:
+            self.rows.extend(rows)
+            return
+        started = time.monotonic()
+        self.writer.write(rows)
+        self.progress.add_time("emit", time.monotonic() - started)
+
+    def _limit_reached(self):
+        return self.limit is not None and not self.collect and self.found >= self.limit
+
+    def stop(self):
+        """Cancel the search from another thread"""
+        self._stopped = True
+
+    def run(self):
+        """Try the planned backends in order until one finds something, like SearchWorker.run"""
+        pattern_stats = None
+        if self.options.filters is not None and self.options.filters.has_patterns():
+            from name_patterns import PatternStats
+            pattern_stats = PatternStats()
+        try:
+            for backend in self.backends:
+                if self._stopped:
+                    break
+                if not backend.supports(self.options):
+                    continue
+                self.progress.backend = backend.name
+                spawn_started = time.monotonic()
+                run = backend.start(self.options, null_delimited=True)
+                self.progress.spawned(time.monotonic() - spawn_started)
+                self.hits = run.hits
+                if self.writer is not None:
+                    self.writer.hits = run.hits
+                try:
+                    self._drain(run, self.options.row_filter(backend.filters_in_query, pattern_stats))
+                finally:
+                    run.stop()
+                if self.found or (pattern_stats is not None and pattern_stats.fetched) or self._limit_reached():
+                    break
+            self.complete = not self._stopped and not self._limit_reached()
+        finally:
+            self.progress.finish()
+        return self.found
+
+    def _drain(self, run, row_filter):
+        if run.rows is not None:
+            # Complete rows (file index): nothing to stat
+            rows = self._keep(list(run.rows), row_filter)
+            self.progress.paths_read += len(rows)
+            self._deliver(rows)
+            return
+        pipeline = StatPipeline(run.paths, workers=self.stat_workers, ordered=self.stat_ordered,
+                                counter=self.stat_counter, stat=run.stat_with(self.stat)).start()
+        try:
+            finished = False
+            while not finished and not self._stopped and not self._limit_reached():
+                rows, finished = pipeline.poll(POLL_INTERVAL)
+                self._deliver(self._keep(rows, row_filter))
+        finally:
+            pipeline.stop()
+            self.progress.track_pipeline(pipeline, self.stat_counter)
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    min_size = _size_argument(parser, args.min_size)
+    max_size = _size_argument(parser, args.max_size)
+    if args.limit is not None and args.limit < 1:
+        parser.error("--limit must be at least 1")
+
+    config = read_config()
+    try:
+        options = build_options(args.query, args.dir, args.content, args.match_case, args.full_match, args.bookmark)
+    except ValueError as e:
+        parser.error(str(e))
+
+    mode = args.backend or config.get("search_backend", BACKEND_AUTO)
+    file_index = open_file_index(config)
+    backends = plan_backends(mode, options, file_index)
+    if not backends:
+        parser.error(f"unknown search backend: {mode}")
+    if not any(backend.supports(options) for backend in backends):
+        parser.error(f"the {mode} backend cannot run this search")
+
+    sort = args.sort
+    writer = ResultWriter(sys.stdout.buffer, args.null)
+    search = HeadlessSearch(
+        options, backends, writer,
+        stat_workers=args.stat_workers or config.get("stat_workers", DEFAULT_STAT_WORKERS),
+        stat_ordered=config.get("stat_ordered", True),
+        min_size=min_size, max_size=max_size, extensions=parse_extensions(args.ext),
+        limit=args.limit, collect=sort is not None
+    )
+    try:
+        search.run()
+        if sort is not None:
+            writer.write(sort_rows(search.rows, sort, args.desc, args.limit, options, config.get("open_history")))
+    except BrokenPipeError:
+        # The reader went away (e.g. piped into head); stop quietly
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return EXIT_FOUND if writer.count else EXIT_NOT_FOUND
+    except KeyboardInterrupt:
+        return 130
+    except Exception as e:
+        print(f"search failed: {e}", file=sys.stderr)
+        return EXIT_ERROR
+    if args.progress:
+        print(json.dumps(search.progress.snapshot()), file=sys.stderr)
+    return EXIT_FOUND if writer.count else EXIT_NOT_FOUND
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,768 @@
+# Copyright 2025 Apple Dragon
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Search engine building blocks that do not depend on Qt."""
+
+import io
+import os
+import stat
+import subprocess
+import sys
+import queue
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# mdfind executable; can be pointed at a stand-in script for tests and benchmarks
+MDFIND_COMMAND = os.environ.get("EVERYTHING_MDFIND", "mdfind")
+READ_BLOCK_SIZE = 1 << 16  # Bytes per read in null-delimited mode
+DEFAULT_STAT_WORKERS = 8
+MAX_STAT_WORKERS = 64
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+DEFAULT_CACHE_TTL = 300  # Seconds before a cached result is stale
+ROOT_SEPARATOR = ";"  # Separates the roots of a multi-root search in the directory field
+
+# Bookmark searches: key -> (Spotlight predicate, tab title)
+BOOKMARK_QUERIES = {
+    'large_files': ('kMDItemFSSize >= 52428800', 'Large Files'),
+    'videos': ('kMDItemContentTypeTree = "public.movie"', 'Video Files'),
+    'audio': ('kMDItemContentTypeTree = "public.audio"', 'Audio Files'),
+    'images': ('kMDItemContentTypeTree = "public.image"', 'Images'),
+    'archives': ('kMDItemContentTypeTree = "public.archive"', 'Archives'),
+    'applications': ('kMDItemContentType == "com.apple.application-bundle"', 'Applications'),
+    'recent_24h': ('kMDItemFSContentChangeDate >= $time.today(-1)', 'Recent 24h'),
+    'recent_7d': ('kMDItemFSContentChangeDate >= $time.today(-7)', 'Recent 7 Days'),
+    'recent_30d': ('kMDItemFSContentChangeDate >= $time.today(-30)', 'Recent 30 Days'),
+}
+
+
+def build_mdfind_query(query, search_by_file_name, match_case, full_match, extra_clause=None, is_bookmark=False):
+    """Build the Spotlight query string for the search options of a tab.
+    Returns None when there is nothing to search for."""
+    # If it's a bookmark search, use only the extra clause
+    if is_bookmark and extra_clause is not None:
+        return extra_clause
+
+    full_match_str = "" if full_match else "*"
+    case_modifier = "" if match_case else "cd"
+    if query == "" and extra_clause is not None:
+        # Nothing to match the name or content against: the clause alone selects the files
+        return extra_clause
+    if search_by_file_name:
+        query_str = f'kMDItemFSName == "{full_match_str}{query}{full_match_str}"{case_modifier}'
+    elif query != "":
+        query_str = f'kMDItemTextContent == "{full_match_str}{query}{full_match_str}"{case_modifier}'
+    else:
+        return extra_clause
+    if extra_clause is not None:
+        query_str += f" && {extra_clause}"
+    return query_str
+
+
+def build_mdfind_command(query_str, directory="", null_delimited=True, live=False):
+    """mdfind command line for a query string, optionally limited to a directory"""
+    cmd = [MDFIND_COMMAND]
+    if live:
+        cmd.append("-live")
+    if null_delimited:
+        cmd.append("-0")
+    cmd.append(query_str)
+    for root in split_roots(directory):
+        cmd.extend(["-onlyin", os.path.expanduser(root)])
+    return cmd
+
+
+def stat_row(path):
+    """Stat a path and return a (name, size, mtime, path) result row.
+    Returns None if the file was deleted or is inaccessible."""
+    try:
+        stat_result = os.stat(path)
+    except (OSError, ValueError):
+        return None
+    return row_from_stat(path, stat_result)
+
+
+def row_from_stat(path, stat_result):
+    """Result row of a path from an os.stat() result it already has"""
+    is_dir = stat.S_ISDIR(stat_result.st_mode)
+    size_ = 0 if is_dir else stat_result.st_size
+    return (os.path.basename(path), size_, stat_result.st_mtime, path)
+
+
+def deferred_row(path):
+    """Result row whose size and mtime are not known yet (deferred metadata mode)"""
+    return (os.path.basename(path), None, None, path)
+
+
+def has_metadata(row):
+    return row[1] is not None
+
+
+def parse_extensions(text):
+    """Extensions of an extension filter like "pdf; .docx", lowercased with a leading dot"""
+    exts = []
+    for part in (text or "").split(";"):
+        part = part.strip()
+        if part and not part.startswith("."):
+            part = "." + part
+        if part:
+            exts.append(part.lower())
+    return exts
+
+
+def filter_by_size_and_extension(rows, min_size=None, max_size=None, extensions=None):
+    """Rows within a size range (bytes) and ending in one of the extensions.
+    Rows with unknown size (deferred metadata) pass until their size has been read."""
+    filtered = list(rows)
+    if min_size is not None:
+        filtered = [item for item in filtered if item[1] is None or item[1] >= min_size]
+    if max_size is not None:
+        filtered = [item for item in filtered if item[1] is None or item[1] <= max_size]
+    if extensions:
+        exts = tuple(extensions)
+        filtered = [item for item in filtered if item[0].lower().endswith(exts)]
+    return filtered
+
+
+def row_sort_key(column):
+    """Sort key for a result column (0 name, 1 size, 2 date, 3 path); rows with unknown metadata sort first"""
+    def get_sort_key(item):
+        if column == 0:
+            return item[0].lower()
+        elif column == 1:
+            return float(item[1]) if item[1] is not None else -1.0
+        elif column == 2:
+            return float(item[2]) if item[2] is not None else -1.0
+        else:
+            return item[3].lower()
+    return get_sort_key
+
+
+def stat_rows(paths, workers=DEFAULT_STAT_WORKERS):
+    """Stat paths on a thread pool and yield (path, row) pairs in input order.
+    row is None for paths that no longer exist."""
+    workers = max(1, min(int(workers), MAX_STAT_WORKERS))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="stat") as executor:
+        yield from zip(paths, executor.map(stat_row, paths))
+
+
+class StatThroughput:
+    """Thread-safe counter for stat calls and their rate"""
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self._lock = threading.Lock()
+        self.started = clock()
+        self.count = 0
+        self.failures = 0
+
+    def add(self, done, failed=0):
+        with self._lock:
+            self.count += done
+            self.failures += failed
+
+    def elapsed(self):
+        return self.clock() - self.started
+
+    def rate(self):
+        """Stat calls per second since the counter was created"""
+        elapsed = self.elapsed()
+        return self.count / elapsed if elapsed > 0 else 0.0
+
+
+SEARCH_PHASES = ("spawn", "first_byte", "drain", "stat", "emit", "render")
+
+
+class SearchProgress:
+    """Structured progress of one search: counts, throughput and time per phase.
+
+    spawn is the time to start the backend, first_byte the wait for its first path,
+    drain the time from the first to the last path, and stat the time from the first
+    path until the last row was stat-ed, so stat overlaps drain. emit and render
+    add up the time spent sending rows to the UI and showing them. A phase that is
+    still running counts up to now. Counters are written by the search thread and
+    render by the UI thread; snapshot() returns a consistent plain dict. clock must
+    be the one the StatPipeline uses.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.started = clock()
+        self.backend = ""
+        self.paths_read = 0
+        self.stat_done = 0
+        self.failures = 0
+        self.rows_found = 0
+        self.finished = None
+        self._lock = threading.Lock()
+        self._phases = dict.fromkeys(SEARCH_PHASES, 0.0)
+        self._spawn_end = None
+
+    def add_time(self, phase, seconds):
+        with self._lock:
+            self._phases[phase] += seconds
+
+    def spawned(self, seconds):
+        """The backend took seconds to start"""
+        with self._lock:
+            self._phases["spawn"] += seconds
+            self._spawn_end = self.clock()
+
+    def track_pipeline(self, pipeline, counter):
+        """Copy counts and phase times from a running or finished StatPipeline"""
+        now = self.clock()
+        with self._lock:
+            self.paths_read = pipeline.paths_read
+            self.stat_done = counter.count
+            self.failures = counter.failures
+            if self._spawn_end is None:
+                return
+            first = pipeline.first_path_at
+            if first is None:
+                end = pipeline.read_done_at or now  # Backend finished without output
+                self._phases["first_byte"] = end - self._spawn_end
+                return
+            self._phases["first_byte"] = first - self._spawn_end
+            self._phases["drain"] = (pipeline.read_done_at or now) - first
+            self._phases["stat"] = (pipeline.finished_at or now) - first
+
+    def finish(self):
+        self.finished = self.clock()
+
+    def elapsed(self):
+        return (self.finished or self.clock()) - self.started
+
+    def rows_per_second(self):
+        """Result rows found per second of the whole search"""
+        elapsed = self.elapsed()
+        return self.rows_found / elapsed if elapsed > 0 else 0.0
+
+    def snapshot(self):
+        """Plain dict of every counter and phase time, safe to pass between threads"""
+        with self._lock:
+            phases = dict(self._phases)
+        return {
+            "backend": self.backend,
+            "paths_read": self.paths_read,
+            "stat_done": self.stat_done,
+            "failures": self.failures,
+            "rows_found": self.rows_found,
+            "rows_per_second": self.rows_per_second(),
+            "elapsed": self.elapsed(),
+            "finished": self.finished is not None,
+            "phases": phases,
+        }
+
+
+_DONE = object()
+SKIP_ROW = object()  # Returned by a stat function for a path to drop, e.g. a duplicate
+
+
+class StatPipeline:
+    """Pipelined stat stage.
+
+    A reader thread pulls paths from an iterable (usually the mdfind output),
+    a bounded thread pool stats them concurrently, and the consumer collects the
+    rows with poll(), either in input order or in completion order.
+    With deferred=True paths are passed through as rows without metadata.
+    stat replaces stat_row, e.g. to share results between searches, and clock
+    time.monotonic, e.g. in tests. A stat that returns SKIP_ROW drops the path
+    without counting it as a failure.
+    """
+
+    def __init__(self, paths, workers=DEFAULT_STAT_WORKERS, ordered=True, counter=None, deferred=False, stat=stat_row,
+                 clock=time.monotonic):
+        self.paths = paths
+        self.stat = stat
+        self.clock = clock
+        self.workers = max(1, min(int(workers), MAX_STAT_WORKERS))
+        self.ordered = ordered
+        self.deferred = deferred
+        self.counter = counter if counter is not None else StatThroughput()
+        self.paths_read = 0
+        # clock() of the first path, the end of the input and the last stat, for SearchProgress
+        self.first_path_at = None
+        self.read_done_at = None
+        self.finished_at = None
+        self._out = queue.Queue()
+        # Bound the number of paths in flight so a fast producer cannot queue up
+        # the whole result set ahead of the pool.
+        self._slots = threading.BoundedSemaphore(self.workers * 4)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="stat")
+        self._stopped = False
+        self._finished = False
+        self._reader = threading.Thread(target=self._read, name="stat-reader", daemon=True)
+
+    def start(self):
+        self._reader.start()
+        return self
+
+    def stop(self):
+        self._stopped = True
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _release(self, _future):
+        self._slots.release()
+
+    def _read(self):
+        try:
+            for path in self.paths:
+                if self._stopped:
+                    break
+                if not path:
+                    continue
+                if self.first_path_at is None:
+                    self.first_path_at = self.clock()
+                self.paths_read += 1
+                if self.deferred:
+                    self._out.put(deferred_row(path))
+                    continue
+                self._slots.acquire()
+                if self._stopped:
+                    self._slots.release()
+                    break
+                try:
+                    future = self._executor.submit(self.stat, path)
+                except RuntimeError:
+                    # Executor was shut down by stop()
+                    self._slots.release()
+                    break
+                future.add_done_callback(self._release)
+                if self.ordered:
+                    self._out.put(future)
+                else:
+                    future.add_done_callback(self._out.put)
+        except Exception as exc:
+            self._out.put(exc)
+        finally:
+            self.read_done_at = self.clock()
+            # Wait for outstanding stats so the end marker comes after every row
+            self._executor.shutdown(wait=True)
+            self.finished_at = self.clock()
+            self._out.put(_DONE)
+
+    def poll(self, timeout, max_rows=None):
+        """Collect the rows that are ready, waiting up to timeout for the first one.
+        Returns (rows, finished). Reader errors are re-raised here."""
+        rows = []
+        if self._finished:
+            return rows, True
+        try:
+            item = self._out.get(timeout=timeout)
+        except queue.Empty:
+            return rows, False
+        while True:
+            if item is _DONE:
+                self._finished = True
+                return rows, True
+            if isinstance(item, Exception):
+                raise item
+            if isinstance(item, tuple):
+                # Deferred row, nothing was stat-ed
+                rows.append(item)
+            else:
+                try:
+                    row = item.result()
+                except Exception:
+                    # Cancelled by stop()
+                    row = None
+                if row is SKIP_ROW:
+                    pass
+                elif row is not None:
+                    rows.append(row)
+                    self.counter.add(1)
+                else:
+                    self.counter.add(1, failed=1)
+            if max_rows is not None and len(rows) >= max_rows:
+                return rows, False
+            try:
+                item = self._out.get_nowait()
+            except queue.Empty:
+                return rows, False
+
+
+def iter_output_lines(stream):
+    """Yield stripped, non-empty lines from a text stream (one path per line)"""
+    for line in stream:
+        path = line.strip()
+        if path:
+            yield path
+
+
+def iter_null_delimited(stream, block_size=READ_BLOCK_SIZE):
+    """Yield paths from a binary stream of NUL-separated paths (mdfind -0).
+    Reads large blocks and decodes everything up to the last NUL of a block in
+    one call, with the same encoding and error handler as os.fsdecode.
+    Unlike line mode this keeps paths that contain newlines intact."""
+    read = getattr(stream, "read1", stream.read)
+    encoding = sys.getfilesystemencoding()
+    errors = sys.getfilesystemencodeerrors()
+    tail = b""
+    while True:
+        block = read(block_size)
+        if not block:
+            break
+        buffer = tail + block if tail else block
+        cut = buffer.rfind(b"\0")
+        if cut < 0:
+            tail = buffer
+            continue
+        tail = buffer[cut + 1:]
+        yield from filter(None, buffer[:cut].decode(encoding, errors).split("\0"))
+    if tail:
+        yield os.fsdecode(tail)
+
+
+def normalize_directory(directory):
+    roots = split_roots(directory)
+    if len(roots) > 1:
+        return ROOT_SEPARATOR.join(os.path.normpath(os.path.expanduser(root)) for root in roots)
+    return os.path.normpath(os.path.expanduser(roots[0])) if roots else ""
+
+
+def split_roots(directory):
+    """Search roots of a directory field: ";"-separated, blanks and repeats dropped"""
+    roots = []
+    for root in (directory or "").split(ROOT_SEPARATOR):
+        root = root.strip()
+        if root and root not in roots:
+            roots.append(root)
+    return roots
+
+
+def result_cache_key(query_str, directory, deferred=False):
+    """Cache key for a search: normalized query string, directory and metadata mode"""
+    return (" ".join(query_str.split()), normalize_directory(directory), bool(deferred))
+
+
+# Rough per-row cost of a (name, size, mtime, path) tuple besides the two strings
+_ROW_OVERHEAD = (sys.getsizeof((0, 0, 0, 0)) + sys.getsizeof(0.0) + sys.getsizeof(1 << 40)
+                 + 2 * sys.getsizeof("") + 8)
+
+
+def estimate_rows_size(rows):
+    """Approximate memory used by a list of result rows, in bytes"""
+    return sys.getsizeof(rows) + sum(len(row[0]) + len(row[3]) for row in rows) + len(rows) * _ROW_OVERHEAD
+
+
+class ResultCache:
+    """In-process cache of search results.
+
+    Entries are evicted least-recently-used first once the estimated size of all
+    cached rows exceeds max_bytes. An entry older than ttl seconds is stale: it is
+    dropped on lookup, or returned flagged as stale when stale_while_revalidate is
+    on so the caller can show it while a fresh search runs.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES, ttl=DEFAULT_CACHE_TTL, stale_while_revalidate=True):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self._entries = OrderedDict()  # key -> (rows, hits, size, stored_at)
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Return (rows, is_stale, hits) for a key, or None on a miss. hits is the
+        path -> (line offset, line number) map of a content search, else None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            rows, hits, size, stored_at = entry
+            stale = time.monotonic() - stored_at > self.ttl
+            if stale and not self.stale_while_revalidate:
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            if stale:
+                self.stale_hits += 1
+            else:
+                self.hits += 1
+            return rows, stale, hits
+
+    def put(self, key, rows, hits=None):
+        size = estimate_rows_size(rows) + (sys.getsizeof(hits) if hits else 0)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (rows, hits, size, time.monotonic())
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def _remove(self, key):
+        _rows, _hits, size, _stored_at = self._entries.pop(key)
+        self.total_bytes -= size
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# Characters with a special meaning inside a Spotlight string; such queries are not refined locally
+_SPOTLIGHT_SPECIAL_CHARS = frozenset('*?\\"')
+
+
+def fold_name(text, match_case):
+    """Normalize a name the way Spotlight compares it: exact unless match_case is off,
+    in which case comparison ignores case and diacritics (the "cd" modifier)."""
+    if match_case:
+        return unicodedata.normalize("NFC", text)
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize("NFD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def is_query_refinement(old_query, new_query, match_case):
+    """Whether every name matching the substring query new_query also matches old_query,
+    so results of old_query can be filtered locally instead of running mdfind again."""
+    if not old_query or new_query == old_query:
+        return False
+    if _SPOTLIGHT_SPECIAL_CHARS.intersection(old_query + new_query):
+        return False
+    return fold_name(old_query, match_case) in fold_name(new_query, match_case)
+
+
+def refine_rows(rows, query, match_case):
+    """Rows whose name contains query, compared like a kMDItemFSName "*query*" search"""
+    needle = fold_name(query, match_case)
+    return [row for row in rows if needle in fold_name(row[0], match_case)]
+
+
+def run_mdfind_snapshot(query_str, directory=""):
+    """Run mdfind once to completion and return the set of paths it printed"""
+    completed = subprocess.run(
+        build_mdfind_command(query_str, directory, null_delimited=True),
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=False
+    )
+    return set(iter_null_delimited(io.BytesIO(completed.stdout)))
+
+
+def run_mdls(path, timeout=10):
+    """Spotlight metadata of a file as printed by mdls ("" if there is none).
+    Raises FileNotFoundError where mdls does not exist and subprocess.TimeoutExpired."""
+    result = subprocess.run(["mdls", path], capture_output=True, text=True, timeout=timeout)
+    return result.stdout.strip() if result.stdout else ""
+
+
+def _mdls_value(text):
+    text = text.strip().rstrip(",")
+    if text == "(null)":
+        return None
+    if len(text) >= 2 and text[0] == text[-1] == '"':
+        return text[1:-1]
+    return text
+
+
+def parse_mdls_output(text):
+    """mdls output as {attribute: value}: quotes removed, lists as lists, (null) as None"""
+    metadata = {}
+    lines = iter(text.splitlines())
+    for line in lines:
+        name, sep, value = line.partition("=")
+        if not sep:
+            continue
+        name, value = name.strip(), value.strip()
+        if value == "(":
+            items = []
+            for item in lines:
+                if item.strip() == ")":
+                    break
+                items.append(_mdls_value(item))
+            metadata[name] = items
+        else:
+            metadata[name] = _mdls_value(value)
+    return metadata
+
+
+LIVE_UPDATE_PREFIX = "Query update:"
+
+
+def parse_live_line(line):
+    """Classify one line of mdfind -live output.
+    Returns ("path", path), ("update", match_count) or ("notice", text) for banners
+    such as "[Type ctrl-C to exit]"."""
+    text = line.rstrip("\r\n")
+    if text.startswith(LIVE_UPDATE_PREFIX):
+        count = text[len(LIVE_UPDATE_PREFIX):].split()
+        try:
+            return ("update", int(count[0]))
+        except (IndexError, ValueError):
+            return ("update", None)
+    if text.startswith("/"):
+        return ("path", text)
+    return ("notice", text.strip())
+
+
+class LiveResultTracker:
+    """Turns mdfind -live output into add/remove diffs against the paths a tab already shows.
+
+    mdfind -live first prints the current result set, then a notice line, and after that
+    reports changes. Paths printed after the initial listing are additions; a
+    "Query update" line only says the match count changed, so the next diff is computed
+    against a fresh snapshot of the query. Feed lines with feed() and collect the
+    coalesced changes with take_diff().
+    """
+
+    def __init__(self, known_paths):
+        self.known = set(known_paths)
+        self.initial = True
+        self._initial_paths = set()
+        self._added = set()
+        self._needs_snapshot = False
+        self._initial_done = False
+        self.updates_seen = 0
+
+    def feed(self, line):
+        kind, value = parse_live_line(line)
+        if kind == "path":
+            if self.initial:
+                self._initial_paths.add(value)
+            elif value not in self.known:
+                self._added.add(value)
+        elif kind == "update":
+            self.updates_seen += 1
+            self._end_initial_listing()
+            self._needs_snapshot = True
+        elif value:
+            self._end_initial_listing()
+
+    def _end_initial_listing(self):
+        if self.initial:
+            self.initial = False
+            self._initial_done = True
+
+    def has_pending(self):
+        return self._initial_done or self._needs_snapshot or bool(self._added)
+
+    def take_diff(self, snapshot=None):
+        """Return (added_paths, removed_paths) since the last call.
+        snapshot is a callable returning the current path set, used after a count update."""
+        if self._needs_snapshot and snapshot is not None:
+            current = set(snapshot())
+        elif self._initial_done:
+            current = self._initial_paths | self._added
+        else:
+            current = self.known | self._added
+        added = current - self.known
+        removed = self.known - current
+        self.known = current
+        self._initial_paths = set()
+        self._added = set()
+        self._needs_snapshot = False
+        self._initial_done = False
+        return added, removed
+
+
+class LiveSearch:
+    """Runs mdfind -live for a query and yields its changes as coalesced diffs.
+
+    Lines are read on a separate thread. Once a change is seen, further changes within
+    coalesce_interval seconds are merged into it, so a burst of activity becomes a
+    single (added paths, removed paths) pair from diffs().
+    """
+
+    def __init__(self, query_str, directory, known_paths, coalesce_interval=1.0, clock=time.monotonic):
+        self.query_str = query_str
+        self.directory = directory
+        self.tracker = LiveResultTracker(known_paths)
+        self.coalesce_interval = coalesce_interval
+        self.clock = clock
+        self.process = None
+        self._is_running = True
+
+    def start(self):
+        """Spawn mdfind -live; raises OSError if it cannot be run"""
+        cmd = build_mdfind_command(self.query_str, self.directory, null_delimited=False, live=True)
+        self.process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+
+    def diffs(self):
+        """Yield (added, removed) path sets until mdfind exits or stop() is called"""
+        lines = queue.Queue()
+        reader = threading.Thread(target=self._read_lines, args=(lines,), daemon=True)
+        reader.start()
+
+        pending_since = None
+        while self._is_running:
+            try:
+                line = lines.get(timeout=self.coalesce_interval / 4)
+            except queue.Empty:
+                line = ""
+            if line is None:
+                break  # mdfind exited
+            if line:
+                self.tracker.feed(line)
+            if not self.tracker.has_pending():
+                continue
+            now = self.clock()
+            if pending_since is None:
+                pending_since = now
+            if now - pending_since < self.coalesce_interval:
+                continue
+            pending_since = None
+            added, removed = self.tracker.take_diff(
+                snapshot=lambda: run_mdfind_snapshot(self.query_str, self.directory)
+            )
+            if not self._is_running:
+                break
+            if added or removed:
+                yield added, removed
+
+    def _read_lines(self, lines):
+        try:
+            for line in self.process.stdout:
+                lines.put(line)
+        except (OSError, ValueError):
+            pass
+        lines.put(None)
+
+    def stop(self):
+        self._is_running = False
+        if self.process is not None:
+            try:
+                self.process.terminate()
+            except Exception:
+                pass
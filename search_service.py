@@ -0,0 +1,518 @@
+# Copyright 2025 Apple Dragon
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Local search service: the app's search engine over JSON-RPC, without Qt.
+
+Clients talk JSON-RPC 2.0 over a Unix socket (or TCP on localhost), one JSON
+message per line. Requests are pipelined: a client may send many without waiting,
+each runs on a shared worker pool as soon as it is read, and responses arrive in
+completion order, matched by id. A search with "stream": true first sends its rows
+in "search.rows" notifications, {"id": request id, "rows": [...]}, and then the
+response with the totals.
+
+Methods:
+    search    query, directory (a string or a list of roots), content, match_case,
+              full_match, bookmark, min_size, max_size, ext, sort, desc, limit,
+              stream, refresh (skip the cache)
+    cached    the same parameters; the rows of a cached result, or null. Never searches.
+    dirsize   path, depth (0: the size of path, 1: the sizes of its subdirectories)
+    metadata  paths, spotlight (add the mdls attributes)
+    stats     latency counters per method, and the result cache
+    ping
+
+All clients share one ResultCache, and concurrent identical searches run once.
+Searches go through the same backends as the app, so the service can be tried
+on Linux with EVERYTHING_MDFIND pointing at benchmarks/fake_mdfind.py.
+
+    python everything.py --serve --socket /tmp/everything.sock
+    printf '%s\\n' '{"jsonrpc": "2.0", "id": 1, "method": "search", "params": {"query": "report"}}' \\
+        | nc -U /tmp/everything.sock
+"""
+
+import argparse
+import json
+import os
+import signal
+import socket
+import socketserver
+import stat
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from app_config import read_config
+from disk_usage import directory_size, subdirectory_sizes
+from query_language import parse_size
+from search_backends import BACKEND_AUTO, plan_backends
+from search_cli import SORT_COLUMNS, HeadlessSearch, build_options, open_file_index, row_record, sort_rows
+from search_engine import (
+    DEFAULT_CACHE_BYTES, DEFAULT_CACHE_TTL, DEFAULT_STAT_WORKERS, ResultCache, filter_by_size_and_extension,
+    parse_extensions, parse_mdls_output, run_mdls
+)
+
+DEFAULT_SOCKET_PATH = os.path.expanduser("~/.everythingByMdfind.sock")
+DEFAULT_SERVICE_WORKERS = 8  # Requests handled at the same time, over all connections
+LATENCY_SAMPLES = 1024  # Recent latencies kept per method for percentiles
+MAX_METADATA_PATHS = 10000
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+
+
+class RpcError(Exception):
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+
+class LatencyCounters:
+    """Calls, errors and latency of one method; percentiles over the recent calls"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._recent = deque(maxlen=LATENCY_SAMPLES)
+
+    def add(self, seconds, failed=False):
+        with self._lock:
+            self.calls += 1
+            self.errors += failed
+            self.total += seconds
+            self.max = max(self.max, seconds)
+            self._recent.append(seconds)
+
+    def snapshot(self):
+        with self._lock:
+            recent = sorted(self._recent)
+            calls, errors, total, longest = self.calls, self.errors, self.total, self.max
+
+        def percentile(fraction):
+            return recent[min(len(recent) - 1, int(fraction * len(recent)))] if recent else 0.0
+
+        return {
+            "calls": calls,
+            "errors": errors,
+            "mean": total / calls if calls else 0.0,
+            "p50": percentile(0.5),
+            "p95": percentile(0.95),
+            "max": longest,
+        }
+
+
+def _param(params, name, kind, default=None):
+    value = params.get(name, default)
+    if value is not None and (not isinstance(value, kind) or isinstance(value, bool) and kind is int):
+        raise RpcError(INVALID_PARAMS, f"Invalid value for {name}: {value!r}")
+    return value
+
+
+def _size_param(params, name):
+    value = params.get(name)
+    if value is None or isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if not isinstance(value, str):
+        raise RpcError(INVALID_PARAMS, f"Invalid value for {name}: {value!r}")
+    try:
+        return parse_size(value)
+    except ValueError as e:
+        raise RpcError(INVALID_PARAMS, str(e)) from None
+
+
+class _SearchRequest:
+    """The checked parameters of a search or cached call"""
+
+    def __init__(self, options, backends, cache_key, params):
+        self.options = options
+        self.backends = backends
+        self.cache_key = cache_key
+        self.sort = _param(params, "sort", str)
+        if self.sort is not None and self.sort not in SORT_COLUMNS and self.sort != "relevance":
+            raise RpcError(INVALID_PARAMS, f"sort must be one of {', '.join(sorted(SORT_COLUMNS))} or relevance")
+        self.descending = bool(params.get("desc"))
+        self.limit = _param(params, "limit", int)
+        if self.limit is not None and self.limit < 1:
+            raise RpcError(INVALID_PARAMS, "limit must be at least 1")
+        self.min_size = _size_param(params, "min_size")
+        self.max_size = _size_param(params, "max_size")
+        self.extensions = parse_extensions(_param(params, "ext", str, ""))
+        self.stream = bool(params.get("stream"))
+        self.refresh = bool(params.get("refresh"))
+
+
+class StreamWriter:
+    """Sends result rows as search.rows notifications of one request"""
+
+    def __init__(self, notify, request_id):
+        self.notify = notify
+        self.request_id = request_id
+        self.hits = None
+        self.count = 0
+
+    def write(self, rows):
+        if rows:
+            self.notify("search.rows", {"id": self.request_id, "rows": [row_record(row, self.hits) for row in rows]})
+            self.count += len(rows)
+
+
+class CollectWriter:
+    """Keeps result rows for the response of a search that is not streamed"""
+
+    def __init__(self):
+        self.hits = None
+        self.records = []
+
+    def write(self, rows):
+        self.records.extend(row_record(row, self.hits) for row in rows)
+
+
+class SearchService:
+    """The methods of the service; transport independent, so it can also be called in-process"""
+
+    def __init__(self, config=None, cache=None, backend_mode=None, file_index=None, stream_batch_size=2000):
+        config = read_config() if config is None else config
+        self.config = config
+        self.backend_mode = backend_mode or config.get("search_backend", BACKEND_AUTO)
+        self.stat_workers = config.get("stat_workers", DEFAULT_STAT_WORKERS)
+        self.stat_ordered = config.get("stat_ordered", True)
+        self.file_index = file_index if file_index is not None else open_file_index(config)
+        self.cache = cache if cache is not None else ResultCache(
+            max_bytes=config.get("result_cache_mb", DEFAULT_CACHE_BYTES // (1024 * 1024)) * 1024 * 1024,
+            ttl=config.get("result_cache_ttl", DEFAULT_CACHE_TTL),
+            stale_while_revalidate=False
+        )
+        self.stream_batch_size = stream_batch_size
+        self.counters = {}
+        self._counters_lock = threading.Lock()
+        self._inflight = {}  # cache key -> Event set when the search that fills it is done
+        self._inflight_lock = threading.Lock()
+        self.methods = {
+            "search": self.search,
+            "cached": self.cached,
+            "dirsize": self.dirsize,
+            "metadata": self.metadata,
+            "stats": self.stats,
+            "ping": lambda params, notify, request_id: "pong",
+        }
+
+    def counter(self, method):
+        with self._counters_lock:
+            return self.counters.setdefault(method, LatencyCounters())
+
+    def call(self, method, params=None, notify=None, request_id=None):
+        """Run a method and record its latency. Raises RpcError."""
+        handler = self.methods.get(method)
+        if handler is None:
+            raise RpcError(METHOD_NOT_FOUND, f"Method not found: {method}")
+        if params is None:
+            params = {}
+        if not isinstance(params, dict):
+            raise RpcError(INVALID_PARAMS, "params must be an object")
+        started = time.monotonic()
+        failed = True
+        try:
+            result = handler(params, notify or (lambda method, params: None), request_id)
+            failed = False
+            return result
+        except RpcError:
+            raise
+        except Exception as e:
+            raise RpcError(SERVER_ERROR, str(e)) from e
+        finally:
+            self.counter(method).add(time.monotonic() - started, failed)
+
+    def _search_request(self, params):
+        directory = _param(params, "directory", (str, list), "")
+        directories = [directory] if isinstance(directory, str) else directory
+        if not all(isinstance(root, str) for root in directories):
+            raise RpcError(INVALID_PARAMS, "directory must be a string or a list of strings")
+        try:
+            options = build_options(
+                _param(params, "query", str, ""), directories, bool(params.get("content")),
+                bool(params.get("match_case")), bool(params.get("full_match")), _param(params, "bookmark", str)
+            )
+        except ValueError as e:
+            raise RpcError(INVALID_PARAMS, str(e)) from None
+        backends = plan_backends(self.backend_mode, options, self.file_index)
+        if not any(backend.supports(options) for backend in backends):
+            raise RpcError(INVALID_PARAMS, f"the {self.backend_mode} backend cannot run this search")
+        return _SearchRequest(options, backends, (self.backend_mode,) + backends[0].cache_key(options), params)
+
+    def _sorted(self, request, rows):
+        return sort_rows(rows, request.sort, request.descending, request.limit, request.options,
+                         self.config.get("open_history"))
+
+    def _reply_cached(self, request, cached, notify, request_id):
+        """Answer from a cache entry, whose rows are not filtered by size and extension yet"""
+        rows, _stale, hits = cached
+        rows = filter_by_size_and_extension(rows, request.min_size, request.max_size, request.extensions)
+        rows = self._sorted(request, rows) if request.sort is not None else rows[:request.limit]
+        return self._reply_rows(request, rows, hits, notify, request_id, cached=True)
+
+    def _reply_rows(self, request, rows, hits, notify, request_id, **extra):
+        if request.stream:
+            writer = StreamWriter(notify, request_id)
+            writer.hits = hits
+            for start in range(0, len(rows), self.stream_batch_size):
+                writer.write(rows[start:start + self.stream_batch_size])
+            return dict(count=len(rows), **extra)
+        return dict(count=len(rows), rows=[row_record(row, hits) for row in rows], **extra)
+
+    def cached(self, params, notify, request_id):
+        request = self._search_request(params)
+        hit = self.cache.get(request.cache_key)
+        if hit is None:
+            return None
+        return self._reply_cached(request, hit, notify, request_id)
+
+    def _claim(self, cache_key):
+        """None if this caller runs the search for cache_key, else the Event of the one running it"""
+        with self._inflight_lock:
+            running = self._inflight.get(cache_key)
+            if running is None:
+                self._inflight[cache_key] = threading.Event()
+            return running
+
+    def _release(self, cache_key):
+        with self._inflight_lock:
+            self._inflight.pop(cache_key).set()
+
+    def search(self, params, notify, request_id):
+        request = self._search_request(params)
+        refresh = request.refresh
+        running = self._claim(request.cache_key)
+        while running is not None:
+            # The same search is running for another request: share its result
+            running.wait()
+            refresh = False
+            running = self._claim(request.cache_key)
+
+        try:
+            hit = None if refresh else self.cache.get(request.cache_key)
+            if hit is not None:
+                return self._reply_cached(request, hit, notify, request_id)
+            writer = StreamWriter(notify, request_id) if request.stream else CollectWriter()
+            search = HeadlessSearch(
+                request.options, request.backends, writer, stat_workers=self.stat_workers,
+                stat_ordered=self.stat_ordered, min_size=request.min_size, max_size=request.max_size,
+                extensions=request.extensions, limit=request.limit, collect=request.sort is not None,
+                keep_fetched=True
+            )
+            search.run()
+            if search.complete:
+                # Content hits are cached with the rows, for their line numbers
+                self.cache.put(request.cache_key, search.fetched, search.hits)
+        finally:
+            self._release(request.cache_key)
+
+        result = {"cached": False, "backend": search.progress.backend, "progress": search.progress.snapshot()}
+        if request.sort is not None:
+            return self._reply_rows(request, self._sorted(request, search.rows), search.hits, notify, request_id,
+                                    **result)
+        if request.stream:
+            return dict(count=writer.count, **result)
+        return dict(count=len(writer.records), rows=writer.records, **result)
+
+    def dirsize(self, params, notify, request_id):
+        path = _param(params, "path", str)
+        if not path:
+            raise RpcError(INVALID_PARAMS, "path is required")
+        path = os.path.expanduser(path)
+        if not os.path.isdir(path):
+            raise RpcError(INVALID_PARAMS, f"not a directory: {path}")
+        depth = _param(params, "depth", int, 0)
+        if depth == 0:
+            return {"path": path, "size": directory_size(path)}
+        if depth == 1:
+            entries = subdirectory_sizes(path)
+            entries.sort(key=lambda entry: entry[1], reverse=True)
+            return {"path": path, "entries": [{"name": name, "size": size, "path": str(entry_path)}
+                                              for name, size, entry_path in entries]}
+        raise RpcError(INVALID_PARAMS, "depth must be 0 or 1")
+
+    def metadata(self, params, notify, request_id):
+        paths = _param(params, "paths", list)
+        if not paths or not all(isinstance(path, str) for path in paths):
+            raise RpcError(INVALID_PARAMS, "paths must be a list of paths")
+        if len(paths) > MAX_METADATA_PATHS:
+            raise RpcError(INVALID_PARAMS, f"at most {MAX_METADATA_PATHS} paths per call")
+        spotlight = bool(params.get("spotlight"))
+        results = []
+        for path in paths:
+            try:
+                stat_result = os.stat(path)
+            except (OSError, ValueError):
+                results.append({"path": path, "exists": False})
+                continue
+            is_dir = stat.S_ISDIR(stat_result.st_mode)
+            record = {
+                "path": path,
+                "exists": True,
+                "name": os.path.basename(path),
+                "size": 0 if is_dir else stat_result.st_size,  # Like result rows; dirsize measures directories
+                "mtime": stat_result.st_mtime,
+                "ctime": stat_result.st_ctime,
+                "is_dir": is_dir,
+                "mode": stat.filemode(stat_result.st_mode),
+            }
+            if spotlight:
+                try:
+                    record["spotlight"] = parse_mdls_output(run_mdls(path))
+                except (OSError, subprocess.SubprocessError):
+                    record["spotlight"] = None  # No mdls off macOS
+            results.append(record)
+        return results
+
+    def stats(self, params, notify, request_id):
+        with self._counters_lock:
+            counters = dict(self.counters)
+        return {
+            "methods": {method: counter.snapshot() for method, counter in sorted(counters.items())},
+            "cache": self.cache.stats(),
+        }
+
+
+class _Connection(socketserver.StreamRequestHandler):
+    """One client connection: reads requests line by line and answers them as they finish"""
+
+    def handle(self):
+        service, executor = self.server.service, self.server.executor
+        write_lock = threading.Lock()
+        closed = threading.Event()
+
+        def send(message):
+            data = (json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8", "surrogateescape")
+            with write_lock:
+                if closed.is_set():
+                    return
+                try:
+                    self.wfile.write(data)
+                    self.wfile.flush()
+                except OSError:
+                    closed.set()
+
+        def notify(method, params):
+            send({"jsonrpc": "2.0", "method": method, "params": params})
+
+        def answer(request):
+            request_id = request.get("id")
+            try:
+                result = service.call(request.get("method"), request.get("params"), notify, request_id)
+                response = {"jsonrpc": "2.0", "id": request_id, "result": result}
+            except RpcError as e:
+                response = {"jsonrpc": "2.0", "id": request_id, "error": {"code": e.code, "message": str(e)}}
+            if "id" in request:  # Requests without an id are notifications: no response
+                send(response)
+
+        pending = []
+        for line in self.rfile:
+            if closed.is_set():
+                break
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError:
+                send({"jsonrpc": "2.0", "id": None, "error": {"code": PARSE_ERROR, "message": "Parse error"}})
+                continue
+            if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+                send({"jsonrpc": "2.0", "id": request.get("id") if isinstance(request, dict) else None,
+                      "error": {"code": INVALID_REQUEST, "message": "Invalid request"}})
+                continue
+            pending = [future for future in pending if not future.done()]
+            pending.append(executor.submit(answer, request))
+        # The client closed its side; finish what it asked for before the connection goes away
+        for future in pending:
+            future.result()
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class _TcpServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def make_server(service, socket_path=None, port=None, workers=DEFAULT_SERVICE_WORKERS):
+    """A server for the service on a Unix socket, or on a localhost TCP port. Call serve_forever()."""
+    if port is not None:
+        server = _TcpServer(("127.0.0.1", port), _Connection)
+    else:
+        socket_path = socket_path or DEFAULT_SOCKET_PATH
+        if os.path.exists(socket_path):
+            # Remove a socket left behind by a service that did not shut down, but never steal a live one
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(socket_path)
+                raise OSError(f"a service is already listening on {socket_path}")
+            except (ConnectionRefusedError, FileNotFoundError):
+                os.unlink(socket_path)
+            finally:
+                probe.close()
+        old_umask = os.umask(0o177)  # Only the user may connect
+        try:
+            server = _UnixServer(socket_path, _Connection)
+        finally:
+            os.umask(old_umask)
+    server.service = service
+    server.executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="rpc")
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="everything.py --serve",
+                                     description="Serve the search engine over JSON-RPC on a local socket.")
+    parser.add_argument("--socket", metavar="PATH", help=f"Unix socket path (default: {DEFAULT_SOCKET_PATH})")
+    parser.add_argument("--port", type=int, help="listen on this localhost TCP port instead of a Unix socket")
+    parser.add_argument("--workers", type=int, default=DEFAULT_SERVICE_WORKERS, help="requests handled at once")
+    parser.add_argument("--backend", help="search backend: auto, mdfind, scandir or index (default: as in the app)")
+    args = parser.parse_args(argv)
+
+    try:
+        server = make_server(SearchService(backend_mode=args.backend), args.socket, args.port, args.workers)
+    except OSError as e:
+        print(f"cannot start the service: {e}", file=sys.stderr)
+        return 2
+    address = f"127.0.0.1:{args.port}" if args.port is not None else server.server_address
+    print(f"Serving on {address}", file=sys.stderr)
+    # Shut down cleanly on kill as well, so the socket file is removed
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.executor.shutdown(wait=False, cancel_futures=True)
+        if args.port is None:
+            try:
+                os.unlink(server.server_address)
+            except OSError:
+                pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+# Copyright 2025 Apple Dragon
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sys
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import search_backends  # noqa: E402
+import search_engine  # noqa: E402
+
+FAKE_MDFIND = os.path.join(REPO_DIR, "benchmarks", "fake_mdfind.py")
+
+
+def write_paths(paths_file, paths):
+    """Replace the paths the fake mdfind reports, in one step"""
+    temp_path = f"{paths_file}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write("".join(f"{path}\n" for path in paths))
+    os.replace(temp_path, paths_file)
+
+
+@pytest.fixture
+def fake_mdfind(tmp_path, monkeypatch):
+    """Run benchmarks/fake_mdfind.py in place of mdfind; returns the file listing its results"""
+    paths_file = tmp_path / "mdfind_paths.txt"
+    write_paths(paths_file, [])
+    monkeypatch.setattr(search_engine, "MDFIND_COMMAND", FAKE_MDFIND)
+    monkeypatch.setattr(search_backends, "MDFIND_COMMAND", FAKE_MDFIND)
+    monkeypatch.setenv("FAKE_MDFIND_PATHS_FILE", str(paths_file))
+    monkeypatch.setenv("FAKE_MDFIND_LIVE_POLL", "0.05")
+    return paths_file
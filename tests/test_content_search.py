@@ -0,0 +1,83 @@
+# Copyright 2025 Apple Dragon
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import subprocess
+import sys
+import textwrap
+import threading
+
+import content_search
+from conftest import REPO_DIR
+from content_search import ContentScanner
+
+
+def test_scan_reports_first_matching_line(tmp_path):
+    (tmp_path / "hit.txt").write_text("first\nsecond Needle\nthird needle\n")
+    (tmp_path / "miss.txt").write_text("nothing here\n")
+    (tmp_path / "binary.bin").write_bytes(b"needle\0")
+    paths = [str(tmp_path / name) for name in ("hit.txt", "miss.txt", "binary.bin")]
+
+    scanner = ContentScanner(workers=2, chunk_size=1)
+    hits = list(scanner.scan(paths, "needle"))
+    assert [(hit.path, hit.line_offset, hit.line_number) for hit in hits] == [(paths[0], 6, 2)]
+    assert scanner.stats.scanned == 2
+    assert scanner.stats.skipped_binary == 1
+
+
+def test_pool_processes_do_not_rerun_the_main_module(tmp_path):
+    """Spawned pool processes would re-run the app's main module, and import Qt with it"""
+    marker = tmp_path / "main_runs.txt"
+    (tmp_path / "data.txt").write_text("needle\n")
+    script = tmp_path / "app_main.py"
+    script.write_text(textwrap.dedent(f"""
+        import os
+        import sys
+        sys.path.insert(0, {REPO_DIR!r})
+        with open({str(marker)!r}, "a") as f:
+            f.write(f"{{os.getpid()}}\\n")
+        from content_search import ContentScanner
+
+        if __name__ == "__main__":
+            hits = list(ContentScanner(workers=2).scan([{str(tmp_path / "data.txt")!r}], "needle"))
+            print(len(hits))
+    """))
+    completed = subprocess.run([sys.executable, str(script)], capture_output=True, text=True, timeout=60)
+    assert completed.returncode == 0, completed.stderr
+    assert completed.stdout.strip() == "1"
+    assert len(marker.read_text().split()) == 1
+
+
+def test_concurrent_scans_share_one_pool(tmp_path):
+    (tmp_path / "a.txt").write_text("alpha\n")
+    (tmp_path / "b.txt").write_text("beta\n")
+    paths = [str(tmp_path / "a.txt"), str(tmp_path / "b.txt")]
+    main = sys.modules["__main__"]
+    content_search.shutdown_pool()
+    try:
+        results = {}
+
+        def scan(query):
+            results[query] = [hit.path for hit in ContentScanner(workers=2, chunk_size=1).scan(paths, query)]
+
+        threads = [threading.Thread(target=scan, args=(query,)) for query in ("alpha", "beta") * 2]
+        for thread in threads:
+            thread.start()
+        pool = content_search.shared_pool(2)
+        for thread in threads:
+            thread.join()
+        assert results == {"alpha": paths[:1], "beta": paths[1:]}
+        assert content_search.shared_pool(2) is pool
+        assert sys.modules["__main__"] is main
+    finally:
+        content_search.shutdown_pool()
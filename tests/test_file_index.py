@@ -0,0 +1,81 @@
+# Copyright 2025 Apple Dragon
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+import pytest
+
+from file_index import FileIndex, IndexUpdater
+
+
+@pytest.fixture
+def built_index(tmp_path):
+    root = tmp_path / "root"
+    (root / "sub").mkdir(parents=True)
+    (root / "sub" / "old.txt").write_text("old")
+    index = FileIndex(str(tmp_path / "index.db"))
+    index.set_roots([str(root)])
+    index.build()
+    return index, root
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_first_cycle_picks_up_changes_made_before_the_updater(built_index, use_inotify):
+    index, root = built_index
+    # Made while the app was closed: no watch sees these
+    os.remove(root / "sub" / "old.txt")
+    (root / "sub" / "new.txt").write_text("new")
+
+    updater = IndexUpdater(index, use_inotify=use_inotify)
+    try:
+        stats = updater.run_cycle()
+        assert stats.added == [str(root / "sub" / "new.txt")]
+        assert stats.removed == [str(root / "sub" / "old.txt")]
+        assert updater.run_cycle().checked == (0 if updater.mode == "inotify" else 2)
+    finally:
+        updater.close()
+
+
+def test_inotify_cycles_after_the_first_use_events(built_index):
+    index, root = built_index
+    updater = IndexUpdater(index, use_inotify=True)
+    try:
+        if updater.mode != "inotify":
+            pytest.skip("inotify is not available")
+        updater.run_cycle()
+        (root / "sub" / "later.txt").write_text("later")
+        stats = updater.run_cycle()
+        assert stats.mode == "inotify"
+        assert stats.added == [str(root / "sub" / "later.txt")]
+    finally:
+        updater.close()
+
+
+def test_covers_only_directories_inside_built_roots(built_index, tmp_path):
+    index, root = built_index
+    assert index.covers(str(root))
+    assert index.covers(str(root / "sub"))
+    assert not index.covers(str(tmp_path))
+    assert not index.covers(str(root) + "_other")
+    assert not index.covers("")  # Searching everywhere would miss files outside the roots
+
+
+def test_global_name_search_is_not_answered_from_the_index_alone(built_index):
+    from search_backends import BACKEND_AUTO, SearchOptions, plan_backends
+
+    index, root = built_index
+    global_plan = plan_backends(BACKEND_AUTO, SearchOptions("old"), index)
+    assert "index" not in [backend.name for backend in global_plan]
+    inside_plan = plan_backends(BACKEND_AUTO, SearchOptions("old", str(root)), index)
+    assert [backend.name for backend in inside_plan] == ["index"]
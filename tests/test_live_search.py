@@ -0,0 +1,147 @@
+# Copyright 2025 Apple Dragon
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import queue
+import threading
+import time
+
+import pytest
+
+from conftest import write_paths
+from search_engine import LiveResultTracker, LiveSearch
+
+COALESCE = 0.5
+
+
+@pytest.fixture
+def live_diffs():
+    """Start a LiveSearch and collect its diffs on a thread; stops it afterwards"""
+    searches = []
+
+    def start(known_paths, coalesce_interval=COALESCE):
+        live = LiveSearch("kMDItemFSName == '*'", "", known_paths, coalesce_interval)
+        live.start()
+        searches.append(live)
+        diffs = queue.Queue()
+
+        def consume():
+            for diff in live.diffs():
+                diffs.put(diff)
+            diffs.put(None)
+
+        threading.Thread(target=consume, daemon=True).start()
+        return diffs
+
+    yield start
+    for live in searches:
+        live.stop()
+        live.process.wait(timeout=5)
+
+
+def next_diff(diffs, timeout=5):
+    return diffs.get(timeout=timeout)
+
+
+def test_tracker_initial_listing_is_diffed_against_known_paths():
+    tracker = LiveResultTracker(["/a", "/b"])
+    for line in ("/a\n", "/c\n", "[Type ctrl-C to exit]\n"):
+        tracker.feed(line)
+    assert tracker.has_pending()
+    assert tracker.take_diff() == ({"/c"}, {"/b"})
+    assert not tracker.has_pending()
+
+
+def test_tracker_paths_after_listing_are_additions():
+    tracker = LiveResultTracker(["/a"])
+    tracker.feed("/a\n")
+    tracker.feed("[Type ctrl-C to exit]\n")
+    assert tracker.take_diff() == (set(), set())
+    tracker.feed("/a\n")
+    assert not tracker.has_pending()  # Already shown
+    tracker.feed("/b\n")
+    assert tracker.take_diff() == ({"/b"}, set())
+
+
+def test_tracker_query_update_diffs_against_snapshot():
+    tracker = LiveResultTracker(["/a", "/b"])
+    tracker.feed("[Type ctrl-C to exit]\n")
+    tracker.feed("Query update: 1 matches\n")
+    assert tracker.updates_seen == 1
+    assert tracker.take_diff(snapshot=lambda: ["/a"]) == (set(), {"/b"})
+
+
+def test_added_line_becomes_diff(fake_mdfind, live_diffs, tmp_path):
+    known = [str(tmp_path / "a.txt")]
+    write_paths(fake_mdfind, known)
+    diffs = live_diffs(known)
+    time.sleep(COALESCE * 2)  # Initial listing matches the known paths: nothing to report
+    assert diffs.empty()
+
+    added = str(tmp_path / "b.txt")
+    write_paths(fake_mdfind, known + [added])
+    assert next_diff(diffs) == ({added}, set())
+
+
+def test_removal_becomes_diff(fake_mdfind, live_diffs, tmp_path):
+    known = [str(tmp_path / "a.txt"), str(tmp_path / "b.txt")]
+    write_paths(fake_mdfind, known)
+    diffs = live_diffs(known)
+    time.sleep(COALESCE * 2)
+
+    write_paths(fake_mdfind, known[:1])
+    assert next_diff(diffs) == (set(), {known[1]})
+
+
+def test_initial_listing_reports_what_changed_since_the_search(fake_mdfind, live_diffs, tmp_path):
+    old, kept, new = (str(tmp_path / name) for name in ("old.txt", "kept.txt", "new.txt"))
+    write_paths(fake_mdfind, [kept, new])
+    diffs = live_diffs([old, kept])
+    assert next_diff(diffs) == ({new}, {old})
+
+
+def test_burst_is_coalesced_into_one_update(fake_mdfind, live_diffs, tmp_path):
+    known = [str(tmp_path / "a.txt")]
+    write_paths(fake_mdfind, known)
+    diffs = live_diffs(known, coalesce_interval=1.5)
+    time.sleep(2.5)
+    assert diffs.empty()
+
+    current = list(known)
+    burst = [str(tmp_path / f"burst_{i}.txt") for i in range(4)]
+    for path in burst:
+        current.append(path)
+        write_paths(fake_mdfind, current)
+        time.sleep(0.15)
+    write_paths(fake_mdfind, current[1:])  # And a removal within the same window
+
+    assert next_diff(diffs) == (set(burst), set(known))
+    time.sleep(2)
+    assert diffs.empty()
+
+
+def test_stop_ends_diffs(fake_mdfind, tmp_path):
+    live = LiveSearch("kMDItemFSName == '*'", "", [], COALESCE)
+    live.start()
+    finished = threading.Event()
+
+    def consume():
+        for _diff in live.diffs():
+            pass
+        finished.set()
+
+    threading.Thread(target=consume, daemon=True).start()
+    time.sleep(0.3)
+    live.stop()
+    assert finished.wait(timeout=5)
+    assert live.process.wait(timeout=5) is not None
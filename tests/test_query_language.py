@@ -0,0 +1,40 @@
+# Copyright 2025 Apple Dragon
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+
+import pytest
+
+from query_language import parse_query
+
+NOW = time.time()
+SMALL = ("small.txt", 100, NOW - 60, "/tmp/small.txt")
+LARGE = ("large.mov", 50 * 1024 * 1024, NOW - 30 * 86400, "/tmp/large.mov")
+DEFERRED = ("deferred.txt", None, None, "/tmp/deferred.txt")
+ROWS = [SMALL, LARGE, DEFERRED]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("size:>10MB", [LARGE, DEFERRED]),
+    ("-size:>10MB", [SMALL, DEFERRED]),
+    ("modified:<7d", [SMALL, DEFERRED]),
+    ("-modified:<7d", [LARGE, DEFERRED]),
+])
+def test_unknown_metadata_passes_negated_and_plain_filters(text, expected):
+    assert parse_query(text).filter_rows(ROWS) == expected
+
+
+def test_negated_name_filters_still_drop_matches():
+    assert parse_query("-ext:txt").filter_rows(ROWS) == [LARGE]
+    assert parse_query("-name:small").filter_rows(ROWS) == [LARGE, DEFERRED]
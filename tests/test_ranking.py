@@ -0,0 +1,113 @@
+# Copyright 2025 Apple Dragon
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from ranking import FrecencyStore, IncrementalRanking, Ranker
+from result_store import ResultStore
+from search_cli import build_options, sort_rows
+
+NOW = 1.7e9
+NAMES = ["old_report.txt", "report.txt", "notes.txt", "report_q3.pdf", "misc.txt", "q3 report.md", "reports.txt"]
+
+
+def make_rows(names, folder="/Users/me/docs"):
+    return [(name, 100, NOW - 86400, f"{folder}/{name}") for name in names]
+
+
+def expected_order(rows):
+    ranker = Ranker("report", now=NOW)
+    return sorted(rows, key=lambda row: -ranker.score(row))  # Stable: earlier rows first on ties
+
+
+def test_ranking_rows_returns_rows():
+    rows = make_rows(NAMES)
+    ranking = IncrementalRanking(Ranker("report", now=NOW), k=3)
+    ranking.add(rows)
+    assert ranking.sorted_keys() == expected_order(rows)
+    assert ranking.top() == expected_order(rows)[:3]
+
+
+def test_ranking_a_view_gives_a_permutation_of_its_row_indexes():
+    store = ResultStore(make_rows(NAMES))
+    view = store.view().filter(extensions=[".txt", ".md"])
+    ranking = IncrementalRanking(Ranker("report", now=NOW), k=2)
+    ranking.add(view, view.indexes)
+
+    keys = ranking.sorted_keys()
+    assert sorted(keys) == sorted(view.indexes)
+    ranked = store.view(keys)
+    assert list(ranked) == expected_order(list(view))
+    assert ranked.group_by_directory() == {0: ranked.indexes}
+
+    ordered = store.view(ranking.ordered())
+    assert list(ordered)[:2] == expected_order(list(view))[:2]
+    assert sorted(ordered.indexes) == sorted(view.indexes)
+
+
+def test_batches_only_change_the_top_when_a_better_row_arrives():
+    store = ResultStore()
+    view = store.view()
+    ranking = IncrementalRanking(Ranker("report", now=NOW), k=2)
+    first = view.append_rows(make_rows(["report.txt", "report_q3.pdf"]))
+    assert ranking.add(first, first.indexes)
+    worse = view.append_rows(make_rows(["misc.txt", "notes.txt"]))
+    assert not ranking.add(worse, worse.indexes)
+    assert ranking.top() == list(first.indexes)
+
+
+def test_add_to_order_keeps_the_best_rows_first_batch_by_batch():
+    store = ResultStore()
+    view = store.view()
+    order = store.view()
+    ranking = IncrementalRanking(Ranker("report", now=NOW), k=2)
+    changes = []
+    for names in (["misc.txt", "notes.txt"], ["old_report.txt"], ["a.txt", "b.txt"], ["report.txt", "c.txt"]):
+        batch = view.append_rows(make_rows(names))
+        changes.append(ranking.add_to_order(order.indexes, batch, batch.indexes))
+        assert list(order.indexes[:2]) == ranking.top()
+        assert sorted(order.indexes) == list(range(len(store)))
+    assert changes == [True, True, False, True]
+    assert [row[0] for row in order[:2]] == ["report.txt", "old_report.txt"]
+    assert list(store.view(ranking.sorted_keys())) == expected_order(list(view))
+
+
+def test_add_to_order_works_on_lists_of_rows():
+    rows = make_rows(NAMES)
+    order = []
+    ranking = IncrementalRanking(Ranker("report", now=NOW), k=3)
+    for start in range(0, len(rows), 2):
+        ranking.add_to_order(order, rows[start:start + 2])
+    assert order[:3] == expected_order(rows)[:3]
+    assert sorted(order) == sorted(rows)
+
+
+def test_frecency_store_is_dirty_until_saved():
+    store = FrecencyStore({"/a": [1.0, NOW]})
+    assert not store.dirty
+    store.record("/b", now=NOW)
+    store.record("/b", now=NOW)
+    assert store.dirty
+    saved = store.to_dict()
+    assert not store.dirty
+    assert saved["/b"] == [2.0, NOW]
+    assert FrecencyStore(saved).score("/b", NOW) == store.score("/b", NOW)
+
+
+def test_descending_relevance_with_a_limit_gives_the_worst_rows_worst_first():
+    rows = make_rows(NAMES)
+    options = build_options("report")
+    best_first = sort_rows(rows, "relevance", options=options)
+    assert sort_rows(rows, "relevance", limit=3, options=options) == best_first[:3]
+    assert sort_rows(rows, "relevance", descending=True, options=options) == best_first[::-1]
+    # Like a column sort: the first limit rows of the descending order
+    assert sort_rows(rows, "relevance", descending=True, limit=3, options=options) == best_first[::-1][:3]
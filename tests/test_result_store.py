@@ -0,0 +1,106 @@
+# Copyright 2025 Apple Dragon
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from result_store import ResultStore, extension_of
+from search_engine import filter_by_size_and_extension, row_sort_key
+
+ROWS = [
+    ("notes.txt", 120, 1700000300.0, "/Users/me/Documents/notes.txt"),
+    ("README.TXT", 0, 1700000100.0, "/Users/me/Projects/app/README.TXT"),
+    ("archive.tar.gz", 5000, 1700000200.0, "/Users/me/Downloads/archive.tar.gz"),
+    ("photo.JPG", 2048, 1700000400.0, "/Users/me/Pictures/photo.JPG"),
+    (".txt", 3, 1700000500.0, "/Users/me/.txt"),
+    ("Makefile", 900, 1700000000.0, "/Users/me/Projects/app/Makefile"),
+    ("pending.txt", None, None, "/Users/me/Documents/pending.txt"),  # Deferred metadata
+    ("Alias Name", 40, 1700000600.0, "/Users/me/Desktop/target.txt"),  # Name is not the last component
+    ("relative.gz", 70, 1700000700.0, "relative.gz"),  # No directory
+    ("notes.txt", 120, 1700000300.0, "/Users/me/Archive/notes.txt"),  # Same name, sorts after its twin
+    ("gz", 10, 1700000800.0, "/Users/me/gz"),
+]
+
+
+def test_rows_read_back_unchanged():
+    store = ResultStore(ROWS)
+    assert list(store.view()) == ROWS
+    assert [store.row(index) for index in range(len(store))] == ROWS
+    assert store.path(7) == "/Users/me/Desktop/target.txt"
+    assert store.directory(8) == "" and store.directory(0) == "/Users/me/Documents"
+
+
+@pytest.mark.parametrize("min_size,max_size,extensions", [
+    (None, None, None),
+    (100, None, None),
+    (None, 120, None),
+    (100, 2048, None),
+    (None, None, [".txt"]),
+    (None, None, [".jpg", ".gz"]),
+    (None, None, [".tar.gz"]),  # Multi-dot: compared on the name
+    (None, None, ["gz"]),  # No dot: compared on the name too
+    (None, None, [".TXT"]),  # Extensions are matched lowercased, so this matches nothing
+    (None, None, [".pdf"]),  # Not in the store
+    (50, 5000, [".txt", ".tar.gz"]),
+])
+def test_filter_matches_the_row_list_filter(min_size, max_size, extensions):
+    view = ResultStore(ROWS).view()
+    expected = filter_by_size_and_extension(ROWS, min_size, max_size, extensions)
+    assert list(view.filter(min_size, max_size, extensions)) == expected
+
+
+@pytest.mark.parametrize("column", [0, 1, 2, 3])
+@pytest.mark.parametrize("descending", [False, True])
+def test_sort_matches_row_sort_key(column, descending):
+    view = ResultStore(ROWS).view()
+    view.sort(column, descending)
+    assert list(view) == sorted(ROWS, key=row_sort_key(column), reverse=descending)
+
+
+def test_rows_without_metadata_sort_first_by_size_and_date():
+    view = ResultStore(ROWS).view()
+    view.sort(1)
+    assert view[0][3] == "/Users/me/Documents/pending.txt"
+    view.sort(2, descending=True)
+    assert view[len(view) - 1][3] == "/Users/me/Documents/pending.txt"
+
+
+def test_extension_codes_share_the_last_suffix():
+    store = ResultStore(ROWS)
+    assert extension_of("archive.tar.gz") == ".gz" and extension_of("Makefile") == ""
+    assert store.extension_codes[0] == store.extension_codes[1]  # .txt and .TXT
+    assert store.extension_codes[2] == store.extension_codes[8]  # .gz
+    assert store.extension_codes[5] == store.extension_codes[10] == 0  # No suffix
+
+
+def test_set_row_updates_every_view_in_place():
+    store = ResultStore(ROWS)
+    view = store.view()
+    filtered = view.filter(extensions=[".txt"])
+    position = [row[3] for row in filtered].index("/Users/me/Documents/pending.txt")
+    filtered[position] = ("pending.txt", 10, 1700000900.0, "/Users/me/Documents/pending.txt")
+    assert view[6] == ("pending.txt", 10, 1700000900.0, "/Users/me/Documents/pending.txt")
+    assert not view.has_deferred_rows()
+    # Now known, the row no longer passes every size filter
+    assert "/Users/me/Documents/pending.txt" not in [row[3] for row in view.filter(min_size=100)]
+    view[6] = ("pending.txt", None, None, "/Users/me/Documents/pending.txt")
+    assert view[6] == ROWS[6] and view.has_deferred_rows()
+    assert len(store) == len(ROWS)
+
+
+def test_group_by_directory_keeps_view_order():
+    store = ResultStore(ROWS)
+    view = store.view([5, 0, 1, 6])
+    groups = view.group_by_directory()
+    assert [store.directory_of(dir_id) for dir_id in groups] == ["/Users/me/Projects/app", "/Users/me/Documents"]
+    assert [list(indexes) for indexes in groups.values()] == [[5, 1], [0, 6]]
@@ -0,0 +1,90 @@
+# Copyright 2025 Apple Dragon
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import threading
+from collections import Counter
+
+from search_backends import BACKENDS, MultiRootBackend, SearchOptions
+from search_engine import ROOT_SEPARATOR, SKIP_ROW, StatPipeline, StatThroughput, stat_row
+
+
+def collect_rows(pipeline):
+    rows, finished = [], False
+    while not finished:
+        batch, finished = pipeline.poll(1)
+        rows.extend(batch)
+    return rows
+
+
+def test_multi_root_search_stats_each_path_once_in_the_pipeline(tmp_path, monkeypatch):
+    outer = tmp_path / "outer"
+    (outer / "inner").mkdir(parents=True)
+    (outer / "report_a.txt").write_text("a")
+    (outer / "inner" / "report_b.txt").write_text("bb")
+    roots = [str(outer), str(outer / "inner")]  # Nested: report_b.txt is found by both
+    options = SearchOptions("report", ROOT_SEPARATOR.join(roots))
+    backend = MultiRootBackend(roots, lambda _options: [BACKENDS["scandir"]])
+
+    stats = Counter()
+    threads = set()
+    real_stat = os.stat
+
+    def counting_stat(path, *args, **kwargs):
+        if os.fspath(path).endswith(".txt"):
+            stats[os.fspath(path)] += 1
+            threads.add(threading.current_thread().name.split("_")[0])
+        return real_stat(path, *args, **kwargs)
+
+    monkeypatch.setattr(os, "stat", counting_stat)
+    run = backend.start(options)
+    rows = collect_rows(StatPipeline(run.paths, workers=2, stat=run.stat_with(stat_row)).start())
+    run.wait()
+
+    assert sorted((row[0], row[1]) for row in rows) == [("report_a.txt", 1), ("report_b.txt", 2)]
+    # The repeated path is dropped before the stat stage, which stats the others in its pool
+    assert stats == {str(outer / "report_a.txt"): 1, str(outer / "inner" / "report_b.txt"): 1}
+    assert threads == {"stat"}
+    assert sum(progress.duplicates for progress in run.progress) == 1
+
+
+def test_multi_root_search_drops_files_reached_through_a_symlink(tmp_path):
+    outer = tmp_path / "outer"
+    outer.mkdir()
+    (outer / "report_a.txt").write_text("a")
+    (outer / "report_b.txt").write_text("bb")
+    link = tmp_path / "link"
+    link.symlink_to(outer)
+    roots = [str(outer), str(link)]
+    backend = MultiRootBackend(roots, lambda _options: [BACKENDS["scandir"]])
+    run = backend.start(SearchOptions("report", ROOT_SEPARATOR.join(roots)))
+    counter = StatThroughput()
+    rows = collect_rows(StatPipeline(run.paths, workers=2, counter=counter, stat=run.stat_with(stat_row)).start())
+    run.wait()
+
+    assert sorted((row[0], row[1]) for row in rows) == [("report_a.txt", 1), ("report_b.txt", 2)]
+    assert counter.failures == 0  # Dropped duplicates are not failed stats
+    assert sum(progress.found for progress in run.progress) == 2
+    assert sum(progress.duplicates for progress in run.progress) == 2
+
+
+def test_stat_with_stats_paths_it_did_not_report(tmp_path):
+    run = MultiRootBackend([str(tmp_path)], lambda _options: []).start(SearchOptions("x", str(tmp_path)))
+    (tmp_path / "other.txt").write_text("x")
+    (tmp_path / "alias.txt").symlink_to(tmp_path / "other.txt")
+    stat = run.stat_with(stat_row)
+    assert stat(str(tmp_path / "other.txt"))[:2] == ("other.txt", 1)
+    assert stat(str(tmp_path / "alias.txt")) is SKIP_ROW
+    assert stat(str(tmp_path / "missing.txt")) is None
+    run.wait()
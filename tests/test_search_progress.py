@@ -0,0 +1,152 @@
+# Copyright 2025 Apple Dragon
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+
+import pytest
+
+from search_engine import SEARCH_PHASES, SearchProgress, StatPipeline, StatThroughput
+
+
+class FakeClock:
+    def __init__(self, now=100.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+def fake_stat(path):
+    return (path.rsplit("/", 1)[-1], 1, 0.0, path)
+
+
+def drain(pipeline):
+    rows, finished = [], False
+    while not finished:
+        batch, finished = pipeline.poll(1)
+        rows.extend(batch)
+    return rows
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def start_search(clock, paths):
+    progress = SearchProgress(clock)
+    counter = StatThroughput(clock)
+    clock.advance(0.5)
+    progress.spawned(0.5)
+    pipeline = StatPipeline(paths, workers=1, counter=counter, stat=fake_stat, clock=clock).start()
+    return progress, counter, pipeline
+
+
+def test_phases_of_a_finished_search(clock):
+    def paths():
+        clock.advance(2)  # Waiting for the first path
+        yield "/a"
+        clock.advance(3)
+        yield "/b"
+        clock.advance(1)
+
+    progress, counter, pipeline = start_search(clock, paths())
+    rows = drain(pipeline)
+    progress.track_pipeline(pipeline, counter)
+    progress.rows_found = len(rows)
+    progress.add_time("emit", 0.25)
+    progress.add_time("render", 0.75)
+    progress.backend = "mdfind"
+    clock.advance(4)
+    progress.finish()
+    clock.advance(100)  # A finished search stops counting
+
+    assert progress.snapshot() == {
+        "backend": "mdfind",
+        "paths_read": 2,
+        "stat_done": 2,
+        "failures": 0,
+        "rows_found": 2,
+        "rows_per_second": 2 / 10.5,
+        "elapsed": 10.5,
+        "finished": True,
+        "phases": {"spawn": 0.5, "first_byte": 2.0, "drain": 4.0, "stat": 4.0, "emit": 0.25, "render": 0.75},
+    }
+
+
+def test_running_phase_counts_up_to_now(clock):
+    resume = threading.Event()
+    waiting = threading.Event()
+
+    def paths():
+        clock.advance(2)
+        yield "/a"
+        waiting.set()
+        resume.wait(5)
+
+    progress, counter, pipeline = start_search(clock, paths())
+    snapshot = progress.snapshot()
+    assert snapshot["phases"]["first_byte"] == 0.0 and not snapshot["finished"]
+
+    assert waiting.wait(5)
+    clock.advance(3)
+    progress.track_pipeline(pipeline, counter)
+    snapshot = progress.snapshot()
+    assert snapshot["paths_read"] == 1
+    assert snapshot["phases"]["first_byte"] == 2.0
+    assert snapshot["phases"]["drain"] == 3.0  # Still draining: up to now
+    assert snapshot["elapsed"] == 5.5
+
+    resume.set()
+    drain(pipeline)
+    clock.advance(7)
+    progress.track_pipeline(pipeline, counter)
+    assert progress.snapshot()["phases"]["drain"] == 3.0  # Ended with the input
+
+
+def test_backend_without_output_only_waits_for_the_first_byte(clock):
+    def paths():
+        clock.advance(1.5)
+        return
+        yield
+
+    progress, counter, pipeline = start_search(clock, paths())
+    assert drain(pipeline) == []
+    clock.advance(10)
+    progress.track_pipeline(pipeline, counter)
+    phases = progress.snapshot()["phases"]
+    assert phases["first_byte"] == 1.5
+    assert phases["drain"] == phases["stat"] == 0.0
+
+
+def test_pipeline_before_spawn_records_no_phases(clock):
+    progress = SearchProgress(clock)
+    pipeline = StatPipeline(iter(["/a"]), workers=1, stat=fake_stat, clock=clock).start()
+    drain(pipeline)
+    progress.track_pipeline(pipeline, pipeline.counter)
+    snapshot = progress.snapshot()
+    assert snapshot["paths_read"] == 1
+    assert set(snapshot["phases"]) == set(SEARCH_PHASES)
+    assert not any(snapshot["phases"].values())
+
+
+def test_stat_throughput_rate_uses_the_clock(clock):
+    counter = StatThroughput(clock)
+    counter.add(30, failed=2)
+    clock.advance(3)
+    assert counter.rate() == 10.0
+    assert counter.failures == 2
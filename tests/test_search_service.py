@@ -0,0 +1,237 @@
+# Copyright 2025 Apple Dragon
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+import search_service
+from conftest import write_paths
+from search_service import (
+    INVALID_PARAMS, INVALID_REQUEST, METHOD_NOT_FOUND, PARSE_ERROR, SERVER_ERROR, RpcError, SearchService, make_server
+)
+
+
+@pytest.fixture
+def result_files(fake_mdfind, tmp_path):
+    """Files the fake mdfind reports for every query"""
+    folder = tmp_path / "files"
+    folder.mkdir()
+    paths = []
+    for i, size in enumerate((10, 2000, 300, 40000)):
+        path = folder / f"report_{i}.txt"
+        path.write_bytes(b"x" * size)
+        paths.append(str(path))
+    write_paths(fake_mdfind, paths)
+    return paths
+
+
+@pytest.fixture
+def service(fake_mdfind):
+    return SearchService(config={}, backend_mode="mdfind", stream_batch_size=2)
+
+
+def test_search_returns_rows_and_fills_the_cache(service, result_files):
+    result = service.call("search", {"query": "report"})
+    assert result["cached"] is False and result["backend"] == "mdfind"
+    assert result["count"] == 4
+    assert [row["path"] for row in result["rows"]] == result_files
+    assert result["progress"]["paths_read"] == 4
+
+    again = service.call("search", {"query": "report", "min_size": "1KB", "sort": "size", "desc": True})
+    assert again["cached"] is True
+    assert [row["size"] for row in again["rows"]] == [40000, 2000]
+    assert service.call("cached", {"query": "report", "limit": 1})["count"] == 1
+    assert service.call("cached", {"query": "other"}) is None
+
+
+def test_cached_content_search_keeps_the_matching_lines(tmp_path):
+    (tmp_path / "a.txt").write_text("first\nsecond needle\n")
+    (tmp_path / "b.txt").write_text("needle\n")
+    service = SearchService(config={}, backend_mode="scandir")
+    params = {"query": "needle", "content": True, "directory": str(tmp_path), "sort": "name"}
+
+    def lines(result):
+        return [(row["name"], row["line_offset"], row["line"]) for row in result["rows"]]
+
+    fresh = service.call("search", params)
+    assert fresh["cached"] is False
+    assert lines(fresh) == [("a.txt", 6, 2), ("b.txt", 0, 1)]
+    again = service.call("search", dict(params, sort=None))
+    assert again["cached"] is True
+    assert sorted(lines(again)) == lines(fresh)
+    notifications = []
+    service.call("cached", dict(params, stream=True), notify=lambda method, params: notifications.append(params))
+    assert [(row["name"], row["line"]) for note in notifications for row in note["rows"]] == [("a.txt", 2), ("b.txt", 1)]
+
+
+def test_streamed_search_sends_rows_before_the_response(service, result_files):
+    notifications = []
+    result = service.call("search", {"query": "report", "stream": True},
+                          notify=lambda method, params: notifications.append((method, params)), request_id=7)
+    assert result["count"] == 4 and "rows" not in result
+    assert all(method == "search.rows" and params["id"] == 7 for method, params in notifications)
+    assert [row["path"] for _method, params in notifications for row in params["rows"]] == result_files
+
+    notifications.clear()
+    cached = service.call("search", {"query": "report", "stream": True},
+                          notify=lambda method, params: notifications.append((method, params)), request_id=8)
+    assert cached == {"count": 4, "cached": True}
+    assert [len(params["rows"]) for _method, params in notifications] == [2, 2]  # stream_batch_size
+
+
+def test_identical_concurrent_searches_run_once(service, result_files, monkeypatch):
+    runs = []
+    release = threading.Event()
+
+    class SlowSearch(search_service.HeadlessSearch):
+        def run(self):
+            runs.append(self)
+            release.wait(5)
+            super().run()
+
+    monkeypatch.setattr(search_service, "HeadlessSearch", SlowSearch)
+    results = [None] * 3
+
+    def search(i):
+        results[i] = service.call("search", {"query": "report"})
+
+    threads = [threading.Thread(target=search, args=(i,)) for i in range(3)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while not runs and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.1)  # Let the others reach _claim()
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(runs) == 1
+    assert sorted(result["cached"] for result in results) == [False, True, True]
+    assert all(result["count"] == 4 for result in results)
+    assert service._inflight == {}
+
+
+def test_waiting_search_answers_from_the_result_of_the_running_one(service, result_files):
+    request = service._search_request({"query": "report"})
+    assert service._claim(request.cache_key) is None  # As if another request were searching
+    result = {}
+    waiter = threading.Thread(target=lambda: result.update(service.call("search", {"query": "report"})))
+    waiter.start()
+    time.sleep(0.1)
+    assert waiter.is_alive()
+    service.cache.put(request.cache_key, [("shared.txt", 1, 0.0, "/shared.txt")])
+    service._release(request.cache_key)
+    waiter.join(5)
+    assert result["cached"] is True
+    assert [row["path"] for row in result["rows"]] == ["/shared.txt"]
+
+
+@pytest.mark.parametrize("method, params, code", [
+    ("nope", None, METHOD_NOT_FOUND),
+    ("ping", [1, 2], INVALID_PARAMS),
+    ("search", {"query": "report", "limit": 0}, INVALID_PARAMS),
+    ("search", {"query": "report", "sort": "color"}, INVALID_PARAMS),
+    ("search", {"query": "report", "min_size": "lots"}, INVALID_PARAMS),
+    ("search", {"directory": ["/tmp", 3]}, INVALID_PARAMS),
+    ("dirsize", {}, INVALID_PARAMS),
+    ("metadata", {"paths": "/tmp"}, INVALID_PARAMS),
+])
+def test_rpc_error_codes(service, method, params, code):
+    with pytest.raises(RpcError) as error:
+        service.call(method, params)
+    assert error.value.code == code
+
+
+def test_unexpected_errors_are_server_errors_and_counted(service, monkeypatch):
+    def broken(params, notify, request_id):
+        raise RuntimeError("disk on fire")
+
+    monkeypatch.setitem(service.methods, "ping", broken)
+    with pytest.raises(RpcError) as error:
+        service.call("ping")
+    assert error.value.code == SERVER_ERROR and "disk on fire" in str(error.value)
+    assert service.call("stats")["methods"]["ping"]["errors"] == 1
+
+
+@pytest.fixture
+def server(service, tmp_path):
+    server = make_server(service, socket_path=str(tmp_path / "service.sock"), workers=4)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    server.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def connect(server):
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(10)
+    client.connect(server.server_address)
+    return client, client.makefile("rb")
+
+
+def send(client, *messages):
+    client.sendall(b"".join((message if isinstance(message, bytes) else json.dumps(message).encode()) + b"\n"
+                            for message in messages))
+
+
+def receive(reader, count):
+    return [json.loads(reader.readline()) for _ in range(count)]
+
+
+def test_socket_round_trip_against_fake_mdfind(server, result_files):
+    client, reader = connect(server)
+    try:
+        send(client, {"jsonrpc": "2.0", "id": "a", "method": "search", "params": {"query": "report", "stream": True}})
+        # search.rows notifications as the stat stage yields rows, then the response
+        messages = receive(reader, 1)
+        while "method" in messages[-1]:
+            messages += receive(reader, 1)
+        assert {message["method"] for message in messages[:-1]} == {"search.rows"}
+        assert [row["path"] for message in messages[:-1] for row in message["params"]["rows"]] == result_files
+        assert messages[-1]["id"] == "a" and messages[-1]["result"]["count"] == 4
+
+        send(client, b"{not json", {"jsonrpc": "2.0", "id": 5, "params": {}},
+             {"jsonrpc": "2.0", "method": "ping"},  # A notification: no response
+             {"jsonrpc": "2.0", "id": 6, "method": "ping"})
+        errors = receive(reader, 3)
+        by_id = {message["id"]: message for message in errors}
+        assert by_id[None]["error"]["code"] == PARSE_ERROR
+        assert by_id[5]["error"]["code"] == INVALID_REQUEST
+        assert by_id[6]["result"] == "pong"
+    finally:
+        client.close()
+
+
+def test_pipelined_requests_are_answered_in_completion_order(server, service):
+    release = threading.Event()
+    service.methods["wait"] = lambda params, notify, request_id: release.wait(10)
+    client, reader = connect(server)
+    try:
+        send(client, {"jsonrpc": "2.0", "id": 1, "method": "wait"},
+             {"jsonrpc": "2.0", "id": 2, "method": "ping"},
+             {"jsonrpc": "2.0", "id": 3, "method": "nope"})
+        by_id = {message["id"]: message for message in receive(reader, 2)}  # Request 1 does not hold them up
+        assert by_id[2]["result"] == "pong"
+        assert by_id[3]["error"]["code"] == METHOD_NOT_FOUND
+        release.set()
+        assert receive(reader, 1) == [{"jsonrpc": "2.0", "id": 1, "result": True}]
+    finally:
+        client.close()
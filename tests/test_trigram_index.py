@@ -0,0 +1,30 @@
+# Copyright 2025 Apple Dragon
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+from trigram_index import TrigramIndex
+
+
+def test_covers_only_crawled_roots(tmp_path):
+    root = tmp_path / "root"
+    (root / "sub").mkdir(parents=True)
+    (root / "sub" / "report.txt").write_text("x")
+    index = TrigramIndex()
+    index.add_tree(str(root))
+    assert index.covers(str(root))
+    assert index.covers(str(root / "sub"))
+    assert not index.covers(str(tmp_path))
+    assert not index.covers("")  # Searching everywhere would miss files outside the root
+    assert [os.path.basename(path) for path in index.search("report", directory=str(root))] == ["report.txt"]
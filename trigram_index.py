@@ -0,0 +1,214 @@
+# Copyright 2025 Apple Dragon
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""In-memory trigram index for substring file name search.
+
+Every file gets an integer id. Names are kept once, directories are interned, and
+each trigram of a folded name maps to an array of the ids that contain it. A
+substring query looks up the posting lists of its trigrams, intersects the
+shortest ones and verifies the few remaining candidates against the names.
+"""
+
+import os
+import sys
+from array import array
+from bisect import bisect_left
+
+from file_index import crawl
+from search_engine import fold_name, normalize_directory
+
+# Posting lists are intersected while the candidate set is larger than this;
+# below it, checking the names directly is cheaper
+VERIFY_THRESHOLD = 2048
+# Trigrams of one word tend to have near-identical posting lists, so intersecting
+# more than the two shortest rarely removes enough candidates to pay for itself
+MAX_INTERSECTIONS = 1
+
+
+def _contains(posting, file_id):
+    """Membership test on an ascending posting list"""
+    i = bisect_left(posting, file_id)
+    return i < len(posting) and posting[i] == file_id
+
+
+def name_trigrams(folded):
+    return {folded[i:i + 3] for i in range(len(folded) - 2)}
+
+
+class TrigramIndex:
+    """Substring index over file names.
+
+    Fill it with add_paths() (past mdfind results) or add_tree() / a FileIndex (a
+    crawl). Only crawled roots are marked as covered: a search outside them may have
+    matches the index never saw, so callers should check covers() first.
+    """
+
+    def __init__(self):
+        self._dirs = []  # Interned parent directories
+        self._dir_ids = {}  # Directory -> index into _dirs
+        self._parents = array("I")  # File id -> directory id
+        self._names = []  # File id -> name
+        self._ids = {}  # (directory id, name) -> file id, to skip duplicates
+        self._postings = {}  # Trigram -> array of file ids, ascending
+        self._removed = set()  # Ids of files deleted since they were added
+        self.roots = set()  # Crawled roots the index is complete for
+
+    def __len__(self):
+        return len(self._names) - len(self._removed)
+
+    def _intern_dir(self, directory):
+        dir_id = self._dir_ids.get(directory)
+        if dir_id is None:
+            dir_id = self._dir_ids[directory] = len(self._dirs)
+            self._dirs.append(sys.intern(directory))
+        return dir_id
+
+    def add(self, path):
+        """Add one path; returns its id. Adding a known path again revives it if it was removed."""
+        directory, name = os.path.split(path)
+        dir_id = self._intern_dir(directory)
+        key = (dir_id, name)
+        file_id = self._ids.get(key)
+        if file_id is not None:
+            self._removed.discard(file_id)
+            return file_id
+        file_id = len(self._names)
+        self._ids[key] = file_id
+        self._names.append(name)
+        self._parents.append(dir_id)
+        postings = self._postings
+        for trigram in name_trigrams(fold_name(name, False)):
+            posting = postings.get(trigram)
+            if posting is None:
+                posting = postings[trigram] = array("I")
+            posting.append(file_id)
+        return file_id
+
+    def add_paths(self, paths):
+        for path in paths:
+            if path:
+                self.add(path)
+
+    def add_tree(self, root, stop_event=None):
+        """Crawl a directory tree into the index and mark it as covered"""
+        root = normalize_directory(root)
+        for record in crawl(root, stop_event):
+            self.add(record[0])
+        if stop_event is None or not stop_event.is_set():
+            self.roots.add(root)
+
+    @classmethod
+    def from_file_index(cls, file_index, stop_event=None):
+        """Load every entry of a FileIndex; its built roots become the covered roots"""
+        index = cls()
+        for path in file_index.iter_paths():
+            if stop_event is not None and stop_event.is_set():
+                return None
+            index.add(path)
+        index.roots.update(file_index.built_roots())
+        return index
+
+    def remove(self, path):
+        directory, name = os.path.split(path)
+        dir_id = self._dir_ids.get(directory)
+        file_id = self._ids.get((dir_id, name)) if dir_id is not None else None
+        if file_id is not None:
+            self._removed.add(file_id)
+
+    def path(self, file_id):
+        return os.path.join(self._dirs[self._parents[file_id]], self._names[file_id])
+
+    def covers(self, directory):
+        """Whether a search directory lies inside an indexed root; an empty one (everywhere) never does"""
+        if not directory:
+            return False
+        directory = normalize_directory(directory)
+        return any(directory == root or directory.startswith(root.rstrip("/") + "/") for root in self.roots)
+
+    @staticmethod
+    def supports(query):
+        """Trigram lookups need three characters and no Spotlight wildcards"""
+        return len(query) >= 3 and "*" not in query and "?" not in query
+
+    def _candidates(self, needle):
+        """Ids that contain every trigram of needle (a superset of the matches).
+        Needles shorter than a trigram fall back to checking every name."""
+        if len(needle) < 3:
+            return range(len(self._names))
+        postings = []
+        for trigram in name_trigrams(needle):
+            posting = self._postings.get(trigram)
+            if posting is None:
+                return []
+            postings.append(posting)
+        postings.sort(key=len)
+        candidates = postings[0]
+        for posting in postings[1:1 + MAX_INTERSECTIONS]:
+            if len(candidates) <= VERIFY_THRESHOLD:
+                break
+            if len(posting) > 8 * len(candidates):
+                # Much longer list: binary-search it for each candidate instead of reading it all
+                candidates = [file_id for file_id in candidates if _contains(posting, file_id)]
+            else:
+                candidates = sorted(set(candidates).intersection(posting))
+        return candidates
+
+    def search_ids(self, query, match_case=False, full_match=False, directory=""):
+        """Ids of names matching query as a kMDItemFSName "*query*" search
+        (or an exact name with full_match), in ascending order"""
+        needle = fold_name(query, False)
+        exact = fold_name(query, True) if match_case else needle
+        names, removed = self._names, self._removed
+        candidates = self._candidates(needle)  # Ascending
+        if len(needle) == 3 and not match_case and not full_match:
+            # The needle is a single trigram: its posting list is the answer
+            matches = [file_id for file_id in candidates if file_id not in removed] if removed else list(candidates)
+        else:
+            matches = []
+            for file_id in candidates:
+                name = names[file_id]
+                name = name.lower() if not match_case and name.isascii() else fold_name(name, match_case)
+                if ((name == exact) if full_match else (exact in name)) and file_id not in removed:
+                    matches.append(file_id)
+        if directory:
+            prefix = normalize_directory(directory).rstrip("/") + "/"
+            dirs, parents = self._dirs, self._parents
+            matches = [file_id for file_id in matches if (dirs[parents[file_id]] + "/").startswith(prefix)]
+        return matches
+
+    def search(self, query, match_case=False, full_match=False, directory=""):
+        """Paths of names matching query; see search_ids()"""
+        return [self.path(file_id) for file_id in self.search_ids(query, match_case, full_match, directory)]
+
+    def memory_report(self):
+        """Approximate memory use in bytes, by structure"""
+        postings_bytes = sys.getsizeof(self._postings) + sum(
+            sys.getsizeof(trigram) + sys.getsizeof(posting) for trigram, posting in self._postings.items())
+        names_bytes = sys.getsizeof(self._names) + sum(sys.getsizeof(name) for name in self._names)
+        dirs_bytes = (sys.getsizeof(self._dirs) + sys.getsizeof(self._dir_ids)
+                      + sum(sys.getsizeof(directory) for directory in self._dirs) + sys.getsizeof(self._parents))
+        # Tuple keys of the duplicate check; the names inside are shared with _names
+        ids_bytes = sys.getsizeof(self._ids) + len(self._ids) * (sys.getsizeof((0, "")) + sys.getsizeof(1 << 20))
+        report = {
+            "files": len(self),
+            "directories": len(self._dirs),
+            "trigrams": len(self._postings),
+            "postings": sum(len(posting) for posting in self._postings.values()),
+            "postings_bytes": postings_bytes,
+            "names_bytes": names_bytes,
+            "directories_bytes": dirs_bytes,
+            "dedup_bytes": ids_bytes,
+        }
+        report["total_bytes"] = postings_bytes + names_bytes + dirs_bytes + ids_bytes
+        return report